@@ -0,0 +1,94 @@
+"""
+Measures worker startup: importing the assistant with and without warmup().
+
+Each mode runs in --runs fresh interpreters. "import" only imports the
+assistant, which no longer loads any backend library. "import_translation"
+also builds a ContentCreator and loads the translator, as a worker serving
+only translation requests would. "import_warmup" preloads every backend,
+which is what importing the assistant used to cost. The slowest top-level
+modules of the last "import" run are taken from python -X importtime.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT = "import src.language_learning_assistant"
+MODES = {
+    "import": IMPORT,
+    "import_translation": (
+        f"{IMPORT}\n"
+        "from src.tools.content_tools import ContentCreator, load_backends\n"
+        "ContentCreator(use_translation_memory=False)\n"
+        "load_backends()"
+    ),
+    "import_warmup": f"{IMPORT}\nfrom src.tools import warmup\nwarmup()",
+}
+
+TIMER = "import time\n_start = time.perf_counter()\n{code}\nprint(time.perf_counter() - _start)"
+
+
+def run_mode(code: str, runs: int) -> list:
+    seconds = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        seconds.append(float(output.splitlines()[-1]))
+    return seconds
+
+
+def slowest_imports(code: str, top: int = 8) -> list:
+    """Cumulative microseconds of the slowest modules in a -X importtime trace."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative), name.strip()))
+    modules.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in modules[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for mode, code in MODES.items():
+        seconds = run_mode(code, args.runs)
+        print(
+            json.dumps(
+                {
+                    "benchmark": "startup",
+                    "mode": mode,
+                    "runs": args.runs,
+                    "median_ms": round(statistics.median(seconds) * 1000, 1),
+                    "min_ms": round(min(seconds) * 1000, 1),
+                }
+            )
+        )
+    print(json.dumps({"benchmark": "importtime", "slowest": slowest_imports(IMPORT)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares the language detection backends on latency and worker memory.
+
+Each backend runs in a fresh interpreter. The reported load time and peak RSS
+growth cover building the detector (including langdetect's own imports) and
+detecting the corpus, on top of an already imported src.tools.
+
+Usage:
+    python benchmarks/bench_language_detection.py [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from src.tools.language_detection import LangdetectDetector, NgramDetector
+baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+detector = {factory}
+detector.detect("warm up")
+load_s = time.perf_counter() - start
+with open({corpus!r}, encoding="utf-8") as f:
+    corpus = [line.strip() for line in f if len(line.strip()) > 3]
+start = time.perf_counter()
+for _ in range({repeat}):
+    for text in corpus:
+        try:
+            detector.detect(text)
+        except Exception:
+            pass
+per_call_us = (time.perf_counter() - start) / ({repeat} * len(corpus)) * 1e6
+print(json.dumps({{
+    "load_s": round(load_s, 4),
+    "per_call_us": round(per_call_us, 2),
+    "rss_delta_mib": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kib) / 1024, 1),
+}}))
+"""
+
+BACKENDS = {
+    "ngram": "NgramDetector()",
+    "langdetect": "LangdetectDetector()",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = os.path.join(ROOT, "test_data", "validation_corpus.txt")
+    for name, factory in BACKENDS.items():
+        code = CHILD.format(root=ROOT, factory=factory, corpus=corpus, repeat=args.repeat)
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        print(json.dumps({"benchmark": "language_detection", "backend": name, **json.loads(output)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares lyrics page parsing before and after the SoupStrainer change.
+
+"before" parses the whole page with html.parser and scans every div/p with a
+lambda class filter, as get_song_lyrics used to. "after" is parse_lyrics.
+
+Usage:
+    python benchmarks/bench_lyrics_parsing.py [--iterations 20]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.tools.search_tools import LYRICS_PARSER, parse_lyrics
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def parse_lyrics_before(html: bytes) -> str:
+    soup = BeautifulSoup(html.decode("utf-8"), "html.parser")
+    lyrics_containers = soup.find_all(
+        ["div", "p"],
+        class_=lambda x: x and ("lyrics" in x.lower() or "text" in x.lower()),
+    )
+    return lyrics_containers[0].get_text(strip=True) if lyrics_containers else None
+
+
+def parse_lyrics_after(html: bytes) -> str:
+    return parse_lyrics(html, "utf-8")
+
+
+def measure(parse, html: bytes, iterations: int) -> dict:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(html)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mean_ms": round(elapsed / iterations * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "lyrics_*.html"))):
+        with open(path, "rb") as f:
+            html = f.read()
+        assert parse_lyrics_before(html) == parse_lyrics_after(html)
+        before = measure(parse_lyrics_before, html, args.iterations)
+        after = measure(parse_lyrics_after, html, args.iterations)
+        print(
+            json.dumps(
+                {
+                    "benchmark": "lyrics_parsing",
+                    "fixture": os.path.basename(path),
+                    "bytes": len(html),
+                    "parser": LYRICS_PARSER,
+                    "before": before,
+                    "after": after,
+                    "speedup": round(before["mean_ms"] / after["mean_ms"], 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Measures the cost of the metrics instrumentation.
+
+Reports the per-call cost of a stage() block with metrics disabled, enabled
+and with a request trace, then whole requests against zero-latency fake
+backends in the same three modes.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py [--calls 200000] [--requests 300]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools import metrics
+
+REQUESTS = [
+    "How do you say 'good morning' in German?",
+    "Show me some Spanish vocabulary about colors",
+    "Find me a French poem",
+]
+
+
+def set_mode(mode: str) -> None:
+    if mode == "disabled":
+        metrics.disable_metrics()
+    else:
+        metrics.enable_metrics()
+
+
+def bench_stage(calls: int) -> None:
+    for mode in ("disabled", "enabled", "traced"):
+        set_mode(mode)
+        token = metrics.start_trace(metrics.RequestTrace()) if mode == "traced" else None
+        start = time.perf_counter()
+        for _ in range(calls):
+            with metrics.stage("bench"):
+                pass
+        elapsed = time.perf_counter() - start
+        if token is not None:
+            metrics.end_trace(token)
+        print(
+            json.dumps(
+                {
+                    "benchmark": "metrics_stage",
+                    "mode": mode,
+                    "ns_per_stage": round(elapsed / calls * 1e9, 1),
+                }
+            )
+        )
+
+
+def bench_requests(count: int) -> None:
+    for mode in ("disabled", "enabled", "traced"):
+        set_mode(mode)
+        with pytest.MonkeyPatch.context() as monkeypatch, tempfile.TemporaryDirectory() as tmp:
+            monkeypatch.chdir(tmp)
+            install_fake_backends(monkeypatch)
+            # Without the response cache every request still runs the pipeline
+            assistant = LanguageLearningAssistant(
+                include_timings=mode == "traced", use_response_cache=False
+            )
+
+            async def run():
+                for i in range(count):
+                    await assistant.process_request(REQUESTS[i % len(REQUESTS)])
+
+            # Warm the caches so the fakes and executor do not dominate
+            asyncio.run(run())
+            start = time.perf_counter()
+            asyncio.run(run())
+            elapsed = time.perf_counter() - start
+        print(
+            json.dumps(
+                {
+                    "benchmark": "metrics_requests",
+                    "mode": mode,
+                    "requests": count,
+                    "us_per_request": round(elapsed / count * 1e6, 1),
+                }
+            )
+        )
+    metrics.disable_metrics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    bench_stage(args.calls)
+    bench_requests(args.requests)
+
+
+if __name__ == "__main__":
+    main()
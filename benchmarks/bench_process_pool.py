@@ -0,0 +1,106 @@
+"""
+Measures how CPU-bound request steps scale with worker processes.
+
+Each simulated request parses the large lyrics fixture and extracts the
+vocabulary of the lyrics, the CPU-heavy part of a song request, from one of
+--concurrency threads as the shared tool executor would. "threads" runs both
+steps in those threads, where they contend for the GIL; "processes" offloads
+them to a pool of 1, 2, 4, ... up to --max-workers warm worker processes
+(default: the CPU count). Throughput should grow with the worker count
+until the cores run out.
+
+Usage:
+    python benchmarks/bench_process_pool.py [--requests 200] [--concurrency 16]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools.process_pool import (
+    configure_process_pool,
+    offload,
+    shutdown_process_pool,
+)
+from src.tools.search_tools import parse_lyrics
+from src.tools.vocabulary_extraction import extract_key_vocabulary
+
+FIXTURE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "lyrics_large.html"
+)
+
+
+def handle(page: bytes) -> list:
+    lyrics = offload(parse_lyrics, page, "utf-8", size=len(page))
+    # Repeated so extraction weighs about as much as on a long song text
+    text = "\n".join([lyrics] * 20)
+    return offload(extract_key_vocabulary, text, ("de", "en"), size=len(text))
+
+
+def run(page: bytes, requests: int, concurrency: int) -> float:
+    """Requests handled per second."""
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        start = time.perf_counter()
+        list(threads.map(handle, [page] * requests))
+        return requests / (time.perf_counter() - start)
+
+
+def worker_counts(max_workers: int) -> list:
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    return counts + [max_workers]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with open(FIXTURE, "rb") as f:
+        page = f.read()
+    # Warm up bs4 and the tables in this process too
+    handle(page)
+
+    baseline = run(page, args.requests, args.concurrency)
+    print(
+        json.dumps(
+            {
+                "benchmark": "process_pool",
+                "mode": "threads",
+                "cpus": os.cpu_count(),
+                "requests_per_second": round(baseline, 1),
+            }
+        )
+    )
+    for workers in worker_counts(args.max_workers):
+        configure_process_pool(max_workers=workers)
+        try:
+            throughput = run(page, args.requests, args.concurrency)
+        finally:
+            shutdown_process_pool()
+        print(
+            json.dumps(
+                {
+                    "benchmark": "process_pool",
+                    "mode": "processes",
+                    "workers": workers,
+                    "cpus": os.cpu_count(),
+                    "requests_per_second": round(throughput, 1),
+                    "speedup": round(throughput / baseline, 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
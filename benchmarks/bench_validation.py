@@ -0,0 +1,90 @@
+"""
+Microbenchmark for analyze_language_confidence against the legacy version.
+
+Runs the equivalence corpus through both implementations, once with langdetect
+enabled and once with detection stubbed out to isolate the matching cost.
+Both runs use langdetect for the current version too, so only the matching
+differs; see bench_language_detection.py for the detector backends.
+
+Usage:
+    python benchmarks/bench_validation.py [--repeat 20]
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from langdetect import DetectorFactory
+
+from benchmarks import legacy_validation
+from src.tools import validation_tools
+from src.tools.language_detection import LangdetectDetector, NullDetector
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "test_data",
+    "validation_corpus.txt",
+)
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f]
+
+
+def time_per_call(analyze, corpus, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in corpus:
+            analyze(text)
+    return (time.perf_counter() - start) / (repeat * len(corpus))
+
+
+def _no_detection(text):
+    raise RuntimeError("detection disabled")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    DetectorFactory.seed = 0
+    corpus = load_corpus()
+    for detection in (True, False):
+        detector = LangdetectDetector() if detection else NullDetector()
+        implementations = {
+            "legacy": legacy_validation.analyze_language_confidence_legacy,
+            "current": functools.partial(
+                validation_tools.analyze_language_confidence, detector=detector
+            ),
+        }
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            if not detection:
+                monkeypatch.setattr(legacy_validation, "detect_langs", _no_detection)
+            timings = {
+                name: time_per_call(analyze, corpus, args.repeat)
+                for name, analyze in implementations.items()
+            }
+        print(
+            json.dumps(
+                {
+                    "benchmark": "analyze_language_confidence",
+                    "detection": detection,
+                    "texts": len(corpus),
+                    "legacy_us": round(timings["legacy"] * 1e6, 2),
+                    "current_us": round(timings["current"] * 1e6, 2),
+                    "speedup": round(timings["legacy"] / timings["current"], 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures the vocabulary-audio stage against a fake TTS backend.
+
+Usage:
+    python benchmarks/bench_vocabulary_audio.py [--words 10] [--latency 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+
+
+def run_stage(words, latency: float, concurrency: int) -> float:
+    with pytest.MonkeyPatch.context() as monkeypatch, tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.chdir(tmp)
+        install_fake_backends(monkeypatch, latency=latency)
+        assistant = LanguageLearningAssistant(audio_concurrency=concurrency)
+        start = time.perf_counter()
+        asyncio.run(assistant._generate_vocabulary_audio(words, "de"))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    words = [f"wort{i}" for i in range(args.words)]
+    for concurrency in (1, 2, 4, 8, args.words):
+        elapsed = run_stage(words, args.latency, concurrency)
+        print(
+            json.dumps(
+                {
+                    "benchmark": "vocabulary_audio",
+                    "words": args.words,
+                    "latency_s": args.latency,
+                    "concurrency": concurrency,
+                    "elapsed_s": round(elapsed, 4),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
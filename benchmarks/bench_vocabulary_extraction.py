@@ -0,0 +1,94 @@
+"""
+Compares vocabulary extraction before and after the frequency-ranked extractor.
+
+"before" is the original ContentCreator._extract_key_vocabulary (lowercase the
+whole text, strip commas and periods, sort every unique word by length).
+"after" is extract_key_vocabulary. Besides time, each run reports how many of
+the extracted words are junk (link, label or stopword fragments) that would
+each cost a translation call.
+
+Usage:
+    python benchmarks/bench_vocabulary_extraction.py [--iterations 50]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools.search_tools import parse_lyrics
+from src.tools.vocabulary_extraction import extract_key_vocabulary
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SEARCH_RESULTS = "\n\n".join(
+    f"Title: Deutsche Liebeslieder - Songtexte {i}\n"
+    f"Content: Ich liebe dich, mein Herz schlägt nur für dich, unter der Sonne.\n"
+    f"URL: https://www.songtexte.example.com/liebeslieder/{i}?ref=search\n"
+    for i in range(3)
+)
+
+
+def extract_before(text: str):
+    words = text.lower().replace(",", " ").replace(".", " ").split()
+    unique_words = sorted(set(words), key=len, reverse=True)
+    return unique_words[:10]
+
+
+def extract_after(text: str):
+    return extract_key_vocabulary(text, ("de", "en"))
+
+
+def is_junk(word: str) -> bool:
+    return (
+        not word.replace("-", "").isalpha()
+        or extract_key_vocabulary(word, ("de", "en")) == []
+    )
+
+
+def measure(extract, text: str, iterations: int) -> dict:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        words = extract(text)
+    elapsed = time.perf_counter() - start
+    return {
+        "ms_per_text": round(elapsed / iterations * 1000, 3),
+        "junk_words": sum(is_junk(word) for word in words),
+        "words": words,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES, "lyrics_large.html"), "rb") as f:
+        lyrics = parse_lyrics(f.read(), "utf-8") or ""
+    texts = {
+        "search_results": SEARCH_RESULTS,
+        "lyrics_page": lyrics,
+        "lyrics_page_x20": "\n".join([lyrics] * 20),
+    }
+
+    for name, text in texts.items():
+        for variant, extract in (("before", extract_before), ("after", extract_after)):
+            print(
+                json.dumps(
+                    {
+                        "benchmark": "vocabulary_extraction",
+                        "text": name,
+                        "chars": len(text),
+                        "variant": variant,
+                        **measure(extract, text, args.iterations),
+                    },
+                    ensure_ascii=False,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
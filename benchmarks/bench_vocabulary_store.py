@@ -0,0 +1,130 @@
+"""
+Measures building and querying the offline vocabulary index, and the vocabulary
+handler answering from a pack versus the web-search fallback.
+
+Usage:
+    python benchmarks/bench_vocabulary_store.py [--lookups 20000] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools.vocabulary_store import VocabularyStore
+
+TOPICS = [
+    "colors",
+    "the colours of the rainbow",
+    "farm animals",
+    "parts of the body",
+    "food and drinks",
+    "quantum physics",
+]
+
+
+def bench_build(repeats: int = 20) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = {"memory": [], "disk_build": [], "disk_reopen": []}
+        for i in range(repeats):
+            start = time.perf_counter()
+            VocabularyStore(":memory:").close()
+            timings["memory"].append(time.perf_counter() - start)
+
+            path = os.path.join(tmp, f"vocabulary{i}.sqlite3")
+            start = time.perf_counter()
+            VocabularyStore(path).close()
+            timings["disk_build"].append(time.perf_counter() - start)
+
+            # Unchanged packs: the existing index is reused
+            start = time.perf_counter()
+            VocabularyStore(path).close()
+            timings["disk_reopen"].append(time.perf_counter() - start)
+
+    for mode, values in timings.items():
+        print(
+            json.dumps(
+                {
+                    "benchmark": "vocabulary_index_build",
+                    "mode": mode,
+                    "median_ms": round(statistics.median(values) * 1000, 3),
+                }
+            )
+        )
+
+
+def bench_lookup(lookups: int) -> None:
+    store = VocabularyStore(":memory:")
+    languages = ["de", "es", "fr", "it"]
+    timings = []
+    for i in range(lookups):
+        language = languages[i % len(languages)]
+        topic = TOPICS[i % len(TOPICS)]
+        start = time.perf_counter()
+        store.lookup(language, topic)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print(
+        json.dumps(
+            {
+                "benchmark": "vocabulary_lookup",
+                "lookups": lookups,
+                "hit_rate": store.stats()["hit_rate"],
+                "p50_us": round(timings[len(timings) // 2] * 1e6, 2),
+                "p99_us": round(timings[int(len(timings) * 0.99)] * 1e6, 2),
+            }
+        )
+    )
+
+
+def bench_handler(latency: float) -> None:
+    requests = {
+        "pack": "Show me some Spanish vocabulary about colors",
+        "web_fallback": "Show me some Spanish vocabulary about astronomy",
+    }
+    for source, request in requests.items():
+        with pytest.MonkeyPatch.context() as monkeypatch, tempfile.TemporaryDirectory() as tmp:
+            monkeypatch.chdir(tmp)
+            backends = install_fake_backends(monkeypatch, latency=latency)
+            assistant = LanguageLearningAssistant()
+            start = time.perf_counter()
+            asyncio.run(assistant.process_request(request))
+            elapsed = time.perf_counter() - start
+            print(
+                json.dumps(
+                    {
+                        "benchmark": "vocabulary_request",
+                        "source": source,
+                        "latency_s": latency,
+                        "elapsed_ms": round(elapsed * 1000, 2),
+                        "searches": backends.calls["ddgs.text"],
+                        "translations": backends.calls["translate"],
+                    }
+                )
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    bench_build()
+    bench_lookup(args.lookups)
+    bench_handler(args.latency)
+
+
+if __name__ == "__main__":
+    main()
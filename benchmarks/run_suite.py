@@ -0,0 +1,322 @@
+"""
+End-to-end benchmark suite against the deterministic fake backends in fakes.py.
+
+For every scenario (song, poem, vocabulary, translation; with and without
+audio) it runs --requests distinct requests through process_request with at
+most --concurrency in flight, and reports throughput and p50/p95/p99 latency.
+Microbenchmarks cover analyze_language_confidence and
+generate_practice_lessons. Every result is one JSON object per line on
+stdout; --output also writes the whole run as one JSON document, and
+--compare prints the change against such a document from an earlier run.
+
+By default caches are cold: the search cache, translation memory, audio
+cache and response cache are disabled so every request exercises the whole
+pipeline. --warm keeps the production caches.
+
+Usage:
+    python benchmarks/run_suite.py [--requests 40] [--concurrency 8]
+        [--latency 0.02] [--failure-rate 0.0] [--scenarios song,poem]
+        [--warm] [--output run.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools import audio_tools, search_tools
+from src.tools.content_tools import ContentCreator, generate_practice_lessons
+from src.tools.validation_tools import analyze_language_confidence
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "test_data",
+    "validation_corpus.txt",
+)
+
+LANGUAGES = ["German", "Spanish", "French", "Italian"]
+PACK_TOPICS = ["colors", "food", "animals", "family", "travel", "body"]
+
+# Scenario name -> request template; {language} and {i} make each request
+# distinct so coalescing does not hide the work
+SCENARIOS = {
+    "song": "Find me a {language} song about love number {i}",
+    "song_audio": "How do you pronounce this {language} song about love number {i}?",
+    "poem": "Find me a {language} poem number {i}",
+    "poem_audio": "How do you pronounce this {language} poem number {i}?",
+    "vocabulary": "Show me some {language} vocabulary about {topic} {i}",
+    "vocabulary_audio": "I want to hear the pronunciation of {language} words about {topic} {i}",
+    "vocabulary_web": "Show me some {language} vocabulary about astronomy {i}",
+    "translation": "Translate 'good morning number {i}' to {language}",
+    "translation_audio": "How do you say 'good morning number {i}' in {language}?",
+}
+
+# Metrics reported by --compare, as new / baseline
+COMPARED_METRICS = (
+    "throughput_rps",
+    "ops_per_s",
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "p50_us",
+    "p95_us",
+    "p99_us",
+)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(latencies: List[float]) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def make_requests(template: str, count: int) -> List[str]:
+    return [
+        template.format(
+            language=LANGUAGES[i % len(LANGUAGES)],
+            topic=PACK_TOPICS[i % len(PACK_TOPICS)],
+            i=i,
+        )
+        for i in range(count)
+    ]
+
+
+def disable_caches(monkeypatch, tmp: str) -> None:
+    """Makes every request pay for search, translation and TTS again."""
+    monkeypatch.setattr(
+        search_tools, "_search_client", search_tools.SearchClient(ttl=0, negative_ttl=0)
+    )
+    generate_audio = audio_tools.generate_audio
+
+    def uncached_audio(text, language, **kwargs):
+        return generate_audio(
+            text, language, output_dir=tempfile.mkdtemp(dir=tmp), **kwargs
+        )
+
+    monkeypatch.setattr(audio_tools, "generate_audio", uncached_audio)
+    generate_audio_batch = audio_tools.generate_audio_batch
+
+    def uncached_audio_batch(words, language, **kwargs):
+        return generate_audio_batch(
+            words, language, output_dir=tempfile.mkdtemp(dir=tmp), **kwargs
+        )
+
+    monkeypatch.setattr(audio_tools, "generate_audio_batch", uncached_audio_batch)
+
+
+def run_scenario(name: str, args) -> Dict:
+    requests = make_requests(SCENARIOS[name], args.requests)
+    with pytest.MonkeyPatch.context() as monkeypatch, tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.chdir(tmp)
+        backends = install_fake_backends(
+            monkeypatch,
+            latency=args.latency,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+        )
+        assistant = LanguageLearningAssistant(use_response_cache=args.warm)
+        if not args.warm:
+            disable_caches(monkeypatch, tmp)
+            assistant.content_creator = ContentCreator(use_translation_memory=False)
+
+        latencies: List[float] = []
+        statuses: Dict[str, int] = {}
+
+        async def run():
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def one(request: str) -> None:
+                async with semaphore:
+                    start = time.perf_counter()
+                    result = await assistant.process_request(request)
+                    latencies.append(time.perf_counter() - start)
+                status = result.get("status", "unknown")
+                statuses[status] = statuses.get(status, 0) + 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(request) for request in requests))
+            return time.perf_counter() - start
+
+        wall = asyncio.run(run())
+
+    return {
+        "benchmark": "process_request",
+        "scenario": name,
+        "requests": len(requests),
+        "concurrency": args.concurrency,
+        "latency_s": args.latency,
+        "failure_rate": args.failure_rate,
+        "caches": "warm" if args.warm else "cold",
+        "wall_s": round(wall, 4),
+        "throughput_rps": round(len(requests) / wall, 2),
+        **latency_summary(latencies),
+        "statuses": statuses,
+        "backend_calls": dict(sorted(backends.calls.counts.items())),
+        "injected_failures": dict(sorted(backends.failures.counts.items())),
+    }
+
+
+def time_calls(func: Callable, inputs: List, repeat: int) -> Dict:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            call_start = time.perf_counter()
+            func(item)
+            latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "ops_per_s": round(len(latencies) / elapsed, 1),
+        "p50_us": round(percentile(latencies, 0.50) * 1e6, 2),
+        "p95_us": round(percentile(latencies, 0.95) * 1e6, 2),
+        "p99_us": round(percentile(latencies, 0.99) * 1e6, 2),
+    }
+
+
+def micro_validation(repeat: int) -> Dict:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = [line.rstrip("\n") for line in f]
+    # Warm the default detector outside the timed loop
+    analyze_language_confidence(corpus[0])
+    return {
+        "benchmark": "analyze_language_confidence",
+        "texts": len(corpus),
+        **time_calls(analyze_language_confidence, corpus, repeat),
+    }
+
+
+def micro_practice_lessons(repeat: int) -> List[Dict]:
+    results = []
+    for size in (10, 100, 1000):
+        words = [f"wort{i}" for i in range(size)]
+        translations = {word: f"word{i}" for i, word in enumerate(words)}
+        results.append(
+            {
+                "benchmark": "generate_practice_lessons",
+                "words": size,
+                **time_calls(
+                    lambda vocab: generate_practice_lessons(vocab, translations),
+                    [words],
+                    max(10, repeat * 1000 // size),
+                ),
+            }
+        )
+    return results
+
+
+def compare(results: List[Dict], baseline_path: str) -> List[Dict]:
+    """Pairs results with the same benchmark and parameters in a baseline run."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    def key(result: Dict):
+        return (
+            result["benchmark"],
+            result.get("scenario"),
+            result.get("words"),
+            result.get("caches"),
+        )
+
+    previous = {key(result): result for result in baseline}
+    comparisons = []
+    for result in results:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        changes = {}
+        for metric in COMPARED_METRICS:
+            if metric in result and old.get(metric):
+                changes[metric] = round(result[metric] / old[metric], 3)
+        comparisons.append(
+            {
+                "benchmark": "comparison",
+                "of": result["benchmark"],
+                "scenario": result.get("scenario"),
+                "words": result.get("words"),
+                "ratio_to_baseline": changes,
+            }
+        )
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--warm", action="store_true")
+    parser.add_argument("--micro-repeat", type=int, default=20)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results = []
+
+    def emit(result: Dict) -> None:
+        results.append(result)
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    for name in scenarios:
+        emit(run_scenario(name, args))
+    if not args.skip_micro:
+        emit(micro_validation(args.micro_repeat))
+        for result in micro_practice_lessons(args.micro_repeat):
+            emit(result)
+
+    if args.compare:
+        for comparison in compare(results, args.compare):
+            print(json.dumps(comparison), flush=True)
+
+    if args.output:
+        document = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": vars(args),
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""
+Deterministic local stand-ins for the external backends used by src/tools.
+
+The fakes mimic the parts of DDGS, GoogleTranslator, gTTS, requests and redis that the
+tools call, with configurable latency so tests can measure concurrency,
+seeded failure injection so benchmarks can measure behaviour under errors, and
+HTTP 429 answers to exercise rate limiting.
+"""
+
+import random
+import re
+import threading
+import time
+import types
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+
+SAMPLE_LYRICS_HTML = """
+<html><body>
+<div class="header">Navigation</div>
+<div class="lyrics">Ich liebe dich mit meinem ganzen Herzen und der Sonne</div>
+</body></html>
+"""
+
+
+# Header of an MPEG-2 Layer III frame: 32 kbps, 24 kHz, mono, like gTTS output
+_MP3_HEADER = bytes([0xFF, 0xF3, 0x44, 0xC4])
+MP3_FRAME_BYTES = 96
+# Audio bits per frame of fake speech and fake silence
+SPEECH_BITS = 400
+SILENCE_BITS = 0
+
+
+def mp3_frame(audio_bits: int) -> bytes:
+    """One MP3 frame whose side info claims audio_bits bits of audio data."""
+    # Side info: main_data_begin (8 bits), private bit, part2_3_length (12 bits), ...
+    side_info = (audio_bits << (72 - 9 - 12)).to_bytes(9, "big")
+    return (_MP3_HEADER + side_info).ljust(MP3_FRAME_BYTES, b"\0")
+
+
+def make_mp3(segments: List[tuple]) -> bytes:
+    """
+    Builds an MP3 stream from (audio_bits, frame count) segments.
+
+    The frames carry no real audio, but their headers and side info are valid,
+    which is all the splitting code reads.
+    """
+    return b"".join(mp3_frame(bits) * count for bits, count in segments)
+
+
+def fake_speech(text: str, pauses: bool = True) -> bytes:
+    """
+    MP3 for text: speech frames per sentence with pauses between sentences.
+
+    Without pauses the sentences run together, like a voice that does not stop
+    at the separators.
+    """
+    sentences = [
+        part for part in re.split(r"[.!?]\s+", text.strip().rstrip(".!?")) if part
+    ]
+    segments = [(SILENCE_BITS, 2)]
+    for i, sentence in enumerate(sentences):
+        if i and pauses:
+            segments.append((SILENCE_BITS, 10))
+        # A short dip inside every word, like the closure before a stop consonant
+        segments += [
+            (SPEECH_BITS, 2 + len(sentence)),
+            (SILENCE_BITS, 2),
+            (SPEECH_BITS, 2),
+        ]
+    segments.append((SILENCE_BITS, 2))
+    return make_mp3(segments)
+
+
+class CallCounter:
+    """Thread-safe per-backend call counter shared by the fakes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def hit(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def __getitem__(self, name: str) -> int:
+        return self.counts.get(name, 0)
+
+
+class FakeBackendError(ConnectionError):
+    """Raised by a fake backend call picked for failure injection."""
+
+
+class FakeRateLimitError(FakeBackendError):
+    """Raised by a fake backend answering HTTP 429 Too Many Requests."""
+
+    status_code = 429
+
+    def __init__(self, name: str, retry_after: Optional[float] = None):
+        super().__init__(f"{name}: 429 Too Many Requests")
+        headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+        self.response = types.SimpleNamespace(status_code=429, headers=headers)
+
+
+class FakeBackends:
+    """
+    Bundle of fake backends sharing one call counter.
+
+    Backend names are "ddgs.text", "ddgs.videos", "translate", "tts" and
+    "http.get". Latency and failure rate apply to every backend unless
+    overridden per name in latencies / failure_rates.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        lyrics_html: str = SAMPLE_LYRICS_HTML,
+        untranslatable: Optional[set] = None,
+        failure_rate: float = 0.0,
+        latencies: Optional[Dict[str, float]] = None,
+        failure_rates: Optional[Dict[str, float]] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.lyrics_html = lyrics_html
+        # Words the fake translator refuses, to exercise per-word error handling
+        self.untranslatable = set(untranslatable or ())
+        # When set, every DDGS search raises this exception, or a RuntimeError
+        # with this message
+        self.search_error: Optional[Union[str, Exception]] = None
+        self.failure_rate = failure_rate
+        self.latencies = dict(latencies or {})
+        self.failure_rates = dict(failure_rates or {})
+        self.calls = CallCounter()
+        self.failures = CallCounter()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        # Backend name -> number of upcoming calls answered with a 429
+        self._rate_limited: Dict[str, int] = {}
+        self.retry_after: Optional[float] = None
+        # Whether the fake voice pauses at sentence breaks (needed to split batches)
+        self.tts_pauses = True
+        # Host -> HTTP status its pages are answered with (200 if missing)
+        self.http_statuses: Dict[str, int] = {}
+
+    def rate_limit(
+        self, name: str, times: int = 1, retry_after: Optional[float] = None
+    ) -> None:
+        """Makes the next times calls to backend name answer HTTP 429."""
+        with self._random_lock:
+            self._rate_limited[name] = self._rate_limited.get(name, 0) + times
+        self.retry_after = retry_after
+
+    def _wait(self, name: str, error: type = FakeBackendError) -> None:
+        self.calls.hit(name)
+        latency = self.latencies.get(name, self.latency)
+        if latency:
+            time.sleep(latency)
+        with self._random_lock:
+            rate_limited = self._rate_limited.get(name, 0) > 0
+            if rate_limited:
+                self._rate_limited[name] -= 1
+        if rate_limited:
+            self.failures.hit(name)
+            raise FakeRateLimitError(name, self.retry_after)
+        failure_rate = self.failure_rates.get(name, self.failure_rate)
+        if failure_rate:
+            with self._random_lock:
+                fail = self._random.random() < failure_rate
+            if fail:
+                self.failures.hit(name)
+                raise error(f"injected {name} failure")
+
+    # --- DDGS -----------------------------------------------------------
+    def ddgs_factory(self):
+        backends = self
+
+        class FakeDDGS:
+            def __init__(self, *args, **kwargs):
+                backends.calls.hit("ddgs.session")
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                backends.calls.hit("ddgs.close")
+                return False
+
+            def text(self, keywords: str, max_results: Optional[int] = None, **kwargs):
+                backends._wait("ddgs.text")
+                backends._search_failure()
+                count = max_results or 3
+                return [
+                    {
+                        "title": f"{keywords} result {i}",
+                        "body": f"Ich liebe dich mein Herz {i}",
+                        "href": f"https://example.com/{i}",
+                    }
+                    for i in range(count)
+                ]
+
+            def videos(self, keywords: str, max_results: Optional[int] = None, **kwargs):
+                backends._wait("ddgs.videos")
+                backends._search_failure()
+                return [
+                    {
+                        "title": keywords,
+                        "content": "https://youtube.com/watch?v=fake",
+                        "image": "https://example.com/thumb.jpg",
+                        "duration": "3:30",
+                    }
+                ]
+
+        return FakeDDGS
+
+    def _search_failure(self) -> None:
+        error = self.search_error
+        if isinstance(error, Exception):
+            raise error
+        if error:
+            raise RuntimeError(error)
+
+    # --- Translator -------------------------------------------------------
+    def translator_factory(self):
+        backends = self
+
+        class FakeTranslator:
+            def __init__(self, source: str = "auto", target: str = "en", **kwargs):
+                self.source = source
+                self.target = target
+
+            def translate(self, text: str, **kwargs) -> str:
+                backends._wait("translate")
+                lines = text.split("\n")
+                if any(line in backends.untranslatable for line in lines):
+                    raise RuntimeError(f"cannot translate {text!r}")
+                return "\n".join(f"[{self.target}] {line}" for line in lines)
+
+            def translate_batch(self, batch: List[str], **kwargs) -> List[str]:
+                return [self.translate(text) for text in batch]
+
+        return FakeTranslator
+
+    # --- gTTS -------------------------------------------------------------
+    def tts_factory(self):
+        backends = self
+
+        class FakeTTS:
+            def __init__(self, text: str, lang: str = "en", **kwargs):
+                self.text = text
+                self.lang = lang
+
+            def write_to_fp(self, fp) -> None:
+                backends._wait("tts")
+                fp.write(fake_speech(self.text, backends.tts_pauses))
+
+            def save(self, savefile: str) -> None:
+                with open(savefile, "wb") as f:
+                    self.write_to_fp(f)
+
+        return FakeTTS
+
+    # --- HTTP -------------------------------------------------------------
+    def http_module(self):
+        backends = self
+
+        class FakeResponse:
+            encoding = "utf-8"
+
+            def __init__(self, text: str, status_code: int = 200, headers=None):
+                self.text = text
+                self.content = text.encode("utf-8")
+                self.status_code = status_code
+                self.headers = {
+                    "Content-Type": "text/html; charset=utf-8",
+                    **(headers or {}),
+                }
+
+            def iter_content(self, chunk_size: int = 1024):
+                for i in range(0, len(self.content), chunk_size):
+                    yield self.content[i : i + chunk_size]
+
+            def raise_for_status(self) -> None:
+                if self.status_code >= 400:
+                    raise requests.HTTPError(
+                        f"{self.status_code} Client Error", response=self
+                    )
+
+            def close(self) -> None:
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                backends.calls.hit("ddgs.close")
+                return False
+
+        def get(url: str, **kwargs):
+            try:
+                backends._wait("http.get", error=requests.ConnectionError)
+            except FakeRateLimitError as e:
+                return FakeResponse("Too Many Requests", 429, e.response.headers)
+            status = backends.http_statuses.get(urlparse(url).netloc, 200)
+            if status != 200:
+                return FakeResponse("Error", status)
+            return FakeResponse(backends.lyrics_html)
+
+        class FakeSession:
+            def get(self, url: str, **kwargs):
+                return get(url, **kwargs)
+
+            def mount(self, prefix, adapter) -> None:
+                pass
+
+            def close(self) -> None:
+                pass
+
+        return types.SimpleNamespace(
+            get=get,
+            Session=FakeSession,
+            RequestException=requests.RequestException,
+            adapters=requests.adapters,
+        )
+
+
+def install_fake_backends(monkeypatch, latency: float = 0.0, **kwargs) -> FakeBackends:
+    """
+    Replaces every external backend in src/tools with a local fake.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture
+        latency (float): Seconds each fake backend call sleeps
+        **kwargs: Further FakeBackends options (failure_rate, latencies, ...)
+
+    Returns:
+        FakeBackends: The installed fakes, exposing per-backend call counts
+    """
+    from src.tools import audio_tools, content_tools, resilience, search_tools, shared_cache
+
+    backends = FakeBackends(latency=latency, **kwargs)
+    # Tools use their own caches unless a test configures a shared one
+    monkeypatch.setattr(shared_cache, "_shared_cache", None)
+    # Fresh circuit breakers, and no rate limits unless a test configures them
+    monkeypatch.setattr(resilience, "_guards", {})
+    monkeypatch.setattr(resilience, "_settings", {})
+    monkeypatch.setattr(resilience, "BACKEND_RATE_LIMITS", {})
+    monkeypatch.setattr(search_tools, "DDGS", backends.ddgs_factory())
+    # Drop any shared clients (and their caches) bound to the real backends
+    monkeypatch.setattr(search_tools, "_search_client", None)
+    monkeypatch.setattr(search_tools, "_http_session", None)
+    monkeypatch.setattr(search_tools, "requests", backends.http_module())
+    monkeypatch.setattr(content_tools, "GoogleTranslator", backends.translator_factory())
+    monkeypatch.setattr(audio_tools, "gTTS", backends.tts_factory())
+    return backends
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for a redis-py client, covering what
+    RedisCacheBackend uses (mget, pipelined set with px, delete).
+
+    Several RedisCacheBackend instances given the same FakeRedis behave like
+    workers sharing one server.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.calls = CallCounter()
+        self._clock = clock
+        # key -> (expires_at, value)
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self.calls.hit("mget")
+        now = self._clock()
+        with self._lock:
+            values = []
+            for key in keys:
+                entry = self._data.get(key)
+                values.append(entry[1] if entry and entry[0] > now else None)
+            return values
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None) -> bool:
+        self.calls.hit("set")
+        expires_at = self._clock() + px / 1000 if px else float("inf")
+        with self._lock:
+            self._data[key] = (expires_at, bytes(value))
+        return True
+
+    def delete(self, *keys: str) -> int:
+        self.calls.hit("delete")
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction: bool = True) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._commands: List[tuple] = []
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None) -> "_FakePipeline":
+        self._commands.append((key, value, px))
+        return self
+
+    def execute(self) -> List[bool]:
+        self._client.calls.hit("pipeline")
+        results = []
+        for key, value, px in self._commands:
+            expires_at = self._client._clock() + px / 1000 if px else float("inf")
+            with self._client._lock:
+                self._client._data[key] = (expires_at, bytes(value))
+            results.append(True)
+        self._commands = []
+        return results
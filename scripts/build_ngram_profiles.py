@@ -0,0 +1,63 @@
+"""
+Builds the compact character n-gram profiles used by NgramDetector.
+
+The profiles are cut down from langdetect's bundled profiles: every unigram
+plus the most frequent bigrams and trigrams of each requested language.
+NgramDetector lowercases its input, so grams differing only in case are
+merged first. langdetect is only needed to run this script, not at runtime.
+
+Usage:
+    python scripts/build_ngram_profiles.py [--languages de es fr it en]
+"""
+
+import argparse
+import json
+import os
+
+import langdetect
+
+OUTPUT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "src",
+    "tools",
+    "data",
+    "ngram_profiles.json",
+)
+TOP_K = {1: None, 2: 300, 3: 600}
+
+
+def build_profile(language: str) -> dict:
+    path = os.path.join(os.path.dirname(langdetect.__file__), "profiles", language)
+    with open(path, encoding="utf-8") as f:
+        profile = json.load(f)
+
+    # Mixed-case grams could never match lowercased text; count them as lowercase
+    merged = {}
+    for gram, count in profile["freq"].items():
+        merged[gram.lower()] = merged.get(gram.lower(), 0) + count
+
+    freq = {}
+    for n, top_k in TOP_K.items():
+        grams = sorted(
+            (item for item in merged.items() if len(item[0]) == n),
+            key=lambda item: (-item[1], item[0]),
+        )
+        freq.update(grams[:top_k] if top_k else grams)
+    return {"n_words": profile["n_words"], "freq": freq}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--languages", nargs="+", default=["de", "es", "fr", "it", "en"])
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    profiles = {language: build_profile(language) for language in args.languages}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {len(profiles)} profiles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Fills the shared caches for popular requests, e.g. nightly or after a deploy.
+
+The manifest is a JSONL file with one item per line:
+
+    {"language": "de", "type": "song"}
+    {"language": "German", "type": "poem", "audio": true}
+    {"language": "es", "type": "vocabulary", "topic": "food"}
+    {"language": "fr", "type": "translation", "topic": "good morning"}
+
+Each item runs through the full pipeline, --concurrency at a time, filling
+the search, lyrics, translation, audio and response caches in the shared
+cache the workers are configured with (--shared-cache). Progress goes to
+stderr, one line per item, and a JSON summary with the failures and the
+throughput to stdout. Finished items are recorded in --state, so rerunning
+after an interruption continues where it stopped, and rerunning within
+--max-age only retries failed items. Exits with status 1 if any item failed.
+
+Usage:
+    python scripts/prewarm_caches.py manifest.jsonl [--concurrency 4]
+    python scripts/prewarm_caches.py manifest.jsonl --shared-cache redis://cache:6379/0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.prewarm import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_AGE,
+    DEFAULT_STATE_PATH,
+    parse_manifest,
+    prewarm,
+)
+from src.tools.shared_cache import DEFAULT_SHARED_CACHE_PATH, configure_shared_cache
+
+
+def report(record: dict, summary: dict) -> None:
+    done = summary["skipped"] + summary["warmed"] + summary["failed"]
+    line = (
+        f"[{done}/{summary['items']}] {record['status']} {record['request']}"
+        f" ({record['seconds']}s)"
+    )
+    if record["error"]:
+        line += f": {record['error']}"
+    print(line, file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("manifest", help="JSONL manifest, or - for stdin")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH)
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE,
+        help="Seconds after which finished items are warmed again",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="Time budget per request"
+    )
+    parser.add_argument(
+        "--shared-cache",
+        default=DEFAULT_SHARED_CACHE_PATH,
+        help="SQLite path or redis:// URL the workers use",
+    )
+    args = parser.parse_args()
+
+    manifest = sys.stdin if args.manifest == "-" else open(args.manifest, encoding="utf-8")
+    with manifest:
+        try:
+            items = parse_manifest(manifest)
+        except ValueError as e:
+            parser.error(str(e))
+
+    configure_shared_cache(args.shared_cache)
+    summary = asyncio.run(
+        prewarm(
+            items,
+            state_path=args.state,
+            concurrency=args.concurrency,
+            max_age=args.max_age,
+            timeout=args.timeout,
+            on_progress=report,
+        )
+    )
+    print(json.dumps(summary, ensure_ascii=False))
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Scores JSONL records with analyze_language_confidence in constant memory.
+
+Each input line is a JSON object holding the text under --text-field (or a
+bare JSON string); each output line adds the analysis under "validation".
+
+Usage:
+    python scripts/validate_jsonl.py messages.jsonl -o scored.jsonl
+    cat messages.jsonl | python scripts/validate_jsonl.py - > scored.jsonl
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools.validation_tools import DEFAULT_BATCH_SIZE, analyze_jsonl
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", help="Input JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_file = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    with input_file, output_file:
+        written = analyze_jsonl(input_file, output_file, args.text_field, args.batch_size)
+    print(f"Scored {written} records", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
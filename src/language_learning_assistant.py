@@ -1,29 +1,325 @@
-from typing import Dict, Optional
-from src.tools.validation_tools import analyze_language_confidence
+import asyncio
+import contextvars
+import copy
+import os
+import re
+import time
+from dataclasses import astuple, dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from src.tools.validation_tools import analyze_language_confidence_async
 from src.tools.content_tools import ContentCreator, generate_practice_lessons
-from src.tools.audio_tools import generate_audio
-from src.tools.search_tools import web_search, find_youtube_video, get_song_lyrics
+from src.tools.executor import run_blocking
+from src.tools.audio_tools import (
+    batch_words,
+    generate_audio_async,
+    generate_audio_batch_async,
+)
+from src.tools.vocabulary_store import VocabularyStore
+from src.tools.cache import CacheLookup, RevalidatingCache
+from src.tools.shared_cache import get_shared_cache
+from src.tools.metrics import (
+    RequestTrace,
+    end_trace,
+    record_cache,
+    record_error,
+    stage,
+    start_trace,
+)
+from src.tools.resilience import BackendUnavailableError
+from src.tools.stage_graph import StageGraph, StageRun
+from src.tools.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    end_deadline,
+    get_deadline,
+    remaining_time,
+    start_deadline,
+)
+from src.tools.search_tools import (
+    web_search_async,
+    find_youtube_video_async,
+    get_song_lyrics_async,
+)
+
+
+# Maximum number of vocabulary words synthesized at the same time per request
+DEFAULT_AUDIO_CONCURRENCY = 4
+# Maximum number of distinct requests process_requests runs at the same time
+DEFAULT_REQUEST_CONCURRENCY = 8
+
+# Event types emitted by process_request_stream, in pipeline order
+EVENT_VALIDATION = "validation"
+EVENT_VIDEO = "video"
+EVENT_TRANSLATION = "translation"
+EVENT_VOCABULARY = "vocabulary"
+EVENT_AUDIO = "audio"
+EVENT_EXERCISES = "exercises"
+EVENT_RESULT = "result"
+
+# Placed where an optional stage's output would be when the deadline dropped it
+SKIPPED_MESSAGE = "Skipped: request deadline exceeded"
+# Fraction of the remaining budget the video search may use, so a slow video
+# does not hold up a song whose lyrics and translation are already done
+VIDEO_BUDGET_SHARE = 0.5
+
+# Whole responses are reused for this many seconds, and popular ones served
+# stale for up to RESPONSE_STALE_TTL more while they are refreshed
+RESPONSE_TTL = 10 * 60
+RESPONSE_STALE_TTL = 60 * 60
+MAX_CACHED_RESPONSES = 1024
+
+# Request types, in the order they are checked
+REQUEST_SONG = "song"
+REQUEST_POEM = "poem"
+REQUEST_VOCABULARY = "vocabulary"
+REQUEST_TRANSLATION = "translation"
+
+AUDIO_WORDS = ["pronounce", "pronunciation", "say", "speak", "audio", "sound"]
+VOCABULARY_WORDS = ["vocabulary", "words", "vocab"]
+# Dropped from the end of a vocabulary topic, as in "about food, please?"
+TOPIC_FILLER_WORDS = {"please", "thanks"}
+
+
+@dataclass
+class StreamEvent:
+    """A partial result emitted by process_request_stream as a stage completes."""
+
+    type: str
+    data: Any
+
+
+@dataclass(frozen=True)
+class RequestIntent:
+    """
+    What a request asks for, reduced to what the response depends on.
+
+    Requests with equal intents get the same response, so the intent is also
+    the key of the response cache.
+    """
+
+    type: str
+    target_language: str
+    native_language: str
+    # Vocabulary topic or text to translate; empty for songs and poems,
+    # which do not depend on it
+    subject: str
+    wants_audio: bool
 
 
 class LanguageLearningAssistant:
-    def __init__(self):
+    def __init__(
+        self,
+        audio_concurrency: int = DEFAULT_AUDIO_CONCURRENCY,
+        request_concurrency: int = DEFAULT_REQUEST_CONCURRENCY,
+        include_timings: bool = False,
+        request_timeout: Optional[float] = None,
+        batch_audio: bool = True,
+        response_cache: Optional[RevalidatingCache] = None,
+        use_response_cache: bool = True,
+        share_responses: bool = True,
+    ):
         self.content_creator = ContentCreator()
+        self.vocabulary_store = VocabularyStore()
+        self.audio_concurrency = audio_concurrency
+        self.request_concurrency = request_concurrency
+        # Add a per-stage timing breakdown to every result under "timings"
+        self.include_timings = include_timings
+        # Default time budget in seconds for every request (None for no limit)
+        self.request_timeout = request_timeout
+        # Speak vocabulary in batched TTS requests cut into per-word clips
+        self.batch_audio = batch_audio
+        # Pipelines currently running, keyed by request_key
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Successful responses by RequestIntent
+        if use_response_cache and response_cache is None:
+            response_cache = RevalidatingCache(
+                MAX_CACHED_RESPONSES, RESPONSE_TTL, RESPONSE_STALE_TTL
+            )
+        self.response_cache = response_cache if use_response_cache else None
+        # With a shared cache configured, responses are also published to its
+        # "response" namespace and looked up there on a local miss, so workers
+        # (and the prewarm job) fill each other's response caches
+        self.share_responses = share_responses
+        # Background refreshes of stale responses, kept so they are not collected
+        self._refreshes: set = set()
+
+    @property
+    def shared_responses(self):
+        """The shared "response" CacheNamespace configured right now, or None."""
+        shared_cache = get_shared_cache() if self.share_responses else None
+        return shared_cache.namespace("response") if shared_cache is not None else None
 
     async def process_request(
-        self, user_request: str, native_language: str = "en"
+        self,
+        user_request: str,
+        native_language: str = "en",
+        timeout: Optional[float] = None,
     ) -> Dict:
         """
         Main decision-making method that determines which tools to use based on the request.
+
+        Equivalent requests (see request_key) that arrive while one is already
+        running share that pipeline execution instead of starting another, and
+        with it the deadline of the request that started it.
+
+        Args:
+            user_request: The student's question
+            native_language: Student's native language
+            timeout: Time budget in seconds (defaults to request_timeout). When
+                it runs out, optional stages (video, audio, exercises) are
+                dropped and listed under "skipped"; running out during a
+                required stage returns an error result with "timed_out"
+        """
+        key = self.request_key(user_request, native_language)
+        pipeline = self._inflight.get(key)
+        if pipeline is None:
+            pipeline = asyncio.ensure_future(
+                self._run_pipeline(user_request, native_language, timeout)
+            )
+            self._inflight[key] = pipeline
+            pipeline.add_done_callback(lambda done: self._forget_inflight(key, done))
+
+        # Shielded so one caller giving up does not cancel it for the others
+        result = await asyncio.shield(pipeline)
+        # Every caller gets its own copy of the shared result
+        return copy.deepcopy(result)
+
+    async def process_requests(
+        self,
+        user_requests: List[str],
+        native_language: str = "en",
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """
+        Processes many requests, at most concurrency distinct pipelines at a time.
+
+        Equivalent requests in the list run once and share the result.
+
+        Args:
+            user_requests: Requests to process
+            native_language: Student's native language for every request
+            concurrency: Limit on concurrent pipelines (defaults to request_concurrency)
+            timeout: Time budget of each request, counted from when it starts
+
+        Returns:
+            List of results in the same order as user_requests
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.request_concurrency)
+        unique: Dict[Tuple[str, str], str] = {}
+        for user_request in user_requests:
+            unique.setdefault(self.request_key(user_request, native_language), user_request)
+
+        async def run(user_request: str) -> Dict:
+            async with semaphore:
+                return await self.process_request(
+                    user_request, native_language, timeout
+                )
+
+        results = await asyncio.gather(*(run(request) for request in unique.values()))
+        by_key = dict(zip(unique, results))
+        return [
+            copy.deepcopy(by_key[self.request_key(user_request, native_language)])
+            for user_request in user_requests
+        ]
+
+    @staticmethod
+    def request_key(user_request: str, native_language: str = "en") -> Tuple[str, str]:
         """
+        Returns the key under which equivalent requests are coalesced.
+
+        Uses normalize_request, like request_intent, so coalesced requests
+        always have the same intent: case is ignored except in the text to
+        translate.
+        """
+        return native_language, LanguageLearningAssistant.normalize_request(user_request)
+
+    @staticmethod
+    def normalize_request(user_request: str) -> str:
+        """
+        Collapses whitespace and lowercases a request, except for the text to
+        translate: quoted text, or the whole of an unquoted translation
+        request, keeps its case.
+        """
+        request = " ".join(user_request.split())
+        parts = request.split("'")
+        lowered = "'".join(
+            part if i % 2 else part.lower() for i, part in enumerate(parts)
+        )
+        if len(parts) == 1 and (
+            LanguageLearningAssistant._request_type(lowered) == REQUEST_TRANSLATION
+        ):
+            return request
+        return lowered
+
+    def _forget_inflight(self, key: Tuple[str, str], pipeline: asyncio.Future) -> None:
+        if self._inflight.get(key) is pipeline:
+            del self._inflight[key]
+
+    async def _run_pipeline(
+        self, user_request: str, native_language: str, timeout: Optional[float]
+    ) -> Dict:
+        result = None
+        async for event in self.process_request_stream(
+            user_request, native_language, timeout
+        ):
+            if event.type == EVENT_RESULT:
+                result = event.data
+        return result
+
+    async def process_request_stream(
+        self,
+        user_request: str,
+        native_language: str = "en",
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Same pipeline as process_request, yielding a StreamEvent as each stage completes.
+
+        Events arrive in this order, skipping stages a request type does not use:
+        validation, translation, one vocabulary event per word, one audio event
+        per generated file, exercises. A song's video event comes as soon as the
+        video lookup finishes, anywhere between validation and the result. The
+        last event is always of type "result" and holds the dict process_request
+        returns. A response served from the response cache comes as the
+        validation and result events only.
+        """
+        if timeout is None:
+            timeout = self.request_timeout
+        trace = RequestTrace() if self.include_timings else None
+        token = start_trace(trace) if trace is not None else None
+        deadline_token = (
+            start_deadline(Deadline(timeout)) if timeout is not None else None
+        )
+        try:
+            with stage("request"):
+                async for event in self._pipeline_events(user_request, native_language):
+                    if event.type == EVENT_RESULT and trace is not None:
+                        event.data["timings"] = trace.breakdown()
+                    yield event
+        finally:
+            if deadline_token is not None:
+                end_deadline(deadline_token)
+            if token is not None:
+                end_trace(token)
+
+    async def _pipeline_events(
+        self, user_request: str, native_language: str
+    ) -> AsyncIterator[StreamEvent]:
         try:
             # STEP 1: Validation Tool
-            validation = analyze_language_confidence(user_request)
+            validation = await analyze_language_confidence_async(user_request)
+            yield StreamEvent(EVENT_VALIDATION, validation)
 
             if not validation["is_language_question"]:
-                return {
-                    "status": "error",
-                    "message": "Please ask a language-related question.",
-                }
+                yield StreamEvent(
+                    EVENT_RESULT,
+                    {
+                        "status": "error",
+                        "message": "Please ask a language-related question.",
+                    },
+                )
+                return
 
             # STEP 2: Language Detection
             target_language = (
@@ -32,224 +328,588 @@ class LanguageLearningAssistant:
                 else None
             )
             if not target_language:
-                return {
-                    "status": "error",
-                    "message": "Please specify which language you want to learn about.",
-                }
-
-            # STEP 3: Audio Request Detection
-            wants_audio = any(
-                word in user_request.lower()
-                for word in [
-                    "pronounce",
-                    "pronunciation",
-                    "say",
-                    "speak",
-                    "audio",
-                    "sound",
-                ]
-            )
-
-            # STEP 4: Request Type Classification and Tool Selection
-            if "song" in user_request.lower():
-                # Uses: search_tools (web_search, find_youtube_video, get_song_lyrics)
-                #       content_tools (for translation)
-                #       audio_tools (if requested)
-                return await self._handle_song_request(
-                    user_request, target_language, native_language, wants_audio
+                yield StreamEvent(
+                    EVENT_RESULT,
+                    {
+                        "status": "error",
+                        "message": "Please specify which language you want to learn about.",
+                    },
                 )
+                return
 
-            elif "poem" in user_request.lower():
-                # Uses: search_tools (web_search)
-                #       content_tools (for translation)
-                #       audio_tools (if requested)
-                return await self._handle_poem_request(
-                    user_request, target_language, native_language, wants_audio
-                )
+            intent = self.request_intent(user_request, target_language, native_language)
+            async for event in self._respond(intent):
+                yield event
 
-            elif any(
-                word in user_request.lower()
-                for word in ["vocabulary", "words", "vocab"]
-            ):
-                # Uses: content_tools (for vocabulary and translation)
-                #       audio_tools (if requested)
-                return await self._handle_vocabulary_request(
-                    user_request, target_language, native_language, wants_audio
-                )
+        except DeadlineExceeded as e:
+            record_error("request")
+            yield StreamEvent(
+                EVENT_RESULT,
+                {
+                    "status": "error",
+                    "message": str(e),
+                    "timed_out": True,
+                    "stage": e.stage,
+                },
+            )
 
-            else:
-                # Uses: content_tools (for translation)
-                #       audio_tools (if requested)
-                return await self._handle_general_translation_request(
-                    user_request, target_language, native_language, wants_audio
-                )
+        except BackendUnavailableError as e:
+            # Degraded rather than broken: tell the caller when to come back
+            record_error("request")
+            yield StreamEvent(
+                EVENT_RESULT,
+                {
+                    "status": "error",
+                    "message": str(e),
+                    "backend": e.backend,
+                    "reason": e.reason,
+                    "retry_after": round(e.retry_after, 1),
+                },
+            )
 
         except Exception as e:
-            return {"status": "error", "message": f"An error occurred: {str(e)}"}
+            record_error("request")
+            yield StreamEvent(
+                EVENT_RESULT,
+                {"status": "error", "message": f"An error occurred: {str(e)}"},
+            )
 
-    async def _handle_song_request(
-        self,
-        request: str,
-        target_language: str,
-        native_language: str,
-        wants_audio: bool,
-    ) -> Dict:
-        """Handle requests for songs"""
-        # Search for song
-        search_results = web_search(f"popular {target_language} song lyrics")
-
-        # Find video
-        video_info = find_youtube_video(
-            search_results.split("\n")[0]
-        )  # Use first search result
-
-        # Get lyrics
-        lyrics = get_song_lyrics(search_results.split("\n")[0])
-
-        # Create learning content from lyrics
-        content = self.content_creator.create_learning_content(
-            text=lyrics,
-            target_language=target_language,
-            native_language=native_language,
+    @staticmethod
+    def request_intent(
+        user_request: str, target_language: str, native_language: str = "en"
+    ) -> RequestIntent:
+        """
+        Classifies a validated request and extracts what its response depends on.
+
+        Args:
+            user_request: The student's question
+            target_language: Language detected by validation
+            native_language: Student's native language
+        """
+        request = LanguageLearningAssistant.normalize_request(user_request)
+        text = request.lower()
+
+        # STEP 3: Audio Request Detection
+        wants_audio = any(word in text for word in AUDIO_WORDS)
+
+        # STEP 4: Request Type Classification and Tool Selection
+        request_type = LanguageLearningAssistant._request_type(text)
+        subject = ""
+        if request_type == REQUEST_VOCABULARY:
+            subject = LanguageLearningAssistant._vocabulary_topic(text)
+        elif request_type == REQUEST_TRANSLATION:
+            # The quoted text verbatim, or else the whole request as written
+            subject = request.split("'")[1] if "'" in request else request
+
+        return RequestIntent(
+            request_type, target_language, native_language, subject, wants_audio
         )
 
-        result = {
-            "status": "success",
-            "type": "song",
-            "content": content,
-            "video": video_info,
-        }
+    @staticmethod
+    def _request_type(text: str) -> str:
+        """Request type of a lowercased request."""
+        if "song" in text:
+            # Uses: search_tools (web_search, find_youtube_video, get_song_lyrics)
+            #       content_tools (for translation)
+            #       audio_tools (if requested)
+            return REQUEST_SONG
+        if "poem" in text:
+            # Uses: search_tools (web_search)
+            #       content_tools (for translation)
+            #       audio_tools (if requested)
+            return REQUEST_POEM
+        if any(word in text for word in VOCABULARY_WORDS):
+            # Uses: vocabulary_store (offline packs)
+            #       search_tools (web_search, for topics without a pack)
+            #       content_tools (for vocabulary and translation)
+            #       audio_tools (if requested)
+            return REQUEST_VOCABULARY
+        # Uses: content_tools (for translation)
+        #       audio_tools (if requested)
+        return REQUEST_TRANSLATION
+
+    @staticmethod
+    def _vocabulary_topic(text: str) -> str:
+        """Topic after "about" in a lowercased request, or "common words"."""
+        if "about" not in text:
+            return "common words"
+        words = re.findall(r"[^\W_]+(?:['-][^\W_]+)*", text.split("about")[-1])
+        while words and words[-1] in TOPIC_FILLER_WORDS:
+            words.pop()
+        return " ".join(words) or "common words"
+
+    def _handler(self, intent: RequestIntent):
+        return {
+            REQUEST_SONG: self._handle_song_request,
+            REQUEST_POEM: self._handle_poem_request,
+            REQUEST_VOCABULARY: self._handle_vocabulary_request,
+            REQUEST_TRANSLATION: self._handle_general_translation_request,
+        }[intent.type]
+
+    async def _respond(self, intent: RequestIntent) -> AsyncIterator[StreamEvent]:
+        """
+        Runs the handler for intent, or answers from the response cache.
 
-        # Only generate audio if requested
-        if wants_audio:
-            vocab_audio = {}
-            for word in content["vocabulary"]["words"]:
-                audio_path = generate_audio(word, target_language)
-                vocab_audio[word] = audio_path
-            result["vocabulary_audio"] = vocab_audio
+        A cached response is emitted as the result event alone, as a deep
+        copy so callers cannot change the cached one. A stale response is
+        refreshed in the background by the first request that sees it.
+        """
+        if self.response_cache is not None:
+            cached = self.response_cache.lookup(intent)
+            shared_responses = self.shared_responses
+            if cached.value is None and shared_responses is not None:
+                cached = await self._shared_response(shared_responses, intent)
+            if cached.value is not None and self._audio_files_exist(cached.value):
+                record_cache(
+                    "response", hits=int(not cached.stale), stale=int(cached.stale)
+                )
+                if cached.refresh:
+                    self._start_refresh(intent)
+                yield StreamEvent(EVENT_RESULT, copy.deepcopy(cached.value))
+                return
+            if cached.value is not None:
+                # Audio files were evicted from the audio cache since
+                self.response_cache.delete(intent)
+            record_cache("response", misses=1)
+
+        async for event in self._handler(intent)(intent):
+            if event.type == EVENT_RESULT:
+                await self._cache_response(intent, event.data)
+            yield event
+
+    async def _shared_response(
+        self, shared_responses, intent: RequestIntent
+    ) -> CacheLookup:
+        """
+        Looks intent up in the shared response cache and copies it locally.
 
-        # Generate practice exercises
-        exercises = generate_practice_lessons(
-            content["vocabulary"]["words"], content["vocabulary"]["translations"]
+        The entry keeps the age it has in the shared cache, so it is fresh for
+        the rest of the worker's TTL. Older entries, such as those the nightly
+        prewarm job filled, are served stale and refreshed for as long as the
+        shared cache keeps them (its "response" namespace TTL).
+        """
+        shared = await run_blocking(shared_responses.get, astuple(intent))
+        if shared is None:
+            return CacheLookup(None, False, False)
+        age = max(0.0, time.time() - shared["stored_at"])
+        ttl = self.response_cache.ttl - age
+        self.response_cache.set(
+            intent,
+            shared["result"],
+            max(0.0, ttl),
+            hits=self.response_cache.refresh_min_hits,
+        )
+        if ttl > 0:
+            return CacheLookup(shared["result"], False, False)
+        return self.response_cache.lookup(intent)
+
+    async def _cache_response(self, intent: RequestIntent, result: Dict) -> bool:
+        """Caches complete, successful responses; returns whether it did."""
+        if result.get("status") != "success" or result.get("skipped"):
+            return False
+        shared_responses = self.shared_responses
+        if self.response_cache is None and shared_responses is None:
+            return False
+        if self.response_cache is not None:
+            self.response_cache.set(intent, copy.deepcopy(result))
+        if shared_responses is not None:
+            # Stored with its time so other workers can tell how fresh it is
+            await run_blocking(
+                shared_responses.set,
+                astuple(intent),
+                {"result": result, "stored_at": time.time()},
+            )
+        return True
+
+    @staticmethod
+    def _audio_files_exist(result: Dict) -> bool:
+        paths = [result.get("audio")]
+        paths += list((result.get("vocabulary_audio") or {}).values())
+        return all(
+            os.path.exists(path)
+            for path in paths
+            if isinstance(path, str) and path.endswith(".mp3")
         )
-        result["exercises"] = exercises
-
-        return result
 
-    async def _handle_poem_request(
-        self,
-        request: str,
-        target_language: str,
-        native_language: str,
-        wants_audio: bool,
-    ) -> Dict:
-        """Handle requests for poems"""
-        # Search for poem
-        search_results = web_search(f"famous {target_language} poem")
-
-        # Create learning content
-        content = self.content_creator.create_learning_content(
-            text=search_results.split("\n")[0],  # Use first search result
-            target_language=target_language,
-            native_language=native_language,
+    def _start_refresh(self, intent: RequestIntent) -> None:
+        # Started from an empty context so the refresh has no deadline and
+        # does not add to the timings of the request that triggered it
+        task = contextvars.Context().run(
+            asyncio.ensure_future, self._refresh(intent)
         )
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
 
-        result = {
-            "status": "success",
-            "type": "poem",
-            "content": content,
-        }
+    async def _refresh(self, intent: RequestIntent) -> None:
+        refreshed = False
+        try:
+            async for event in self._handler(intent)(intent):
+                if event.type == EVENT_RESULT:
+                    refreshed = await self._cache_response(intent, event.data)
+        except Exception:
+            record_error("response_refresh")
+        finally:
+            if not refreshed:
+                self.response_cache.refresh_failed(intent)
+
+    async def _generate_vocabulary_audio(
+        self, words: List[str], target_language: str
+    ) -> Dict[str, str]:
+        """
+        Generates pronunciation audio for every vocabulary word concurrently.
+
+        At most audio_concurrency TTS requests (single words, or batches when
+        batch_audio is set) run at once. Each entry holds the audio path or the
+        error string returned by generate_audio.
+        """
+        audio_paths = dict.fromkeys(words)
+        async for word, audio_path in self._stream_vocabulary_audio(
+            words, target_language
+        ):
+            audio_paths[word] = audio_path
+        return audio_paths
+
+    async def _stream_vocabulary_audio(
+        self, words: List[str], target_language: str
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Yields (word, audio path or error) pairs as each synthesis finishes.
+
+        Raises DeadlineExceeded once the request's budget runs out, after
+        yielding the words that finished in time.
+        """
+        semaphore = asyncio.Semaphore(self.audio_concurrency)
+
+        async def synthesize(group: List[str]) -> List[Tuple[str, str]]:
+            async with semaphore:
+                if len(group) == 1:
+                    path = await generate_audio_async(group[0], target_language)
+                    return [(group[0], path)]
+                paths = await generate_audio_batch_async(group, target_language)
+                return list(paths.items())
+
+        groups = batch_words(words) if self.batch_audio else [[word] for word in words]
+        deadline = get_deadline()
+        tasks = [asyncio.ensure_future(synthesize(group)) for group in groups]
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=remaining_time()):
+                try:
+                    finished = await next_done
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded(
+                        "vocabulary_audio", deadline.budget
+                    ) from None
+                for pair in finished:
+                    yield pair
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _content_events(
+        self, run: StageRun, wants_audio: bool, target_language: str, result: Dict
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Shared tail of the song, poem and vocabulary pipelines.
+
+        Waits for the run's "translation" stage, then emits the translation,
+        each vocabulary item, each audio file and the exercises, filling in
+        result as it goes. The exercises stage (see _add_content_stages) runs
+        while the audio is generated.
+        """
+        content = await run.result("translation")
+        result["content"] = content
+        yield StreamEvent(
+            EVENT_TRANSLATION,
+            {
+                "original_text": content.get("original_text"),
+                "translation": content.get("translation"),
+            },
+        )
+        words = content["vocabulary"]["words"]
+        translations = content["vocabulary"]["translations"]
+        for word in words:
+            yield StreamEvent(
+                EVENT_VOCABULARY, {"word": word, "translation": translations[word]}
+            )
 
         # Only generate audio if requested
         if wants_audio:
-            vocab_audio = {}
-            for word in content["vocabulary"]["words"]:
-                audio_path = generate_audio(word, target_language)
-                vocab_audio[word] = audio_path
+            vocab_audio = dict.fromkeys(words)
+            try:
+                async for word, audio_path in self._stream_vocabulary_audio(
+                    words, target_language
+                ):
+                    vocab_audio[word] = audio_path
+                    yield StreamEvent(EVENT_AUDIO, {"word": word, "path": audio_path})
+            except DeadlineExceeded:
+                for word, audio_path in vocab_audio.items():
+                    if audio_path is None:
+                        vocab_audio[word] = SKIPPED_MESSAGE
+                self._skip(result, "vocabulary_audio")
             result["vocabulary_audio"] = vocab_audio
 
-        # Generate practice exercises
-        exercises = generate_practice_lessons(
-            content["vocabulary"]["words"], content["vocabulary"]["translations"]
-        )
+        exercises = await run.result("exercises")
         result["exercises"] = exercises
+        yield StreamEvent(EVENT_EXERCISES, exercises)
 
-        return result
+    @staticmethod
+    async def _merge_events(
+        *streams: AsyncIterator[StreamEvent],
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Yields the events of several streams as soon as any of them has one.
 
-    async def _handle_vocabulary_request(
+        The first error raised by a stream ends the merged stream; the other
+        streams are then cancelled.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        async def pump(stream: AsyncIterator[StreamEvent]) -> None:
+            try:
+                async for event in stream:
+                    queue.put_nowait((event, None))
+                queue.put_nowait((finished, None))
+            except Exception as e:
+                queue.put_nowait((None, e))
+
+        tasks = [asyncio.ensure_future(pump(stream)) for stream in streams]
+        try:
+            running = len(tasks)
+            while running:
+                event, error = await queue.get()
+                if error is not None:
+                    raise error
+                if event is finished:
+                    running -= 1
+                else:
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _skip(result: Dict, stage_name: str) -> None:
+        """Marks an optional stage as dropped because the deadline ran out."""
+        result.setdefault("skipped", []).append(stage_name)
+
+    def _start(self, graph: StageGraph, result: Dict) -> StageRun:
+        return graph.start(on_skip=lambda stage_name: self._skip(result, stage_name))
+
+    def _add_translation_stage(
         self,
-        request: str,
+        graph: StageGraph,
         target_language: str,
         native_language: str,
-        wants_audio: bool,
-    ) -> Dict:
-        """Handle requests for vocabulary"""
-        # Extract topic if specified
-        topic = (
-            request.lower().split("about")[-1].strip()
-            if "about" in request.lower()
-            else "common words"
+        after: str,
+        pick_text=lambda text: text,
+    ) -> None:
+        """Adds the "translation" stage, creating learning content from after's text."""
+
+        async def translate(text: str) -> Dict:
+            content = await self.content_creator.create_learning_content_async(
+                text=pick_text(text),
+                target_language=target_language,
+                native_language=native_language,
+            )
+            if "error" in content:
+                # Nothing to build exercises or audio from
+                raise RuntimeError(content["error"])
+            return content
+
+        graph.add("translation", translate, after=[after])
+
+    @staticmethod
+    def _add_content_stages(graph: StageGraph) -> None:
+        """Adds the stages every content pipeline runs after "translation"."""
+        graph.add(
+            "exercises",
+            lambda content: run_blocking(
+                generate_practice_lessons,
+                content["vocabulary"]["words"],
+                content["vocabulary"]["translations"],
+            ),
+            after=["translation"],
+            optional=True,
+            fallback={"error": SKIPPED_MESSAGE},
         )
 
-        # Search for vocabulary
-        search_results = web_search(f"{target_language} vocabulary {topic}")
+    @staticmethod
+    def _first_result(search_results: str) -> str:
+        return search_results.split("\n")[0]
 
-        # Create learning content
-        content = self.content_creator.create_learning_content(
-            text=search_results,
-            target_language=target_language,
-            native_language=native_language,
+    async def _handle_song_request(
+        self, intent: RequestIntent
+    ) -> AsyncIterator[StreamEvent]:
+        """Handle requests for songs"""
+        result = {"status": "success", "type": "song"}
+        target_language = intent.target_language
+        native_language = intent.native_language
+
+        # The video and the lyrics both only need the first search result, so
+        # they are looked up at the same time. A failed search ends the request
+        # instead of being passed on to the video, lyrics and translation backends.
+        graph = StageGraph()
+        graph.add(
+            "search",
+            lambda: web_search_async(
+                f"popular {target_language} song lyrics", raise_errors=True
+            ),
         )
+        graph.add(
+            "video",
+            lambda search: find_youtube_video_async(self._first_result(search)),
+            after=["search"],
+            optional=True,
+            fallback={"error": SKIPPED_MESSAGE},
+            share=VIDEO_BUDGET_SHARE,
+        )
+        graph.add(
+            "lyrics",
+            lambda search: get_song_lyrics_async(
+                self._first_result(search), raise_errors=True
+            ),
+            after=["search"],
+        )
+        self._add_translation_stage(graph, target_language, native_language, "lyrics")
+        self._add_content_stages(graph)
+
+        async def video_events() -> AsyncIterator[StreamEvent]:
+            video_info = await run.result("video")
+            result["video"] = video_info
+            yield StreamEvent(EVENT_VIDEO, video_info)
+
+        async with self._start(graph, result) as run:
+            # The optional video lookup must not hold back the translation
+            async for event in self._merge_events(
+                video_events(),
+                self._content_events(run, intent.wants_audio, target_language, result),
+            ):
+                yield event
 
-        result = {
-            "status": "success",
-            "type": "vocabulary",
-            "content": content,
-        }
-
-        # Only generate audio if requested
-        if wants_audio:
-            vocab_audio = {}
-            for word in content["vocabulary"]["words"]:
-                audio_path = generate_audio(word, target_language)
-                vocab_audio[word] = audio_path
-            result["vocabulary_audio"] = vocab_audio
+        yield StreamEvent(EVENT_RESULT, result)
 
-        # Generate practice exercises
-        exercises = generate_practice_lessons(
-            content["vocabulary"]["words"], content["vocabulary"]["translations"]
+    async def _handle_poem_request(
+        self, intent: RequestIntent
+    ) -> AsyncIterator[StreamEvent]:
+        """Handle requests for poems"""
+        result = {"status": "success", "type": "poem"}
+        target_language = intent.target_language
+        native_language = intent.native_language
+
+        graph = StageGraph()
+        graph.add(
+            "search",
+            lambda: web_search_async(
+                f"famous {target_language} poem", raise_errors=True
+            ),
         )
-        result["exercises"] = exercises
+        # Use first search result
+        self._add_translation_stage(
+            graph, target_language, native_language, "search", self._first_result
+        )
+        self._add_content_stages(graph)
 
-        return result
+        async with self._start(graph, result) as run:
+            async for event in self._content_events(
+                run, intent.wants_audio, target_language, result
+            ):
+                yield event
+
+        yield StreamEvent(EVENT_RESULT, result)
+
+    async def _handle_vocabulary_request(
+        self, intent: RequestIntent
+    ) -> AsyncIterator[StreamEvent]:
+        """Handle requests for vocabulary"""
+        result = {"status": "success", "type": "vocabulary"}
+        target_language = intent.target_language
+        native_language = intent.native_language
+
+        topic = intent.subject
+
+        # Answer from the offline packs, searching the web only for unknown topics
+        graph = StageGraph()
+        pack = self.vocabulary_store.lookup(target_language, topic)
+        if pack is not None:
+            graph.add(
+                "translation",
+                lambda: self.content_creator.create_vocabulary_content_async(
+                    pack.entries,
+                    target_language=target_language,
+                    native_language=native_language,
+                    gloss_language=pack.gloss_language,
+                ),
+            )
+        else:
+            graph.add(
+                "search",
+                lambda: web_search_async(
+                    f"{target_language} vocabulary {topic}", raise_errors=True
+                ),
+            )
+            self._add_translation_stage(graph, target_language, native_language, "search")
+        self._add_content_stages(graph)
+
+        async with self._start(graph, result) as run:
+            async for event in self._content_events(
+                run, intent.wants_audio, target_language, result
+            ):
+                yield event
+
+        yield StreamEvent(EVENT_RESULT, result)
 
     async def _handle_general_translation_request(
-        self,
-        request: str,
-        target_language: str,
-        native_language: str,
-        wants_audio: bool,
-    ) -> Dict:
+        self, intent: RequestIntent
+    ) -> AsyncIterator[StreamEvent]:
         """Handle general translation/learning requests"""
-        # Extract the text to translate
-        text_to_translate = request.split("'")[1] if "'" in request else request
-
-        # Create learning content
-        content = self.content_creator.create_learning_content(
-            text=text_to_translate,
-            target_language=target_language,
-            native_language=native_language,
+        result = {"status": "success", "type": "translation"}
+        target_language = intent.target_language
+        native_language = intent.native_language
+
+        text_to_translate = intent.subject
+
+        # The audio is of the original text, so it does not wait for the translation
+        graph = StageGraph()
+        graph.add(
+            "translation",
+            lambda: self.content_creator.create_learning_content_async(
+                text=text_to_translate,
+                target_language=target_language,
+                native_language=native_language,
+            ),
         )
+        if intent.wants_audio:
+            graph.add(
+                "audio",
+                lambda: generate_audio_async(text_to_translate, target_language),
+                optional=True,
+                fallback=SKIPPED_MESSAGE,
+            )
 
-        result = {
-            "status": "success",
-            "type": "translation",
-            "content": content,
-        }
+        async with self._start(graph, result) as run:
+            content = await run.result("translation")
+            result["content"] = content
+            yield StreamEvent(
+                EVENT_TRANSLATION,
+                {
+                    "original_text": content.get("original_text"),
+                    "translation": content.get("translation"),
+                },
+            )
+            vocabulary = content.get("vocabulary", {})
+            for word in vocabulary.get("words", []):
+                yield StreamEvent(
+                    EVENT_VOCABULARY,
+                    {"word": word, "translation": vocabulary["translations"].get(word)},
+                )
 
-        # Only generate audio if requested
-        if wants_audio:
-            audio_path = generate_audio(text_to_translate, target_language)
-            result["audio"] = audio_path
+            # Only generate audio if requested
+            if intent.wants_audio:
+                audio_path = await run.result("audio")
+                result["audio"] = audio_path
+                yield StreamEvent(
+                    EVENT_AUDIO, {"word": text_to_translate, "path": audio_path}
+                )
 
-        return result
+        yield StreamEvent(EVENT_RESULT, result)
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import astuple, dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.language_learning_assistant import (
+    REQUEST_POEM,
+    REQUEST_SONG,
+    REQUEST_TRANSLATION,
+    REQUEST_VOCABULARY,
+    LanguageLearningAssistant,
+)
+
+DEFAULT_STATE_PATH = os.path.join("cache", "prewarm_state.jsonl")
+DEFAULT_CONCURRENCY = 4
+# Items finished this recently are skipped; the nightly run redoes the rest
+DEFAULT_MAX_AGE = 12 * 60 * 60
+
+# Language names the validation step recognizes, by code
+LANGUAGE_NAMES = {
+    "de": "German",
+    "es": "Spanish",
+    "fr": "French",
+    "it": "Italian",
+    "en": "English",
+}
+
+# Requests as a user would phrase them; the response cache keys on their
+# RequestIntent, so any phrasing of the same intent is warmed with them
+_REQUEST_TEMPLATES = {
+    REQUEST_SONG: "Find a popular {language} song{audio}",
+    REQUEST_POEM: "Find a famous {language} poem{audio}",
+    REQUEST_VOCABULARY: "Teach me {language} vocabulary{audio} about {topic}",
+    REQUEST_TRANSLATION: "Translate '{topic}' into {language}{audio}",
+}
+
+
+@dataclass(frozen=True)
+class PrewarmItem:
+    """One manifest entry."""
+
+    language: str
+    type: str
+    topic: str = ""
+    audio: bool = False
+    native_language: str = "en"
+
+    def request(self) -> str:
+        """The request text run through the pipeline."""
+        return _REQUEST_TEMPLATES[self.type].format(
+            language=LANGUAGE_NAMES[self.language],
+            topic=self.topic,
+            audio=" with audio" if self.audio else "",
+        )
+
+    def key(self) -> str:
+        """Identifies the cached response; items with equal keys are warmed once."""
+        intent = LanguageLearningAssistant.request_intent(
+            self.request(), self.language, self.native_language
+        )
+        return "|".join(str(part) for part in astuple(intent))
+
+
+def parse_manifest(lines: Iterable[str]) -> List[PrewarmItem]:
+    """
+    Reads a JSONL manifest.
+
+    Each line is an object with "language" (code or English name), "type"
+    (song, poem, vocabulary or translation), and optionally "topic" (the
+    vocabulary topic or text to translate), "audio" and "native_language".
+    Blank lines and lines starting with # are ignored.
+
+    Raises:
+        ValueError: A line is not a valid item, with its line number
+    """
+    names = {name.lower(): code for code, name in LANGUAGE_NAMES.items()}
+    items = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            entry = json.loads(line)
+            language = entry["language"].lower()
+            language = names.get(language, language)
+            item = PrewarmItem(
+                language,
+                entry["type"],
+                entry.get("topic", ""),
+                bool(entry.get("audio", False)),
+                entry.get("native_language", "en"),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"manifest line {number}: {e}") from e
+        if item.language not in LANGUAGE_NAMES:
+            raise ValueError(f"manifest line {number}: unknown language {language!r}")
+        if item.type not in _REQUEST_TEMPLATES:
+            raise ValueError(f"manifest line {number}: unknown type {item.type!r}")
+        if item.type in (REQUEST_VOCABULARY, REQUEST_TRANSLATION) and not item.topic:
+            raise ValueError(f"manifest line {number}: {item.type} needs a topic")
+        if "'" in item.topic:
+            # Quotes delimit the text to translate in a request
+            raise ValueError(f"manifest line {number}: topic contains a quote")
+        items.append(item)
+    return items
+
+
+def load_state(path: str) -> Dict[str, Dict]:
+    """Returns the latest state file record per item key (empty if there is none)."""
+    state: Dict[str, Dict] = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Cut short by an interrupted run
+                    continue
+                state[record["key"]] = record
+    except FileNotFoundError:
+        pass
+    return state
+
+
+async def prewarm(
+    items: List[PrewarmItem],
+    assistant: Optional[LanguageLearningAssistant] = None,
+    state_path: str = DEFAULT_STATE_PATH,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_age: float = DEFAULT_MAX_AGE,
+    timeout: Optional[float] = None,
+    on_progress: Optional[Callable[[Dict, Dict], None]] = None,
+) -> Dict:
+    """
+    Fills the caches for popular requests before users ask for them.
+
+    Each item not finished within max_age is run through the full pipeline,
+    which leaves its search results, lyrics, translations, audio clips and
+    the whole response in the caches; configure the shared cache first so
+    the workers find them. Finished items are appended to the state file as
+    they complete, so an interrupted run picks up where it stopped and a
+    rerun within max_age only retries what failed.
+
+    Args:
+        items: Manifest items; duplicates of the same response run once
+        assistant: Runs the requests (defaults to one without a local
+            response cache, so every item really runs)
+        state_path (str): State file, appended to as items finish
+        concurrency (int): Items run at the same time
+        max_age (float): Seconds after which a finished item is warmed again
+        timeout (float, optional): Time budget of each request
+        on_progress: Called with each finished item's record and the summary
+            so far
+
+    Returns:
+        Dict: Counts of warmed, skipped and failed items, the failures and
+        the throughput in items per second
+    """
+    if assistant is None:
+        assistant = LanguageLearningAssistant(use_response_cache=False)
+    state = load_state(state_path)
+    now = time.time()
+
+    unique: Dict[str, PrewarmItem] = {}
+    for item in items:
+        unique.setdefault(item.key(), item)
+    pending = {
+        key: item
+        for key, item in unique.items()
+        if not (
+            key in state
+            and state[key]["status"] == "ok"
+            and now - state[key]["finished_at"] < max_age
+        )
+    }
+
+    summary = {
+        "items": len(unique),
+        "skipped": len(unique) - len(pending),
+        "warmed": 0,
+        "failed": 0,
+        "failures": [],
+    }
+    if os.path.dirname(state_path):
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    async def run(key: str, item: PrewarmItem) -> Dict:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await assistant.process_request(
+                    item.request(), item.native_language, timeout
+                )
+                if result.get("status") != "success":
+                    error = result.get("message", "request failed")
+                elif result.get("skipped"):
+                    error = "stages skipped: " + ", ".join(result["skipped"])
+                else:
+                    error = None
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            return {
+                "key": key,
+                "request": item.request(),
+                "status": "failed" if error else "ok",
+                "error": error,
+                "seconds": round(time.perf_counter() - started, 3),
+                "finished_at": time.time(),
+            }
+
+    with open(state_path, "a", encoding="utf-8") as state_file:
+        for finished in asyncio.as_completed(
+            [run(key, item) for key, item in pending.items()]
+        ):
+            record = await finished
+            # Written as soon as each item finishes, so a rerun resumes here
+            state_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            state_file.flush()
+            if record["status"] == "ok":
+                summary["warmed"] += 1
+            else:
+                summary["failed"] += 1
+                summary["failures"].append(
+                    {"request": record["request"], "error": record["error"]}
+                )
+            if on_progress is not None:
+                on_progress(record, summary)
+
+    elapsed = time.perf_counter() - start
+    summary["seconds"] = round(elapsed, 3)
+    summary["items_per_second"] = (
+        round((summary["warmed"] + summary["failed"]) / elapsed, 2) if elapsed else 0.0
+    )
+    return summary
@@ -1,15 +1,116 @@
-# This file can be empty, but we can add imports to make them easily accessible
-from .audio_tools import generate_audio
-from .content_tools import ContentCreator, generate_practice_lessons
-from .search_tools import web_search, find_youtube_video, get_song_lyrics
-from .validation_tools import analyze_language_confidence
+# This file can be empty, but we can add imports to make them easily accessible.
+# The exports are imported on first access (PEP 562), so importing one tool
+# module does not import all the others.
+import importlib
+
+_EXPORTS = {
+    ".audio_tools": (
+        "generate_audio",
+        "generate_audio_async",
+        "generate_audio_batch",
+        "generate_audio_batch_async",
+    ),
+    ".cache": ("RevalidatingCache", "TTLCache"),
+    ".content_tools": ("ContentCreator", "generate_practice_lessons"),
+    ".executor": ("configure_executor", "run_blocking"),
+    ".metrics": (
+        "MetricsRegistry",
+        "enable_metrics",
+        "disable_metrics",
+        "export_prometheus",
+    ),
+    ".language_detection": (
+        "LanguageDetector",
+        "NgramDetector",
+        "LangdetectDetector",
+        "set_default_detector",
+    ),
+    ".search_tools": (
+        "SearchClient",
+        "get_search_client",
+        "web_search",
+        "find_youtube_video",
+        "get_song_lyrics",
+        "web_search_async",
+        "find_youtube_video_async",
+        "get_song_lyrics_async",
+    ),
+    ".process_pool": ("configure_process_pool", "shutdown_process_pool"),
+    ".resilience": ("BackendUnavailableError", "configure_backend"),
+    ".shared_cache": (
+        "RedisCacheBackend",
+        "SQLiteCacheBackend",
+        "TwoTierCache",
+        "configure_shared_cache",
+    ),
+    ".stage_graph": ("StageGraph",),
+    ".translation_memory": ("SharedTranslationMemory", "TranslationMemory"),
+    ".vocabulary_store": ("VocabularyStore",),
+    ".validation_tools": (
+        "analyze_language_confidence",
+        "analyze_language_confidence_async",
+        "analyze_language_confidence_batch",
+    ),
+    # Not named warmup.py: importing the submodule would replace the
+    # package's warmup attribute with the module
+    "._warmup": ("warmup",),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
 
 __all__ = [
     "generate_audio",
+    "generate_audio_async",
+    "generate_audio_batch",
+    "generate_audio_batch_async",
     "ContentCreator",
     "generate_practice_lessons",
+    "configure_executor",
+    "run_blocking",
+    "MetricsRegistry",
+    "enable_metrics",
+    "disable_metrics",
+    "export_prometheus",
+    "LanguageDetector",
+    "NgramDetector",
+    "LangdetectDetector",
+    "set_default_detector",
+    "TTLCache",
+    "RevalidatingCache",
+    "SearchClient",
+    "get_search_client",
     "web_search",
     "find_youtube_video",
     "get_song_lyrics",
+    "web_search_async",
+    "find_youtube_video_async",
+    "get_song_lyrics_async",
+    "BackendUnavailableError",
+    "configure_backend",
+    "configure_process_pool",
+    "shutdown_process_pool",
+    "RedisCacheBackend",
+    "SQLiteCacheBackend",
+    "TwoTierCache",
+    "configure_shared_cache",
+    "StageGraph",
+    "TranslationMemory",
+    "SharedTranslationMemory",
     "analyze_language_confidence",
+    "analyze_language_confidence_async",
+    "analyze_language_confidence_batch",
+    "VocabularyStore",
+    "warmup",
 ]
+
+
+def __getattr__(name: str):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
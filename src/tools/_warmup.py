@@ -0,0 +1,52 @@
+import time
+from typing import Dict
+
+from . import audio_tools, content_tools, search_tools
+from .executor import get_executor
+from .language_detection import get_default_detector
+
+
+def warmup(
+    search: bool = True,
+    translation: bool = True,
+    audio: bool = True,
+    detection: bool = True,
+) -> Dict[str, float]:
+    """
+    Preloads backends that are otherwise loaded by the first request using them.
+
+    Importing the tools is cheap because the search, translation and
+    text-to-speech libraries are only imported on first use. Call this once at
+    worker startup to move that cost out of the first requests.
+
+    Args:
+        search (bool): Import duckduckgo_search, requests and bs4
+        translation (bool): Import deep_translator
+        audio (bool): Import gtts
+        detection (bool): Build the default language detector
+
+    Returns:
+        Dict[str, float]: Seconds spent on each component that was loaded
+    """
+    steps = {
+        "search": search_tools.load_backends,
+        "translation": content_tools.load_backends,
+        "audio": audio_tools.load_backends,
+        "detection": get_default_detector,
+    }
+    enabled = {
+        "search": search,
+        "translation": translation,
+        "audio": audio,
+        "detection": detection,
+    }
+    timings = {}
+    for name, load in steps.items():
+        if not enabled[name]:
+            continue
+        start = time.perf_counter()
+        load()
+        timings[name] = round(time.perf_counter() - start, 6)
+    # Start the shared tool executor too; it is needed by every async request
+    get_executor()
+    return timings
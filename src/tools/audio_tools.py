@@ -1,42 +1,365 @@
-from gtts import gTTS
+import hashlib
+import io
 import os
-from datetime import datetime
+import tempfile
+from typing import Callable, Dict, Iterable, List
+from .executor import run_blocking
+from .metrics import record_backend_call, record_cache, record_error, stage
+from .deadline import DeadlineExceeded, remaining_time
+from .mp3 import split_at_silences
+from .resilience import BackendUnavailableError, get_backend_guard
+from .shared_cache import get_shared_cache
+from .translation_memory import normalize_text
 
+AUDIO_DIR = "generated_audio"
+# Least recently used clips are deleted once the directory grows past this
+MAX_AUDIO_CACHE_BYTES = 200 * 1024 * 1024
 
-def generate_audio(text: str, language: str) -> str:
+# Google's TTS endpoint speaks at most 100 characters per request
+MAX_BATCH_TTS_CHARS = 100
+# Words of a batch are spoken as sentences so the voice pauses between them,
+# which is where the stream is cut into per-word clips
+BATCH_TTS_SEPARATOR = ". "
+# Words containing these would add pauses of their own
+_SENTENCE_BREAKS = frozenset(".!?;:\n")
+
+# Convert language names to codes if necessary
+LANGUAGE_CODES = {
+    "german": "de",
+    "spanish": "es",
+    "french": "fr",
+    # Add more as needed
+}
+
+# gtts is imported on first use (see load_backends); tests replace it with a fake
+gTTS = None
+
+
+def load_backends() -> None:
+    """Imports the text-to-speech library if not done yet."""
+    global gTTS
+    if gTTS is None:
+        from gtts import gTTS
+
+
+def audio_cache_key(text: str, lang_code: str) -> str:
+    """Returns the content hash used as the cached file name for text in lang_code."""
+    payload = f"{lang_code}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def generate_audio(
+    text: str,
+    language: str,
+    output_dir: str = AUDIO_DIR,
+    max_cache_bytes: int = MAX_AUDIO_CACHE_BYTES,
+) -> str:
     """
     Generates audio file for the given text in specified language.
 
+    Files are named by a hash of the normalized text and language, so repeated
+    requests return the existing file without calling gTTS. While gTTS is
+    rate limited or its circuit is open, the error message is returned
+    without calling it.
+
     Args:
         text (str): The text to convert to speech
         language (str): Language code (e.g., 'de' for German, 'es' for Spanish)
+        output_dir (str): Directory holding the cached audio files
+        max_cache_bytes (int): Size cap for output_dir
 
     Returns:
         str: Path to the generated audio file
     """
+    return _generate_audio(text, language, output_dir, max_cache_bytes, _shared_audio())
+
+
+def _generate_audio(
+    text: str,
+    language: str,
+    output_dir: str,
+    max_cache_bytes: int,
+    shared=None,
+    lookup_shared: bool = True,
+) -> str:
     try:
         # Create output directory if it doesn't exist
-        output_dir = "generated_audio"
         os.makedirs(output_dir, exist_ok=True)
 
-        # Generate unique filename using timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{output_dir}/audio_{timestamp}.mp3"
+        lang_code = _language_code(language)
+        key = audio_cache_key(text, lang_code)
+        filename = _cache_path(output_dir, text, lang_code)
+        if _is_cached(filename):
+            record_cache("audio", hits=1)
+            return filename
+        if (
+            shared is not None
+            and lookup_shared
+            and _restore_clips(shared, output_dir, {key: filename})
+        ):
+            record_cache("audio", hits=1)
+            return filename
+        record_cache("audio", misses=1)
 
-        # Convert language names to codes if necessary
-        language_codes = {
-            "german": "de",
-            "spanish": "es",
-            "french": "fr",
-            # Add more as needed
-        }
-        lang_code = language_codes.get(language.lower(), language.lower())
-
-        # Generate audio file
-        tts = gTTS(text=text, lang=lang_code)
-        tts.save(filename)
+        load_backends()
+        with stage("tts"):
+            tts = gTTS(text=text, lang=lang_code, timeout=remaining_time())
+            if shared is None:
+                _write_atomically(
+                    output_dir,
+                    filename,
+                    lambda f: get_backend_guard("tts").call(_synthesize, tts, f),
+                )
+            else:
+                buffer = io.BytesIO()
+                get_backend_guard("tts").call(_synthesize, tts, buffer)
+                clip = buffer.getbuffer()
+                _write_atomically(output_dir, filename, lambda f: f.write(clip))
+                shared.set(key, clip)
 
+        _enforce_cache_limit(output_dir, max_cache_bytes, keep=(filename,))
         return filename
 
     except Exception as e:
         return f"Error generating audio: {str(e)}"
+
+
+def generate_audio_batch(
+    words: List[str],
+    language: str,
+    output_dir: str = AUDIO_DIR,
+    max_cache_bytes: int = MAX_AUDIO_CACHE_BYTES,
+) -> Dict[str, str]:
+    """
+    Generates one audio file per word, synthesizing the words in batches.
+
+    Uncached words are joined into sentences of up to MAX_BATCH_TTS_CHARS and
+    spoken in a single TTS request. The returned MP3 stream is cut at frame
+    boundaries in the pauses between the words. When a batch cannot be split
+    into as many clips as it has words, its words are synthesized one by one
+    with generate_audio instead. Clips share generate_audio's cache, and all
+    lookups and stores of the shared cache are batched too.
+
+    Args:
+        words (List[str]): Words to convert to speech
+        language (str): Language code (e.g., 'de' for German, 'es' for Spanish)
+        output_dir (str): Directory holding the cached audio files
+        max_cache_bytes (int): Size cap for output_dir
+
+    Returns:
+        Dict[str, str]: Path to each word's audio file, or its error message
+    """
+    paths: Dict[str, str] = {}
+    shared = _shared_audio()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        lang_code = _language_code(language)
+        keys = {word: audio_cache_key(word, lang_code) for word in words}
+        filenames = {word: os.path.join(output_dir, f"{key}.mp3") for word, key in keys.items()}
+    except Exception as e:
+        return {word: f"Error generating audio: {str(e)}" for word in words}
+
+    uncached = []
+    for word in dict.fromkeys(words):
+        if _is_cached(filenames[word]):
+            paths[word] = filenames[word]
+        else:
+            uncached.append(word)
+    if shared is not None and uncached:
+        restored = _restore_clips(
+            shared, output_dir, {keys[word]: filenames[word] for word in uncached}
+        )
+        for word in uncached:
+            if keys[word] in restored:
+                paths[word] = filenames[word]
+        uncached = [word for word in uncached if word not in paths]
+    record_cache("audio", hits=len(paths))
+
+    def synthesize_one(word: str) -> str:
+        # Already looked up in the shared cache above
+        return _generate_audio(
+            word, language, output_dir, max_cache_bytes, shared, lookup_shared=False
+        )
+
+    new_clips = {}
+    for batch in batch_words(uncached):
+        if len(batch) == 1:
+            paths[batch[0]] = synthesize_one(batch[0])
+            continue
+        record_cache("audio", misses=len(batch))
+        try:
+            clips = _synthesize_batch(batch, lang_code)
+        except (BackendUnavailableError, DeadlineExceeded) as e:
+            # Word by word would be refused just the same
+            paths.update((word, f"Error generating audio: {str(e)}") for word in batch)
+            continue
+        except Exception:
+            clips = None
+        if clips is None:
+            record_error("tts_split")
+            for word in batch:
+                paths[word] = synthesize_one(word)
+            continue
+        for word, clip in zip(batch, clips):
+            try:
+                _write_atomically(output_dir, filenames[word], lambda f: f.write(clip))
+                paths[word] = filenames[word]
+                new_clips[keys[word]] = clip
+            except Exception as e:
+                paths[word] = f"Error generating audio: {str(e)}"
+
+    if shared is not None and new_clips:
+        shared.set_many(new_clips)
+    _enforce_cache_limit(output_dir, max_cache_bytes, keep=filenames.values())
+    return {word: paths[word] for word in words}
+
+
+def batch_words(words: List[str], max_chars: int = MAX_BATCH_TTS_CHARS) -> List[List[str]]:
+    """
+    Groups words into batches whose joined text fits in one TTS request.
+
+    Words that contain sentence breaks or do not fit in a request on their own
+    get a batch to themselves.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for word in words:
+        text = word.strip()
+        if _SENTENCE_BREAKS.intersection(text) or len(text) > max_chars:
+            if current:
+                batches.append(current)
+                current, size = [], 0
+            batches.append([word])
+            continue
+        added = len(text) + (len(BATCH_TTS_SEPARATOR) if current else 0)
+        if current and size + added > max_chars:
+            batches.append(current)
+            current, size = [], 0
+            added = len(text)
+        current.append(word)
+        size += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _synthesize_batch(batch: List[str], lang_code: str):
+    """Speaks batch in one TTS request and returns one MP3 clip per word, or None."""
+    load_backends()
+    text = BATCH_TTS_SEPARATOR.join(word.strip() for word in batch)
+    with stage("tts"):
+        tts = gTTS(text=text, lang=lang_code, timeout=remaining_time())
+        buffer = io.BytesIO()
+        get_backend_guard("tts").call(_synthesize, tts, buffer)
+    with stage("tts_split"):
+        return split_at_silences(buffer.getvalue(), len(batch))
+
+
+def _shared_audio():
+    """Returns the "audio" namespace of the shared cache, or None."""
+    shared_cache = get_shared_cache()
+    return shared_cache.namespace("audio") if shared_cache is not None else None
+
+
+def _restore_clips(shared, output_dir: str, filenames: Dict[str, str]) -> set:
+    """
+    Writes clips another worker already synthesized into output_dir.
+
+    Args:
+        shared: The "audio" CacheNamespace
+        output_dir (str): Directory holding the cached audio files
+        filenames: Mapping of audio_cache_key to the file to write
+
+    Returns:
+        set: Keys whose files were written
+    """
+    restored = set()
+    for key, clip in shared.get_many(list(filenames)).items():
+        if not isinstance(clip, (bytes, memoryview)):
+            continue
+        try:
+            _write_atomically(output_dir, filenames[key], lambda f: f.write(clip))
+        except OSError:
+            continue
+        restored.add(key)
+    return restored
+
+
+def _language_code(language: str) -> str:
+    return LANGUAGE_CODES.get(language.lower(), language.lower())
+
+
+def _cache_path(output_dir: str, text: str, lang_code: str) -> str:
+    return os.path.join(output_dir, f"{audio_cache_key(text, lang_code)}.mp3")
+
+
+def _is_cached(filename: str) -> bool:
+    try:
+        # Cache hit: mark as recently used for the LRU size cap
+        os.utime(filename)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _write_atomically(output_dir: str, filename: str, write: Callable) -> None:
+    """Calls write with a temp file and moves it into place once complete."""
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix=".tmp-", suffix=".mp3")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _synthesize(tts, fp) -> None:
+    record_backend_call("tts")
+    tts.write_to_fp(fp)
+
+
+def _enforce_cache_limit(
+    output_dir: str, max_bytes: int, keep: Iterable[str] = ()
+) -> None:
+    """Deletes the least recently used clips until output_dir fits in max_bytes."""
+    entries = []
+    total = 0
+    with os.scandir(output_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(".mp3") or entry.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    if total <= max_bytes:
+        return
+
+    keep = {os.path.abspath(path) for path in keep}
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if os.path.abspath(path) in keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+async def generate_audio_async(text: str, language: str, **kwargs) -> str:
+    """Non-blocking variant of generate_audio that runs on the shared executor."""
+    return await run_blocking(generate_audio, text, language, **kwargs)
+
+
+async def generate_audio_batch_async(
+    words: List[str], language: str, **kwargs
+) -> Dict[str, str]:
+    """Non-blocking variant of generate_audio_batch that runs on the shared executor."""
+    return await run_blocking(generate_audio_batch, words, language, **kwargs)
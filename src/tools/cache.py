@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry and an LRU size bound.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores value under key for ttl seconds (the cache default if None)."""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        """Returns hit/miss counters and the current number of entries."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class CacheLookup(NamedTuple):
+    """Outcome of RevalidatingCache.lookup."""
+
+    # None on a miss
+    value: Any
+    # The entry has expired and is served while it is refreshed
+    stale: bool
+    # This caller should fetch a fresh value and set() it
+    refresh: bool
+
+
+class RevalidatingCache:
+    """
+    TTL/LRU cache that serves popular entries stale while they are refreshed.
+
+    For stale_ttl seconds after an entry expires, lookups still return it if
+    it was hit at least refresh_min_hits times, and the first such lookup is
+    told to fetch a fresh value in the background. Expired entries that were
+    not that popular are misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 600.0,
+        stale_ttl: float = 3600.0,
+        refresh_min_hits: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_min_hits = refresh_min_hits
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._clock = clock
+        # key -> [expires_at, value, hits since stored]
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable) -> CacheLookup:
+        """
+        Looks up key; refresh is True for only one caller per stale entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return CacheLookup(None, False, False)
+            expires_at, value, hits = entry
+            now = self._clock()
+            if now < expires_at:
+                entry[2] += 1
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return CacheLookup(value, False, False)
+            if now < expires_at + self.stale_ttl and hits >= self.refresh_min_hits:
+                entry[2] += 1
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                refresh = key not in self._refreshing
+                if refresh:
+                    self._refreshing.add(key)
+                    self.refreshes += 1
+                return CacheLookup(value, True, refresh)
+            del self._entries[key]
+            self.misses += 1
+            return CacheLookup(None, False, False)
+
+    def set(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None, hits: int = 0
+    ) -> None:
+        """
+        Stores value under key for ttl seconds (the cache default if None).
+
+        A ttl of 0 or less stores an already expired entry, which is served
+        stale if hits (lookups it had elsewhere, e.g. in another worker) make
+        it popular enough.
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._refreshing.discard(key)
+            self._entries[key] = [expires_at, value, hits]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh_failed(self, key: Hashable) -> None:
+        """Lets the next stale lookup of key try another refresh."""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._refreshing.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+            self.hits = self.stale_hits = self.misses = self.refreshes = 0
+
+    def stats(self) -> Dict:
+        """Returns hit/stale/miss counters, the hit rate and the number of entries."""
+        with self._lock:
+            total = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_rate": (
+                    round((self.hits + self.stale_hits) / total, 4) if total else 0.0
+                ),
+                "entries": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
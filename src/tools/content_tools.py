@@ -1,11 +1,72 @@
-from typing import Dict, List
-from deep_translator import GoogleTranslator
+from typing import Dict, List, Optional, Tuple
 import json
+import threading
+from .executor import run_blocking
+from .metrics import record_backend_call, record_error, stage, timed
+from .deadline import DeadlineExceeded
+from .process_pool import offload
+from .resilience import BackendUnavailableError, get_backend_guard
+from .shared_cache import get_shared_cache
+from .translation_memory import SharedTranslationMemory, TranslationMemory
+from .vocabulary_extraction import extract_key_vocabulary
+
+# Google Translate rejects payloads above 5000 characters
+MAX_BATCH_CHARS = 4500
+# Line breaks survive translation, so batched items are sent one per line
+BATCH_SEPARATOR = "\n"
+
+# deep_translator is imported on first use (see load_backends); tests replace
+# it with a fake
+GoogleTranslator = None
+
+
+def load_backends() -> None:
+    """Imports the translation library if not done yet."""
+    global GoogleTranslator
+    if GoogleTranslator is None:
+        from deep_translator import GoogleTranslator
 
 
 class ContentCreator:
-    def __init__(self):
-        self.translator = GoogleTranslator()
+    def __init__(
+        self,
+        batch_translation: bool = True,
+        translation_memory: Optional[TranslationMemory] = None,
+        use_translation_memory: bool = True,
+    ):
+        self.batch_translation = batch_translation
+        self.use_translation_memory = use_translation_memory
+        self._translation_memory = translation_memory
+        # Defaults, picked per call so configure_shared_cache and
+        # disable_shared_cache also apply to creators that already exist
+        self._shared_memory = SharedTranslationMemory()
+        self._local_memory: Optional[TranslationMemory] = None
+        self._lock = threading.Lock()
+
+    @property
+    def translation_memory(self):
+        """
+        The translation memory used right now, or None.
+
+        The one given to the constructor, else the shared cache's
+        "translation" namespace if one is configured, else a TranslationMemory
+        on local disk.
+        """
+        if not self.use_translation_memory:
+            return None
+        if self._translation_memory is not None:
+            return self._translation_memory
+        if get_shared_cache() is not None:
+            return self._shared_memory
+        with self._lock:
+            if self._local_memory is None:
+                self._local_memory = TranslationMemory()
+            return self._local_memory
+
+    @translation_memory.setter
+    def translation_memory(self, memory) -> None:
+        self._translation_memory = memory
+        self.use_translation_memory = memory is not None
 
     def create_learning_content(
         self, text: str, target_language: str, native_language: str
@@ -21,24 +82,18 @@ class ContentCreator:
         """
         try:
             # Extract key vocabulary first
-            vocab_list = self._extract_key_vocabulary(text)
+            with stage("vocabulary_extraction"):
+                vocab_list = self._extract_key_vocabulary(text, target_language)
 
             # Set up translator
+            load_backends()
             translator = GoogleTranslator(
                 source=target_language, target=native_language
             )
 
-            # Translate full text
-            full_translation = translator.translate(text)
-
-            # Translate vocabulary
-            vocab_translations = {}
-            for word in vocab_list:
-                try:
-                    translation = translator.translate(word)
-                    vocab_translations[word] = translation
-                except:
-                    vocab_translations[word] = f"[Translation error for: {word}]"
+            full_translation, vocab_translations = self._translate_vocabulary(
+                translator, target_language, native_language, vocab_list, text
+            )
 
             return {
                 "original_text": text,
@@ -48,23 +103,277 @@ class ContentCreator:
                 "language_pair": f"{target_language}-{native_language}",
             }
 
+        except (BackendUnavailableError, DeadlineExceeded):
+            raise
+        except Exception as e:
+            record_error("content")
+            return {
+                "error": f"Error creating learning content: {str(e)}",
+                "original_text": text,
+            }
+
+    async def create_learning_content_async(
+        self, text: str, target_language: str, native_language: str
+    ) -> Dict:
+        """Non-blocking variant of create_learning_content that runs on the shared executor."""
+        return await run_blocking(
+            self.create_learning_content, text, target_language, native_language
+        )
+
+    def create_vocabulary_content(
+        self,
+        entries: Dict[str, str],
+        target_language: str,
+        native_language: str,
+        gloss_language: str = "en",
+    ) -> Dict:
+        """
+        Creates learning content from a ready-made word list, such as a vocabulary pack.
+
+        Glosses are used as-is when they are already in the native language;
+        otherwise the words are translated like extracted vocabulary.
+
+        Args:
+            entries: Words in the target language mapped to their glosses
+            target_language: Language being learned (e.g., 'de' for German)
+            native_language: Student's native language (e.g., 'en' for English)
+            gloss_language: Language of the glosses in entries
+        """
+        vocab_list = list(entries)
+        text = ", ".join(vocab_list)
+        try:
+            if native_language == gloss_language:
+                vocab_translations = dict(entries)
+            else:
+                load_backends()
+                translator = GoogleTranslator(
+                    source=target_language, target=native_language
+                )
+                _, vocab_translations = self._translate_vocabulary(
+                    translator, target_language, native_language, vocab_list
+                )
+
+            return {
+                "original_text": text,
+                "translation": ", ".join(vocab_translations[word] for word in vocab_list),
+                "vocabulary": {"words": vocab_list, "translations": vocab_translations},
+                "difficulty_level": self._assess_difficulty(text),
+                "language_pair": f"{target_language}-{native_language}",
+            }
+
+        except (BackendUnavailableError, DeadlineExceeded):
+            raise
         except Exception as e:
+            record_error("content")
             return {
                 "error": f"Error creating learning content: {str(e)}",
                 "original_text": text,
             }
 
-    def _extract_key_vocabulary(self, text: str) -> List[str]:
+    async def create_vocabulary_content_async(
+        self,
+        entries: Dict[str, str],
+        target_language: str,
+        native_language: str,
+        gloss_language: str = "en",
+    ) -> Dict:
+        """Non-blocking variant of create_vocabulary_content that runs on the shared executor."""
+        return await run_blocking(
+            self.create_vocabulary_content,
+            entries,
+            target_language,
+            native_language,
+            gloss_language,
+        )
+
+    def _translate_vocabulary(
+        self,
+        translator: "GoogleTranslator",
+        source: str,
+        target: str,
+        words: List[str],
+        text: Optional[str] = None,
+    ) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Translates words, and text if given, through the translation memory.
+
+        Cached words are resolved in one lookup and only the misses hit the
+        network; with batch_translation the text shares their requests.
+
+        Returns:
+            Tuple of (text translation or None without text, word -> translation
+            or an error placeholder)
+        """
+        # Resolve cached vocabulary in one lookup, only misses hit the network
+        memory = self.translation_memory
+        cached_translations = (
+            memory.get_many(source, target, words) if memory is not None else {}
+        )
+        uncached_words = [word for word in words if word not in cached_translations]
+
+        full_translation = None
+        if self.batch_translation and text is not None:
+            # Translate full text and vocabulary in as few requests as possible
+            full_translation, new_translations = self._translate_batched(
+                translator, text, uncached_words
+            )
+        else:
+            if text is not None:
+                with stage("translation"):
+                    full_translation = self._translate(translator, text)
+            with stage("word_translation"):
+                if self.batch_translation:
+                    new_translations = dict(
+                        zip(
+                            uncached_words,
+                            self._translate_items(translator, uncached_words),
+                        )
+                    )
+                else:
+                    new_translations = {
+                        word: self._translate_single(translator, word)
+                        for word in uncached_words
+                    }
+
+        if memory is not None:
+            memory.set_many(
+                source,
+                target,
+                {
+                    word: translation
+                    for word, translation in new_translations.items()
+                    if translation is not None
+                },
+            )
+
+        vocab_translations = {}
+        for word in words:
+            translation = cached_translations.get(word, new_translations.get(word))
+            if translation is None:
+                translation = f"[Translation error for: {word}]"
+            vocab_translations[word] = translation
+        return full_translation, vocab_translations
+
+    def _translate_batched(
+        self, translator: "GoogleTranslator", text: str, vocab_list: List[str]
+    ) -> Tuple[str, Dict[str, Optional[str]]]:
+        """
+        Translates the full text and every vocabulary word using batched requests.
+
+        The full text joins the vocabulary batch when it fits on a single line,
+        otherwise it is translated on its own.
+
+        Returns:
+            Tuple of (full text translation, word -> translation or None on error)
+        """
+        text_in_batch = BATCH_SEPARATOR not in text and len(text) <= MAX_BATCH_CHARS
+        items = ([text] if text_in_batch else []) + list(vocab_list)
+        # A batch carrying the full text is timed as the translation stage
+        with stage("translation" if text_in_batch else "word_translation"):
+            translations = self._translate_items(translator, items)
+
+        if text_in_batch:
+            full_translation = translations.pop(0)
+            if full_translation is None:
+                # Surface the real error exactly like the unbatched path
+                with stage("translation"):
+                    full_translation = self._translate(translator, text)
+        else:
+            with stage("translation"):
+                full_translation = self._translate(translator, text)
+
+        return full_translation, dict(zip(vocab_list, translations))
+
+    def _translate_items(
+        self, translator: "GoogleTranslator", items: List[str]
+    ) -> List[Optional[str]]:
+        """
+        Translates single-line items in newline-joined chunks.
+
+        A chunk whose result cannot be mapped back line-for-line is retried one
+        item at a time, so a failure only affects the items that really failed.
+
+        Returns:
+            List of translations aligned with items, None where translation failed
+        """
+        results: List[Optional[str]] = []
+        for chunk in self._chunk_items(items):
+            translated_lines = None
+            if len(chunk) > 1:
+                try:
+                    translated = self._translate(translator, BATCH_SEPARATOR.join(chunk))
+                    translated_lines = [
+                        line.strip() for line in (translated or "").split(BATCH_SEPARATOR)
+                    ]
+                except (BackendUnavailableError, DeadlineExceeded):
+                    raise
+                except Exception:
+                    translated_lines = None
+
+            if translated_lines is not None and len(translated_lines) == len(chunk):
+                for item, line in zip(chunk, translated_lines):
+                    results.append(
+                        line if line else self._translate_single(translator, item)
+                    )
+            else:
+                results.extend(
+                    self._translate_single(translator, item) for item in chunk
+                )
+        return results
+
+    def _chunk_items(self, items: List[str]) -> List[List[str]]:
+        """Groups items into chunks that fit in one translation request."""
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_size = 0
+        for item in items:
+            item_size = len(item) + len(BATCH_SEPARATOR)
+            if current and current_size + item_size > MAX_BATCH_CHARS:
+                chunks.append(current)
+                current, current_size = [], 0
+            current.append(item)
+            current_size += item_size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _translate(self, translator: "GoogleTranslator", text: str) -> str:
+        """Calls the translation backend once, through its rate limiter and breaker."""
+        return get_backend_guard("translate").call(self._call_translator, translator, text)
+
+    @staticmethod
+    def _call_translator(translator: "GoogleTranslator", text: str) -> str:
+        record_backend_call("translate")
+        return translator.translate(text)
+
+    def _translate_single(
+        self, translator: "GoogleTranslator", item: str
+    ) -> Optional[str]:
+        """
+        Translates one item, returning None instead of raising.
+
+        BackendUnavailableError and DeadlineExceeded still propagate: every other
+        item would fail too.
+        """
+        try:
+            return self._translate(translator, item)
+        except (BackendUnavailableError, DeadlineExceeded):
+            raise
+        except Exception:
+            return None
+
+    def _extract_key_vocabulary(
+        self, text: str, language: Optional[str] = None
+    ) -> List[str]:
         """
         Extracts important vocabulary from the text.
-        Basic implementation - could be enhanced with NLP.
+
+        Words are ranked by how often they occur, skipping links, stopwords
+        and search-result labels. Scraped pages and search results are mostly
+        English around the foreign text, so English stopwords always apply.
         """
-        # Remove punctuation and split into words
-        words = text.lower().replace(",", " ").replace(".", " ").split()
-        # Remove duplicates and sort by length (longer words often more important)
-        unique_words = sorted(set(words), key=len, reverse=True)
-        # Return top 10 words (could be improved with actual importance scoring)
-        return unique_words[:10]
+        languages = (language, "en") if language else None
+        return offload(extract_key_vocabulary, text, languages, size=len(text))
 
     def _assess_difficulty(self, text: str) -> str:
         """
@@ -82,6 +391,7 @@ class ContentCreator:
             return "advanced"
 
 
+@timed("exercises")
 def generate_practice_lessons(
     vocab_list: List[str], translations: Dict[str, str]
 ) -> Dict:
@@ -128,4 +438,5 @@ def generate_practice_lessons(
         return exercises
 
     except Exception as e:
+        record_error("exercises")
         return {"error": f"Error generating practice lessons: {str(e)}"}
@@ -0,0 +1,119 @@
+import asyncio
+import contextvars
+import time
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a request runs out of its time budget.
+
+    Attributes:
+        stage: Pipeline stage or backend that was running or about to start
+        budget: The request's total budget in seconds
+    """
+
+    def __init__(self, stage: str, budget: float):
+        self.stage = stage
+        self.budget = budget
+        super().__init__(f"Request deadline of {budget:g}s exceeded during {stage}")
+
+
+class Deadline:
+    """Point in time by which a request must be answered."""
+
+    def __init__(self, budget: float, clock=time.monotonic):
+        self.budget = budget
+        self._clock = clock
+        self.expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "polyglot_request_deadline", default=None
+)
+
+
+def start_deadline(deadline: Deadline) -> contextvars.Token:
+    """Makes deadline apply to every stage and tool call in the current context."""
+    return _current_deadline.set(deadline)
+
+
+def end_deadline(token: contextvars.Token) -> None:
+    try:
+        _current_deadline.reset(token)
+    except ValueError:
+        # Reset from another context (e.g. an async generator finalized late)
+        _current_deadline.set(None)
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Returns the current request's deadline, or None if it has no time bound."""
+    return _current_deadline.get()
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left in the current request's budget.
+
+    Args:
+        default (float, optional): Returned when the request has no deadline
+
+    Returns:
+        The remaining seconds, capped at default when both are set
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    return remaining if default is None else min(default, remaining)
+
+
+def check_deadline(stage: str) -> None:
+    """Raises DeadlineExceeded if the current request has no time left for stage."""
+    deadline = _current_deadline.get()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceeded(stage, deadline.budget)
+
+
+async def within_deadline(awaitable: Awaitable[T], stage: str, share: float = 1.0) -> T:
+    """
+    Awaits awaitable for at most the current request's remaining time.
+
+    Blocking tool calls keep running on their executor thread after a
+    timeout, but stop before their next backend call (see check_deadline).
+
+    Args:
+        awaitable: The stage to run
+        stage (str): Stage name reported in DeadlineExceeded
+        share (float): Fraction of the remaining time the stage may use, so
+            an optional stage can leave time for the stages after it
+
+    Raises:
+        DeadlineExceeded: The budget ran out before awaitable finished
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return await awaitable
+    if deadline.expired:
+        # Never started, so close it to avoid "coroutine was never awaited"
+        close = getattr(awaitable, "close", None)
+        if close is not None:
+            close()
+        raise DeadlineExceeded(stage, deadline.budget)
+    try:
+        return await asyncio.wait_for(awaitable, deadline.remaining() * share)
+    except DeadlineExceeded:
+        # Raised by a tool call that checked the deadline itself
+        raise
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(stage, deadline.budget) from None
@@ -0,0 +1,61 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Upper bound on blocking tool calls (search, translate, TTS) running at once
+DEFAULT_MAX_WORKERS = 16
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def configure_executor(max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+    """
+    Replaces the shared executor used to offload blocking tool calls.
+
+    Args:
+        max_workers (int): Maximum number of tool calls running concurrently
+    """
+    global _executor
+    with _executor_lock:
+        old_executor = _executor
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="polyglot-io"
+        )
+    if old_executor is not None:
+        old_executor.shutdown(wait=False)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Returns the shared executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="polyglot-io"
+                )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs a blocking function on the shared executor without blocking the event loop.
+
+    The caller's context variables are copied into the worker thread.
+
+    Args:
+        func: Blocking callable to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
@@ -0,0 +1,192 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+import json
+import math
+import os
+import re
+import threading
+
+DEFAULT_PROFILES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "ngram_profiles.json"
+)
+
+# Languages the assistant serves
+SUPPORTED_LANGUAGES = ("de", "es", "fr", "it", "en")
+
+_NON_LETTERS = re.compile(r"[\W\d_]+")
+
+
+class DetectedLanguage(NamedTuple):
+    """A candidate language and its probability, like langdetect's Language."""
+
+    lang: str
+    prob: float
+
+
+class LanguageDetector:
+    """Interface for language detection backends."""
+
+    def detect(self, text: str) -> List[DetectedLanguage]:
+        """
+        Detects the language of text.
+
+        Returns:
+            List of candidates ordered by descending probability
+        """
+        raise NotImplementedError
+
+    def detect_many(
+        self, texts: Sequence[str]
+    ) -> List[Union[List[DetectedLanguage], Exception]]:
+        """
+        Detects the language of many texts.
+
+        Returns:
+            One entry per text: its candidates, or the exception detect raised
+        """
+        results: List[Union[List[DetectedLanguage], Exception]] = []
+        for text in texts:
+            try:
+                results.append(self.detect(text))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+class NullDetector(LanguageDetector):
+    """Detector that never detects anything."""
+
+    def detect(self, text: str) -> List[DetectedLanguage]:
+        return []
+
+
+class NgramDetector(LanguageDetector):
+    """
+    Deterministic naive Bayes detector over character 1-3 grams.
+
+    Only the configured languages are scored, using compact profiles bundled
+    in data/ngram_profiles.json (see scripts/build_ngram_profiles.py).
+    """
+
+    def __init__(
+        self,
+        languages: Sequence[str] = SUPPORTED_LANGUAGES,
+        profiles_path: str = DEFAULT_PROFILES_PATH,
+    ):
+        with open(profiles_path, encoding="utf-8") as f:
+            profiles = json.load(f)
+
+        missing = [language for language in languages if language not in profiles]
+        if missing:
+            raise ValueError(f"No n-gram profile for: {', '.join(missing)}")
+
+        self.languages = tuple(languages)
+        # n-gram -> log probability per language, in self.languages order
+        self._log_probs: Dict[str, List[float]] = {}
+        # Log probability of an n-gram missing from a profile, per n and language
+        self._floors: Dict[int, List[float]] = {}
+
+        for index, language in enumerate(self.languages):
+            profile = profiles[language]
+            n_words = profile["n_words"]
+            lowest = {1: math.inf, 2: math.inf, 3: math.inf}
+            for gram, count in profile["freq"].items():
+                n = len(gram)
+                lowest[n] = min(lowest[n], count)
+                log_probs = self._log_probs.setdefault(
+                    gram, [None] * len(self.languages)
+                )
+                log_probs[index] = math.log(count / n_words[n - 1])
+            for n in (1, 2, 3):
+                # Profiles are truncated, so unseen grams get half the rarest kept count
+                floor_count = lowest[n] / 2 if lowest[n] != math.inf else 0.5
+                self._floors.setdefault(n, [0.0] * len(self.languages))[index] = (
+                    math.log(floor_count / n_words[n - 1])
+                )
+
+        for gram, log_probs in self._log_probs.items():
+            floors = self._floors[len(gram)]
+            for index, value in enumerate(log_probs):
+                if value is None:
+                    log_probs[index] = floors[index]
+
+    def detect(self, text: str) -> List[DetectedLanguage]:
+        grams = list(_ngrams(text))
+        if not grams:
+            return []
+
+        scores = [0.0] * len(self.languages)
+        for gram in grams:
+            log_probs = self._log_probs.get(gram)
+            if log_probs is None:
+                # Unknown everywhere: equally unlikely, skip to avoid noise
+                continue
+            for index, value in enumerate(log_probs):
+                scores[index] += value
+
+        best = max(scores)
+        weights = [math.exp(score - best) for score in scores]
+        total = sum(weights)
+        return sorted(
+            (
+                DetectedLanguage(language, weight / total)
+                for language, weight in zip(self.languages, weights)
+                if weight / total > 1e-5
+            ),
+            key=lambda candidate: -candidate.prob,
+        )
+
+
+class LangdetectDetector(LanguageDetector):
+    """
+    Adapter for the langdetect package (about 55 languages, larger footprint).
+
+    Detection is seeded so results are reproducible.
+    """
+
+    def __init__(self, languages: Optional[Iterable[str]] = None, seed: int = 0):
+        from langdetect import DetectorFactory
+
+        DetectorFactory.seed = seed
+        self.languages = set(languages) if languages else None
+
+    def detect(self, text: str) -> List[DetectedLanguage]:
+        from langdetect import detect_langs
+
+        return [
+            DetectedLanguage(candidate.lang, candidate.prob)
+            for candidate in detect_langs(text)
+            if self.languages is None or candidate.lang in self.languages
+        ]
+
+
+def _ngrams(text: str):
+    """Yields the character 1-3 grams of text, with words padded by spaces."""
+    normalized = " " + " ".join(_NON_LETTERS.sub(" ", text.lower()).split()) + " "
+    if not normalized.strip():
+        return
+    for n in (1, 2, 3):
+        for i in range(len(normalized) - n + 1):
+            gram = normalized[i : i + n]
+            if not gram.isspace():
+                yield gram
+
+
+_default_detector: Optional[LanguageDetector] = None
+_default_detector_lock = threading.Lock()
+
+
+def get_default_detector() -> LanguageDetector:
+    """Returns the process-wide detector, building an NgramDetector on first use."""
+    global _default_detector
+    if _default_detector is None:
+        with _default_detector_lock:
+            if _default_detector is None:
+                _default_detector = NgramDetector()
+    return _default_detector
+
+
+def set_default_detector(detector: LanguageDetector) -> None:
+    """Replaces the process-wide detector used by analyze_language_confidence."""
+    global _default_detector
+    with _default_detector_lock:
+        _default_detector = detector
@@ -0,0 +1,330 @@
+import contextvars
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Upper bounds, in seconds, of the stage duration histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = "polyglot"
+
+# Counter name -> (help text, label names)
+_COUNTERS = {
+    "backend_calls_total": ("Calls made to external backends", ("backend",)),
+    "cache_requests_total": ("Cache lookups by outcome", ("cache", "result")),
+    "errors_total": ("Errors by pipeline stage", ("stage",)),
+    "backend_rejections_total": (
+        "Backend calls refused by a rate limiter or open circuit",
+        ("backend", "reason"),
+    ),
+}
+
+
+class MetricsRegistry:
+    """
+    Process-wide stage duration histograms and backend, cache and error counters.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # stage -> [count per bucket (last is +Inf), sum, count]
+        self._durations: Dict[str, List] = {}
+        self._counters: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Records one duration for stage."""
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._durations.get(stage)
+            if histogram is None:
+                histogram = self._durations[stage] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def increment(self, name: str, labels: Tuple[str, ...], amount: float = 1) -> None:
+        """Adds amount to the counter name with the given label values."""
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self) -> Dict:
+        """Returns every stage's count and total seconds and every counter value."""
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {"count": count, "seconds": round(total, 6)}
+                    for stage, (_, total, count) in sorted(self._durations.items())
+                },
+                "counters": {
+                    name: {
+                        labels: value
+                        for (counter, labels), value in sorted(self._counters.items())
+                        if counter == name
+                    }
+                    for name in _COUNTERS
+                },
+            }
+
+    def export_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        duration = f"{METRIC_PREFIX}_stage_duration_seconds"
+        with self._lock:
+            lines.append(f"# HELP {duration} Time spent in each pipeline stage")
+            lines.append(f"# TYPE {duration} histogram")
+            for stage, (bucket_counts, total, count) in sorted(self._durations.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(
+                    [*map(_format_number, self.buckets), "+Inf"], bucket_counts
+                ):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'{duration}_bucket{{stage="{_escape(stage)}",le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f'{duration}_sum{{stage="{_escape(stage)}"}} {total!r}')
+                lines.append(f'{duration}_count{{stage="{_escape(stage)}"}} {count}')
+
+            for name, (help_text, label_names) in _COUNTERS.items():
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for (counter, labels), value in sorted(self._counters.items()):
+                    if counter != name:
+                        continue
+                    rendered = ",".join(
+                        f'{label}="{_escape(label_value)}"'
+                        for label, label_value in zip(label_names, labels)
+                    )
+                    lines.append(f"{metric}{{{rendered}}} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+
+
+class RequestTrace:
+    """Timing breakdown of a single request, filled in by every stage it runs."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List] = {}
+        self._backend_calls: Dict[str, int] = {}
+        self._cache: Dict[str, Dict[str, int]] = {}
+        self._errors: Dict[str, int] = {}
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def add_backend_call(self, backend: str, count: int = 1) -> None:
+        with self._lock:
+            self._backend_calls[backend] = self._backend_calls.get(backend, 0) + count
+
+    def add_cache(self, cache: str, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            entry = self._cache.setdefault(cache, {"hits": 0, "misses": 0})
+            entry["hits"] += hits
+            entry["misses"] += misses
+
+    def add_error(self, stage: str) -> None:
+        with self._lock:
+            self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def breakdown(self) -> Dict:
+        """
+        Returns the request's timings so far.
+
+        Stage seconds are summed over every call, so stages that ran
+        concurrently (such as per-word audio) can add up to more than the
+        total.
+        """
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self.started, 6),
+                "stages": {
+                    stage: {"seconds": round(seconds, 6), "count": count}
+                    for stage, (seconds, count) in self._stages.items()
+                },
+                "backend_calls": dict(self._backend_calls),
+                "cache": {cache: dict(counts) for cache, counts in self._cache.items()},
+                "errors": dict(self._errors),
+            }
+
+
+_registry: Optional[MetricsRegistry] = None
+_current_trace: contextvars.ContextVar = contextvars.ContextVar(
+    "polyglot_request_trace", default=None
+)
+
+
+def enable_metrics(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Starts recording process-wide metrics.
+
+    Args:
+        registry (MetricsRegistry, optional): Registry to record into (a new one if None)
+
+    Returns:
+        The active registry
+    """
+    global _registry
+    _registry = registry or MetricsRegistry()
+    return _registry
+
+
+def disable_metrics() -> None:
+    """Stops recording process-wide metrics; instrumentation becomes a no-op."""
+    global _registry
+    _registry = None
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """Returns the active registry, or None while metrics are disabled."""
+    return _registry
+
+
+def export_prometheus() -> str:
+    """Returns the active registry in Prometheus text format ("" when disabled)."""
+    registry = _registry
+    return registry.export_prometheus() if registry is not None else ""
+
+
+def start_trace(trace: RequestTrace) -> contextvars.Token:
+    """Makes trace collect every stage run in the current context."""
+    return _current_trace.set(trace)
+
+
+def end_trace(token: contextvars.Token) -> None:
+    try:
+        _current_trace.reset(token)
+    except ValueError:
+        # Reset from another context (e.g. an async generator finalized late)
+        _current_trace.set(None)
+
+
+class _Stage:
+    __slots__ = ("name", "registry", "trace", "started")
+
+    def __init__(self, name: str, registry, trace):
+        self.name = name
+        self.registry = registry
+        self.trace = trace
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        if self.registry is not None:
+            self.registry.observe(self.name, elapsed)
+        if self.trace is not None:
+            self.trace.add_stage(self.name, elapsed)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            record_error(self.name)
+        return False
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+def stage(name: str):
+    """
+    Context manager timing a pipeline stage.
+
+    The duration goes to the active registry and to the current request's
+    trace. With neither present a shared no-op is returned, so disabled
+    instrumentation costs one global and one context variable lookup.
+    """
+    registry = _registry
+    trace = _current_trace.get()
+    if registry is None and trace is None:
+        return _NOOP_STAGE
+    return _Stage(name, registry, trace)
+
+
+def timed(name: str) -> Callable:
+    """Decorator running the whole function as stage name."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_backend_call(backend: str, count: int = 1) -> None:
+    """Counts calls made to an external backend (search, translate, TTS, HTTP)."""
+    registry = _registry
+    trace = _current_trace.get()
+    if registry is not None:
+        registry.increment("backend_calls_total", (backend,), count)
+    if trace is not None:
+        trace.add_backend_call(backend, count)
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0, stale: int = 0) -> None:
+    """Counts cache hits and misses; stale hits also count as hits in traces."""
+    registry = _registry
+    trace = _current_trace.get()
+    if registry is not None:
+        if hits:
+            registry.increment("cache_requests_total", (cache, "hit"), hits)
+        if stale:
+            registry.increment("cache_requests_total", (cache, "stale"), stale)
+        if misses:
+            registry.increment("cache_requests_total", (cache, "miss"), misses)
+    if trace is not None:
+        trace.add_cache(cache, hits + stale, misses)
+
+
+def record_error(stage_name: str) -> None:
+    """Counts an error in a stage, including errors a tool turned into a message."""
+    registry = _registry
+    trace = _current_trace.get()
+    if registry is not None:
+        registry.increment("errors_total", (stage_name,))
+    if trace is not None:
+        trace.add_error(stage_name)
+
+
+def record_rejection(backend: str, reason: str) -> None:
+    """Counts a backend call refused by its rate limiter or circuit breaker."""
+    registry = _registry
+    if registry is not None:
+        registry.increment("backend_rejections_total", (backend, reason))
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
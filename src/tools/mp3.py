@@ -0,0 +1,180 @@
+from typing import Iterator, List, NamedTuple, Optional
+
+# Bitrates in kbps by MPEG version (1 or 2/2.5) for Layer III, indexed by the header field
+_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates in Hz by the 2-bit version field (0: MPEG 2.5, 2: MPEG 2, 3: MPEG 1)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+# A frame counts as silent below this share of the median frame's audio bits
+SILENCE_RATIO = 0.1
+# Pauses shorter than this many frames (about 24 ms each at 24 kHz) are
+# treated as part of a word, e.g. the closure before a stop consonant
+MIN_GAP_FRAMES = 4
+
+
+class Mp3Frame(NamedTuple):
+    """One MPEG audio Layer III frame of an MP3 stream."""
+
+    offset: int
+    length: int
+    sample_rate: int
+    samples: int
+    # Bits of Huffman-coded audio in the frame (sum of part2_3_length);
+    # close to zero for silence
+    audio_bits: int
+
+
+def iter_frames(data: bytes) -> Iterator[Mp3Frame]:
+    """
+    Walks the Layer III frames of an MP3 stream, skipping ID3v2 tags.
+
+    Raises:
+        ValueError: data contains something other than frames and ID3 tags
+    """
+    offset = 0
+    end = len(data)
+    while offset < end:
+        if data.startswith(b"ID3", offset):
+            offset += _id3_length(data, offset)
+            continue
+        if data.startswith(b"TAG", offset) and end - offset == 128:
+            # ID3v1 tag at the very end
+            return
+        frame = _parse_frame(data, offset)
+        if frame is None:
+            raise ValueError(f"no MP3 frame at byte {offset}")
+        yield frame
+        offset += frame.length
+
+
+def split_at_silences(
+    data: bytes,
+    parts: int,
+    min_gap_frames: int = MIN_GAP_FRAMES,
+    silence_ratio: float = SILENCE_RATIO,
+) -> Optional[List[bytes]]:
+    """
+    Cuts an MP3 stream of parts spoken items into one clip per item.
+
+    Cuts are made at frame boundaries in the middle of the parts - 1 longest
+    pauses between the items, so each clip is itself a valid MP3 stream.
+
+    Args:
+        data: The MP3 stream
+        parts: Number of items spoken in it
+        min_gap_frames: Shortest run of silent frames counted as a pause
+        silence_ratio: Frames with fewer audio bits than this share of the
+            median frame are silent
+
+    Returns:
+        List of parts clips in order, or None if data cannot be parsed or
+        does not contain enough pauses
+    """
+    if parts < 1:
+        return None
+    try:
+        frames = list(iter_frames(data))
+    except ValueError:
+        return None
+    if not frames:
+        return None
+    if parts == 1:
+        return [data]
+
+    bits = sorted(frame.audio_bits for frame in frames)
+    threshold = bits[len(bits) // 2] * silence_ratio
+    silent = [frame.audio_bits <= threshold for frame in frames]
+
+    # Pauses strictly between sounds; leading and trailing silence is kept
+    gaps = []
+    start = None
+    for index, is_silent in enumerate(silent):
+        if is_silent and start is None:
+            start = index
+        elif not is_silent and start is not None:
+            if start > 0 and index - start >= min_gap_frames:
+                gaps.append((start, index))
+            start = None
+    if len(gaps) < parts - 1:
+        return None
+
+    # The longest pauses are the ones between items
+    longest = sorted(gaps, key=lambda gap: (gap[0] - gap[1], gap[0]))[: parts - 1]
+    cuts = [frames[(start + stop) // 2].offset for start, stop in sorted(longest)]
+    bounds = [0, *cuts, len(data)]
+    return [data[bounds[i] : bounds[i + 1]] for i in range(parts)]
+
+
+def _id3_length(data: bytes, offset: int) -> int:
+    header = data[offset : offset + 10]
+    if len(header) < 10:
+        raise ValueError("truncated ID3 tag")
+    # Tag size is a 28-bit "syncsafe" integer, 7 bits per byte
+    size = 0
+    for byte in header[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _parse_frame(data: bytes, offset: int) -> Optional[Mp3Frame]:
+    header = data[offset : offset + 4]
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 0x3
+    layer_bits = (header[1] >> 1) & 0x3
+    protected = not header[1] & 0x1
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x3
+    padding = (header[2] >> 1) & 0x1
+    mono = header[3] >> 6 == 0x3
+    if (
+        version_bits == 1
+        or layer_bits != 1
+        or bitrate_index in (0, 15)
+        or sample_rate_index == 3
+    ):
+        # Reserved values, other layers and free-format streams are not supported
+        return None
+
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[1 if mpeg1 else 2][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    samples = 1152 if mpeg1 else 576
+    length = samples // 8 * bitrate // sample_rate + padding
+    if offset + length > len(data):
+        return None
+
+    side_info = data[offset + 4 + (2 if protected else 0) : offset + length]
+    return Mp3Frame(
+        offset, length, sample_rate, samples, _audio_bits(side_info, mpeg1, mono)
+    )
+
+
+def _audio_bits(side_info: bytes, mpeg1: bool, mono: bool) -> int:
+    """Sums part2_3_length over the granules and channels in Layer III side info."""
+    channels = 1 if mono else 2
+    if mpeg1:
+        # main_data_begin, private bits, scfsi
+        position = 9 + (5 if mono else 3) + 4 * channels
+        granules, granule_bits = 2, 59
+    else:
+        position = 8 + (1 if mono else 2)
+        granules, granule_bits = 1, 63
+    value = int.from_bytes(side_info[:32], "big")
+    width = min(len(side_info), 32) * 8
+    total = 0
+    for _ in range(granules * channels):
+        shift = width - position - 12
+        if shift < 0:
+            break
+        total += (value >> shift) & 0xFFF
+        position += granule_bits
+    return total
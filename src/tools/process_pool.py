@@ -0,0 +1,162 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import BrokenExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Optional
+
+from .deadline import check_deadline, remaining_time
+from .metrics import record_error
+
+# Payloads smaller than this many characters (or bytes) are processed in the
+# calling thread: sending them to a worker costs more than the work itself
+MIN_OFFLOAD_SIZE = 16 * 1024
+
+# multiprocessing is imported by configure_process_pool, keeping imports cheap
+# for processes that never use the pool
+_pool: Optional["ProcessPoolExecutor"] = None
+_pool_settings: dict = {}
+_pool_lock = threading.Lock()
+
+
+def configure_process_pool(
+    max_workers: Optional[int] = None,
+    warm: bool = True,
+    start_method: str = "spawn",
+) -> None:
+    """
+    Moves CPU-bound steps into a pool of worker processes.
+
+    Lyrics page parsing, request validation and vocabulary extraction on long
+    texts hold the GIL, so with threads alone a few large lyrics pages stall
+    every other request in the process. With a pool they run in workers
+    instead, which only receive the raw input (page bytes, text) and send
+    back the small result (lyrics text, word list, validation dict).
+
+    Each worker imports bs4, the word and language tables and the language
+    detector when it starts, so no request pays for loading them.
+
+    Args:
+        max_workers (int, optional): Worker processes (defaults to the CPU count)
+        warm (bool): Start every worker now instead of on first use
+        start_method (str): multiprocessing start method; "spawn" is safe
+            with the threads the tools already run
+    """
+    global _pool
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Share the caller's detector so workers detect languages the same way
+    from .language_detection import _default_detector
+
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=_init_worker,
+        initargs=(_default_detector,),
+    )
+    with _pool_lock:
+        old_pool = _pool
+        _pool = pool
+        _pool_settings.update(max_workers=max_workers, start_method=start_method)
+    if old_pool is not None:
+        old_pool.shutdown(wait=False, cancel_futures=True)
+    if warm:
+        # Submitted at once, so the pool starts one process per task
+        for future in [pool.submit(os.getpid) for _ in range(max_workers)]:
+            future.result()
+
+
+def shutdown_process_pool() -> None:
+    """Stops the worker processes; CPU-bound steps run in the caller again."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def get_process_pool() -> Optional["ProcessPoolExecutor"]:
+    """Returns the worker pool, or None when CPU-bound steps run in-process."""
+    return _pool
+
+
+def offload(func: Callable[..., Any], *args, size: Optional[int] = None) -> Any:
+    """
+    Runs func(*args) in a worker process if the pool is configured.
+
+    Blocks the calling thread (without holding the GIL) until the result is
+    back. func and args must be picklable, so func has to be a module-level
+    function.
+
+    Args:
+        func: Module-level function to run
+        *args: Its arguments, sent to the worker
+        size (int, optional): Size of the payload; below MIN_OFFLOAD_SIZE
+            func runs in the calling thread
+
+    Raises:
+        DeadlineExceeded: The current request's budget ran out while waiting
+    """
+    pool = _pool
+    if pool is None or (size is not None and size < MIN_OFFLOAD_SIZE):
+        return func(*args)
+    try:
+        future = pool.submit(func, *args)
+    except RuntimeError:
+        # Shut down, or a worker died (BrokenProcessPool); recreate the pool
+        # for the next call
+        _recover(pool)
+        return func(*args)
+    try:
+        return future.result(timeout=remaining_time())
+    except FuturesTimeoutError:
+        future.cancel()
+        check_deadline(getattr(func, "__name__", "offload"))
+        raise
+    except BrokenExecutor:
+        _recover(pool)
+        return func(*args)
+
+
+async def offload_async(
+    func: Callable[..., Any], *args, size: Optional[int] = None
+) -> Any:
+    """Non-blocking variant of offload for code running on the event loop."""
+    pool = _pool
+    if pool is None or (size is not None and size < MIN_OFFLOAD_SIZE):
+        return func(*args)
+    try:
+        future = pool.submit(func, *args)
+    except RuntimeError:
+        _recover(pool)
+        return func(*args)
+    try:
+        return await asyncio.wrap_future(future)
+    except BrokenExecutor:
+        _recover(pool)
+        return func(*args)
+
+
+def _recover(broken: "ProcessPoolExecutor") -> None:
+    """Replaces a broken pool with a fresh one (once, however many callers notice)."""
+    record_error("process_pool")
+    with _pool_lock:
+        if _pool is not broken:
+            return
+    configure_process_pool(
+        _pool_settings["max_workers"],
+        warm=False,
+        start_method=_pool_settings["start_method"],
+    )
+
+
+def _init_worker(detector) -> None:
+    from . import search_tools, validation_tools, vocabulary_extraction  # noqa: F401
+    from .language_detection import get_default_detector, set_default_detector
+
+    search_tools.load_parser()
+    if detector is not None:
+        set_default_detector(detector)
+    get_default_detector()
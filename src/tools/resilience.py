@@ -0,0 +1,432 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .deadline import check_deadline, remaining_time
+from .metrics import record_rejection
+
+# Requests per second and burst size allowed per backend in this process.
+# Backends missing here are not rate limited (their circuit breaker still applies).
+BACKEND_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+    "ddgs": {"rate": 1.0, "burst": 5},
+    "translate": {"rate": 5.0, "burst": 10},
+    "tts": {"rate": 5.0, "burst": 10},
+    "http": {"rate": 5.0, "burst": 10},
+}
+# Longest a call waits for a token before failing fast instead
+MAX_RATE_LIMIT_WAIT = 2.0
+
+# Consecutive failures that open a circuit
+FAILURE_THRESHOLD = 5
+# First open period; it doubles every time a probe fails, up to the maximum
+RESET_TIMEOUT = 10.0
+MAX_RESET_TIMEOUT = 300.0
+# Open periods are spread by +/- this fraction so workers do not retry in lockstep
+BACKOFF_JITTER = 0.25
+
+RATE_LIMIT_STATUS = 429
+# Exceptions duckduckgo_search and deep_translator raise when throttled
+_RATE_LIMIT_ERRORS = ("RatelimitException", "TooManyRequests")
+# Library exceptions for a backend that could not be reached or did not answer
+_TRANSPORT_ERRORS = ("TimeoutException", "ConnectError", "ReadTimeout", "RequestError")
+
+
+class BackendUnavailableError(RuntimeError):
+    """
+    Raised instead of calling a backend that is rate limited or failing.
+
+    Attributes:
+        backend: Backend name ("ddgs", "translate", "tts" or "http:<host>")
+        reason: "rate_limited" or "circuit_open"
+        retry_after: Seconds until the backend is expected to accept calls again
+    """
+
+    def __init__(self, backend: str, reason: str, retry_after: float):
+        self.backend = backend
+        self.reason = reason
+        self.retry_after = max(0.0, retry_after)
+        super().__init__(
+            f"{backend} is temporarily unavailable ({reason.replace('_', ' ')}), "
+            f"retry in {self.retry_after:.1f}s"
+        )
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True if error is an HTTP 429 or a library's "too many requests" exception."""
+    if type(error).__name__ in _RATE_LIMIT_ERRORS:
+        return True
+    return _status_code(error) == RATE_LIMIT_STATUS
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """
+    True if error says the backend is unhealthy rather than the request bad.
+
+    Rate limits, 5xx answers and transport errors (connection failures,
+    timeouts) count; a 404, an untranslatable word or a parse error does not.
+    """
+    if is_rate_limit_error(error):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status >= 500
+    return is_transport_error(error)
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """True if error is a connection failure or timeout, not an answer."""
+    # Libraries often wrap the underlying socket or HTTP client error
+    cause: Optional[BaseException] = error
+    for _ in range(3):
+        if cause is None:
+            break
+        if isinstance(cause, OSError) or type(cause).__name__ in _TRANSPORT_ERRORS:
+            return True
+        cause = cause.__cause__ or cause.__context__
+    return False
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    # requests puts the response on .response, gTTSError on .rsp
+    for source in (error, getattr(error, "response", None), getattr(error, "rsp", None)):
+        status = getattr(source, "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _retry_after(error: BaseException) -> float:
+    """Seconds from a Retry-After header on the error's response, or 0."""
+    for source in (getattr(error, "response", None), getattr(error, "rsp", None)):
+        headers = getattr(source, "headers", None) or {}
+        try:
+            return float(headers.get("Retry-After", 0))
+        except (TypeError, ValueError):
+            continue
+    return 0.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing rate calls per second with bursts of burst.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Takes one token, possibly from the future.
+
+        Returns:
+            Seconds to wait before using the token, or None (and nothing
+            taken) if that would be longer than max_wait
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def acquire(self, max_wait: float) -> bool:
+        """Blocks until a token is available; False if that takes over max_wait."""
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait:
+            self._sleep(wait)
+        return True
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available."""
+        with self._lock:
+            tokens = self._tokens + (self._clock() - self._updated) * self.rate
+            return max(0.0, (1 - tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a backend after repeated failures.
+
+    The circuit opens after failure_threshold consecutive failures, or at once
+    when the backend rate limits us. While open every call fails fast; after
+    the open period one probe call is let through. A successful probe closes
+    the circuit, a failed one reopens it for twice as long (with jitter).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        max_reset_timeout: float = MAX_RESET_TIMEOUT,
+        jitter: float = BACKOFF_JITTER,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.jitter = jitter
+        self._clock = clock
+        self._random = rng or random.Random()
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        # Consecutive times the circuit opened without a successful probe
+        self._opens = 0
+        self._open_until = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() >= self._open_until:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self) -> Optional[float]:
+        """
+        Claims permission for one call.
+
+        Returns:
+            None if the call may proceed, else seconds until the next probe
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return None
+            now = self._clock()
+            if self._state == self.OPEN and now >= self._open_until:
+                # Let exactly one probe through; everyone else keeps failing fast
+                self._state = self.HALF_OPEN
+                return None
+            return max(0.0, self._open_until - now)
+
+    def cancel_call(self) -> None:
+        """Gives back a probe claimed by before_call that was never made."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is let through (0 when closed)."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return 0.0
+            return max(0.0, self._open_until - self._clock())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opens = 0
+
+    def record_failure(self, rate_limited: bool = False, retry_after: float = 0.0) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or rate_limited
+                or self._failures >= self.failure_threshold
+            ):
+                self._open(retry_after)
+
+    def _open(self, retry_after: float) -> None:
+        self._opens += 1
+        timeout = min(
+            self.max_reset_timeout, self.reset_timeout * 2 ** (self._opens - 1)
+        )
+        timeout *= self._random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._state = self.OPEN
+        self._failures = 0
+        self._open_until = self._clock() + max(timeout, retry_after)
+
+
+class BackendGuard:
+    """
+    Rate limiter and circuit breaker shared by every call to one backend.
+
+    Only backend failures (see is_backend_failure) count against the circuit;
+    other errors show the backend answered, so they count as successes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_wait: float = MAX_RATE_LIMIT_WAIT,
+    ):
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker or CircuitBreaker()
+        self.max_wait = max_wait
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Calls func unless the backend's circuit is open or its rate is exhausted.
+
+        Waits for the rate limiter at most max_wait, or the current request's
+        remaining time if that is shorter.
+
+        Raises:
+            BackendUnavailableError: The call was refused, or the backend
+                answered with a rate limit error
+            DeadlineExceeded: The current request has no time left
+        """
+        check_deadline(self.name)
+        retry_after = self.breaker.before_call()
+        if retry_after is not None:
+            record_rejection(self.name, "circuit_open")
+            raise BackendUnavailableError(self.name, "circuit_open", retry_after)
+        if self.limiter is not None and not self.limiter.acquire(
+            remaining_time(self.max_wait)
+        ):
+            self.breaker.cancel_call()
+            record_rejection(self.name, "rate_limited")
+            raise BackendUnavailableError(
+                self.name, "rate_limited", self.limiter.wait_time()
+            )
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if not is_backend_failure(e):
+                # Bad input or a missing page: the backend itself answered
+                self.breaker.record_success()
+                raise
+            rate_limited = is_rate_limit_error(e)
+            self.breaker.record_failure(rate_limited, _retry_after(e))
+            if rate_limited:
+                record_rejection(self.name, "rate_limited")
+                raise BackendUnavailableError(
+                    self.name, "rate_limited", self.breaker.retry_after()
+                ) from e
+            raise
+        self.breaker.record_success()
+        return result
+
+
+_guards: Dict[str, BackendGuard] = {}
+# Keyword arguments of configure_backend, by backend name
+_settings: Dict[str, Dict[str, Any]] = {}
+_guards_lock = threading.Lock()
+
+
+def get_backend_guard(name: str) -> BackendGuard:
+    """
+    Returns the guard shared by every call to backend name in this process.
+
+    Names like "http:lyrics.example" get their own guard with the settings
+    of the part before the colon (from configure_backend, else its rate
+    limit), so one failing host does not open the circuit of the others.
+    """
+    guard = _guards.get(name)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.get(name)
+            if guard is None:
+                family = name.split(":", 1)[0]
+                settings = _settings.get(name, _settings.get(family))
+                if settings is not None:
+                    guard = _new_guard(name, **settings)
+                else:
+                    limits = BACKEND_RATE_LIMITS.get(
+                        name, BACKEND_RATE_LIMITS.get(family)
+                    )
+                    limiter = (
+                        TokenBucket(limits["rate"], limits["burst"]) if limits else None
+                    )
+                    guard = BackendGuard(name, limiter)
+                _guards[name] = guard
+    return guard
+
+
+def configure_backend(
+    name: str,
+    rate: Optional[float] = None,
+    burst: float = 1,
+    max_wait: float = MAX_RATE_LIMIT_WAIT,
+    failure_threshold: int = FAILURE_THRESHOLD,
+    reset_timeout: float = RESET_TIMEOUT,
+    max_reset_timeout: float = MAX_RESET_TIMEOUT,
+) -> BackendGuard:
+    """
+    Replaces the rate limit and circuit breaker settings of one backend.
+
+    Configuring "http" applies to every lyrics host: each "http:<host>"
+    guard gets its own rate limiter and circuit breaker with these settings.
+
+    Args:
+        name (str): Backend name ("ddgs", "translate", "tts", "http" or
+            "http:<host>")
+        rate (float, optional): Calls per second, or None for no rate limit
+        burst (float): Calls allowed at once before the rate applies
+        max_wait (float): Longest a call waits for the rate limiter
+        failure_threshold (int): Consecutive failures that open the circuit
+        reset_timeout (float): First open period in seconds
+        max_reset_timeout (float): Cap on the doubled open period
+
+    Returns:
+        BackendGuard: The new guard
+    """
+    settings = {
+        "rate": rate,
+        "burst": burst,
+        "max_wait": max_wait,
+        "failure_threshold": failure_threshold,
+        "reset_timeout": reset_timeout,
+        "max_reset_timeout": max_reset_timeout,
+    }
+    guard = _new_guard(name, **settings)
+    with _guards_lock:
+        _settings[name] = settings
+        _guards[name] = guard
+        # Per-host guards are rebuilt with the new settings on their next call
+        for host_guard in [other for other in _guards if other.startswith(name + ":")]:
+            del _guards[host_guard]
+    return guard
+
+
+def _new_guard(
+    name: str,
+    rate: Optional[float],
+    burst: float,
+    max_wait: float,
+    failure_threshold: int,
+    reset_timeout: float,
+    max_reset_timeout: float,
+) -> BackendGuard:
+    return BackendGuard(
+        name,
+        TokenBucket(rate, burst) if rate else None,
+        CircuitBreaker(failure_threshold, reset_timeout, max_reset_timeout),
+        max_wait,
+    )
+
+
+def reset_backend_guards() -> None:
+    """Drops every guard so open circuits and used tokens are forgotten."""
+    with _guards_lock:
+        _guards.clear()
@@ -1,40 +1,337 @@
-from duckduckgo_search import DDGS
 from typing import Dict, List, Optional
-import requests
-from bs4 import BeautifulSoup
+import importlib.util
+import threading
+from urllib.parse import urlparse
+from .cache import TTLCache
+from .executor import run_blocking
+from .metrics import record_backend_call, record_cache, record_error, stage
+from .shared_cache import get_shared_cache
+from .deadline import DeadlineExceeded, remaining_time
+from .process_pool import offload
+from .resilience import (
+    BackendUnavailableError,
+    get_backend_guard,
+    is_transport_error,
+)
 
+# How long search results are reused before asking DuckDuckGo again
+SEARCH_TTL = 6 * 60 * 60
+# Failed or empty searches are retried sooner, but not on every request
+NEGATIVE_SEARCH_TTL = 60
+MAX_CACHED_SEARCHES = 4096
 
-def web_search(query: str) -> str:
+# Lyrics pages are cut off after this many bytes
+MAX_LYRICS_PAGE_BYTES = 2 * 1024 * 1024
+HTTP_POOL_SIZE = 16
+# lxml is much faster than the stdlib parser when it is installed
+LYRICS_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# duckduckgo_search, requests and bs4 are imported on first use (see
+# load_backends) so importing this module stays cheap. Tests replace these
+# names with fakes.
+DDGS = None
+requests = None
+BeautifulSoup = None
+SoupStrainer = None
+_LYRICS_STRAINER = None
+
+
+def load_backends() -> None:
+    """Imports the search, HTTP and HTML parsing libraries if not done yet."""
+    global DDGS, requests
+    if DDGS is None:
+        from duckduckgo_search import DDGS
+    if requests is None:
+        import requests
+    load_parser()
+
+
+def load_parser() -> None:
+    """Imports bs4 and builds the lyrics strainer, all parse_lyrics needs."""
+    global BeautifulSoup, SoupStrainer, _LYRICS_STRAINER
+    if BeautifulSoup is None:
+        from bs4 import BeautifulSoup
+    if SoupStrainer is None:
+        from bs4 import SoupStrainer
+    if _LYRICS_STRAINER is None:
+        # Only lyrics containers (and everything inside them) are turned into a tree
+        _LYRICS_STRAINER = SoupStrainer(["div", "p"], class_=_is_lyrics_class)
+
+
+class SearchError(RuntimeError):
+    """A search or lyrics lookup that produced nothing usable."""
+
+
+class SearchClient:
+    """
+    Reusable DuckDuckGo client with a TTL cache of search results.
+
+    One DDGS session is kept open and shared by all calls; after a connection
+    error new calls get a fresh one, and the failed session is closed once
+    the calls still using it have finished. Results are cached
+    per (endpoint, query, max_results); failures and empty results are cached
+    for a shorter negative_ttl so an outage does not become a retry storm.
+
+    Args:
+        ttl (float): Seconds results are cached
+        negative_ttl (float): Seconds failures and empty results are cached
+        max_entries (int): Size of the in-process cache
+        cache: Cache to use instead, e.g. a CacheNamespace; defaults to the
+            "search" namespace of the shared cache configured at the time of
+            each call, or the in-process cache if there is none
+    """
+
+    def __init__(
+        self,
+        ttl: float = SEARCH_TTL,
+        negative_ttl: float = NEGATIVE_SEARCH_TTL,
+        max_entries: int = MAX_CACHED_SEARCHES,
+        cache=None,
+    ):
+        self.negative_ttl = negative_ttl
+        self._cache = cache
+        self._local_cache = (
+            TTLCache(max_entries=max_entries, ttl=ttl) if cache is None else None
+        )
+        self._ddgs = None
+        # Session -> number of calls using it
+        self._users: Dict = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """The cache searches are looked up in and stored to right now."""
+        if self._cache is not None:
+            return self._cache
+        # Looked up every time, so configure_shared_cache also applies to
+        # the client every request shares
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            return shared_cache.namespace("search")
+        return self._local_cache
+
+    def text(self, query: str, max_results: int) -> List[Dict]:
+        """Returns DuckDuckGo text results for query."""
+        return self._search("text", query, max_results)
+
+    def videos(self, query: str, max_results: int) -> List[Dict]:
+        """Returns DuckDuckGo video results for query."""
+        return self._search("videos", query, max_results)
+
+    def close(self) -> None:
+        """Closes the session, or lets the last call still using it close it."""
+        with self._lock:
+            ddgs, self._ddgs = self._ddgs, None
+            if ddgs is None or self._users.get(ddgs):
+                return
+            self._users.pop(ddgs, None)
+        ddgs.__exit__(None, None, None)
+
+    def _search(self, endpoint: str, query: str, max_results: int) -> List[Dict]:
+        key = (endpoint, query, max_results)
+        cache = self.cache
+        cached = cache.get(key)
+        if isinstance(cached, dict):
+            # Negative entry; a plain dict so shared caches can store it as JSON
+            record_cache("search", hits=1)
+            raise RuntimeError(cached["error"])
+        if cached is not None:
+            record_cache("search", hits=1)
+            return cached
+
+        record_cache("search", misses=1)
+        ddgs = self._acquire()
+        broken = False
+        try:
+            results = get_backend_guard("ddgs").call(
+                self._call, endpoint, getattr(ddgs, endpoint), query, max_results
+            )
+        except (BackendUnavailableError, DeadlineExceeded):
+            # Not cached: the circuit breaker decides when to try again
+            raise
+        except Exception as e:
+            cache.set(key, {"error": str(e)}, ttl=self.negative_ttl)
+            # The connection may be broken; other errors leave the session usable
+            broken = is_transport_error(e)
+            raise
+        finally:
+            self._release(ddgs, broken)
+
+        cache.set(key, results, ttl=None if results else self.negative_ttl)
+        return results
+
+    @staticmethod
+    def _call(endpoint: str, search, query: str, max_results: int) -> List[Dict]:
+        record_backend_call(f"ddgs.{endpoint}")
+        return [r for r in search(query, max_results=max_results)]
+
+    def _acquire(self):
+        """Returns the current session, opening one if needed, for one call."""
+        with self._lock:
+            if self._ddgs is None:
+                load_backends()
+                self._ddgs = DDGS().__enter__()
+            self._users[self._ddgs] = self._users.get(self._ddgs, 0) + 1
+            return self._ddgs
+
+    def _release(self, ddgs, broken: bool) -> None:
+        """
+        Ends a call made with ddgs.
+
+        A broken session is replaced for new calls if nobody replaced it yet,
+        and closed when its last call ends.
+        """
+        with self._lock:
+            if broken and ddgs is self._ddgs:
+                self._ddgs = None
+            self._users[ddgs] -= 1
+            if self._users[ddgs] or ddgs is self._ddgs:
+                return
+            del self._users[ddgs]
+        ddgs.__exit__(None, None, None)
+
+
+_search_client: Optional[SearchClient] = None
+_search_client_lock = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """Returns the search client shared by this worker process."""
+    global _search_client
+    if _search_client is None:
+        with _search_client_lock:
+            if _search_client is None:
+                _search_client = SearchClient()
+    return _search_client
+
+
+_http_session: Optional["requests.Session"] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> "requests.Session":
+    """Returns the keep-alive HTTP session shared by this worker process."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                load_backends()
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def _is_lyrics_class(css_class: Optional[str]) -> bool:
+    return bool(css_class) and (
+        "lyrics" in css_class.lower() or "text" in css_class.lower()
+    )
+
+
+def fetch_page(url: str, max_bytes: int = MAX_LYRICS_PAGE_BYTES, timeout: float = 5):
+    """
+    Downloads at most max_bytes of a page over the shared session.
+
+    The timeout is shortened to the current request's remaining time. Every
+    host has its own circuit breaker, so one failing lyrics site does not
+    stop lookups on the others.
+
+    Returns:
+        Tuple of (raw bytes, declared encoding or None)
+    """
+    return get_backend_guard(f"http:{urlparse(url).netloc}").call(
+        _fetch_page, url, max_bytes, remaining_time(timeout)
+    )
+
+
+def _fetch_page(url: str, max_bytes: int, timeout: float):
+    record_backend_call("http")
+    with get_http_session().get(url, timeout=timeout, stream=True) as response:
+        # Error pages (including 429s) are not parsed as lyrics
+        response.raise_for_status()
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        content_type = response.headers.get("Content-Type", "")
+        encoding = response.encoding if "charset" in content_type.lower() else None
+    return b"".join(chunks)[:max_bytes], encoding
+
+
+def parse_lyrics(html, encoding: Optional[str] = None) -> Optional[str]:
+    """
+    Extracts the text of the first lyrics container in a page.
+
+    Args:
+        html: Page markup as bytes or str
+        encoding (str, optional): Declared encoding for byte input
+
+    Returns:
+        str: Lyrics text, or None if the page has no lyrics container
+    """
+    load_parser()
+    soup = BeautifulSoup(
+        html,
+        LYRICS_PARSER,
+        parse_only=_LYRICS_STRAINER,
+        from_encoding=encoding if isinstance(html, bytes) else None,
+    )
+    container = soup.find(["div", "p"], class_=_is_lyrics_class)
+    if container is None:
+        return None
+    return container.get_text(strip=True)
+
+
+def _failure(message: str, raise_errors: bool) -> str:
+    """Returns message, or raises it as a SearchError when raise_errors is set."""
+    if raise_errors:
+        raise SearchError(message)
+    return message
+
+
+def web_search(query: str, raise_errors: bool = False) -> str:
     """
     Performs a web search for the given query using DuckDuckGo.
 
     Args:
         query (str): Search query
+        raise_errors (bool): Raise SearchError instead of returning an error message
 
     Returns:
         str: Search results summary
+
+    Raises:
+        BackendUnavailableError: DuckDuckGo is rate limiting us or failing
     """
     try:
-        with DDGS() as ddgs:
-            # Use ddgs.text() to get search results
-            results = [r for r in ddgs.text(query, max_results=3)]
-
-            if not results:
-                return "No results found"
-
-            # Format results, making sure to access the URL correctly
-            formatted_results = []
-            for result in results:
-                formatted_results.append(
-                    f"Title: {result.get('title', 'No title')}\n"
-                    f"Content: {result.get('body', 'No content')}\n"
-                    f"URL: {result.get('href', result.get('link', 'No link'))}\n"  # Try both 'href' and 'link'
-                )
+        with stage("search"):
+            results = get_search_client().text(query, max_results=3)
+
+        if not results:
+            return _failure("No results found", raise_errors)
+
+        # Format results, making sure to access the URL correctly
+        formatted_results = []
+        for result in results:
+            formatted_results.append(
+                f"Title: {result.get('title', 'No title')}\n"
+                f"Content: {result.get('body', 'No content')}\n"
+                f"URL: {result.get('href', result.get('link', 'No link'))}\n"  # Try both 'href' and 'link'
+            )
 
-            return "\n\n".join(formatted_results)
+        return "\n\n".join(formatted_results)
 
+    except (BackendUnavailableError, DeadlineExceeded, SearchError):
+        raise
     except Exception as e:
-        return f"Error performing web search: {str(e)}"
+        return _failure(f"Error performing web search: {str(e)}", raise_errors)
 
 
 def find_youtube_video(song_title: str) -> Dict:
@@ -48,77 +345,98 @@ def find_youtube_video(song_title: str) -> Dict:
         Dict: Video information including title, URL, and thumbnail
     """
     try:
-        with DDGS() as ddgs:
-            # Use ddgs.videos() to get video results
-            videos = [
-                v
-                for v in ddgs.videos(
-                    f"{song_title} official music video", max_results=1
-                )
-            ]
-
-            if videos:
-                video = videos[0]
-                return {
-                    "title": video.get("title", "No title"),
-                    "url": video.get(
-                        "href", video.get("link", "No link")
-                    ),  # Try both 'href' and 'link'
-                    "thumbnail": video.get(
-                        "image", video.get("thumbnail", "No thumbnail")
-                    ),  # Try both 'image' and 'thumbnail'
-                    "duration": video.get("duration", "Unknown duration"),
-                }
-            else:
-                return {"error": "No videos found"}
+        with stage("video_search"):
+            videos = get_search_client().videos(
+                f"{song_title} official music video", max_results=1
+            )
+
+        if videos:
+            video = videos[0]
+            return {
+                "title": video.get("title", "No title"),
+                "url": video.get(
+                    "href", video.get("link", "No link")
+                ),  # Try both 'href' and 'link'
+                "thumbnail": video.get(
+                    "image", video.get("thumbnail", "No thumbnail")
+                ),  # Try both 'image' and 'thumbnail'
+                "duration": video.get("duration", "Unknown duration"),
+            }
+        else:
+            record_error("video_search")
+            return {"error": "No videos found"}
 
     except Exception as e:
         return {"error": f"Error finding video: {str(e)}"}
 
 
-def get_song_lyrics(song_title: str, artist: str = "") -> str:
+def get_song_lyrics(song_title: str, artist: str = "", raise_errors: bool = False) -> str:
     """
     Attempts to find lyrics for a given song.
 
     Args:
         song_title (str): Title of the song
         artist (str, optional): Artist name
+        raise_errors (bool): Raise SearchError instead of returning an error message
 
     Returns:
         str: Song lyrics or error message
+
+    Raises:
+        BackendUnavailableError: DuckDuckGo or the lyrics site is rate limiting us or failing
     """
     try:
+        load_backends()
         search_query = f"{song_title} {artist} lyrics"
-        with DDGS() as ddgs:
-            results = [r for r in ddgs.text(search_query, max_results=1)]
-
-            if not results:
-                return "No lyrics found"
-
-            try:
-                url = results[0].get(
-                    "href", results[0].get("link")
-                )  # Try both 'href' and 'link'
-                if not url:
-                    return "No valid URL found for lyrics"
-
-                response = requests.get(url, timeout=5)
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                lyrics_containers = soup.find_all(
-                    ["div", "p"],
-                    class_=lambda x: x
-                    and ("lyrics" in x.lower() or "text" in x.lower()),
-                )
+        with stage("lyrics_search"):
+            results = get_search_client().text(search_query, max_results=1)
 
-                if lyrics_containers:
-                    lyrics = lyrics_containers[0].get_text(strip=True)
-                    return lyrics
+        if not results:
+            record_error("lyrics_search")
+            return _failure("No lyrics found", raise_errors)
 
-                return "Lyrics not found on the page"
+        try:
+            url = results[0].get(
+                "href", results[0].get("link")
+            )  # Try both 'href' and 'link'
+            if not url:
+                record_error("lyrics_fetch")
+                return _failure("No valid URL found for lyrics", raise_errors)
 
-            except requests.RequestException as e:
-                return f"Error accessing lyrics page: {str(e)}"
+            with stage("lyrics_fetch"):
+                page, encoding = fetch_page(url)
+            with stage("lyrics_parse"):
+                # In a worker process when one is configured; only the
+                # lyrics text comes back
+                lyrics = offload(parse_lyrics, page, encoding, size=len(page))
 
+            if lyrics is not None:
+                return lyrics
+
+            record_error("lyrics_parse")
+            return _failure("Lyrics not found on the page", raise_errors)
+
+        except requests.RequestException as e:
+            return _failure(f"Error accessing lyrics page: {str(e)}", raise_errors)
+
+    except (BackendUnavailableError, DeadlineExceeded, SearchError):
+        raise
     except Exception as e:
-        return f"Error fetching lyrics: {str(e)}"
+        return _failure(f"Error fetching lyrics: {str(e)}", raise_errors)
+
+
+async def web_search_async(query: str, raise_errors: bool = False) -> str:
+    """Non-blocking variant of web_search that runs on the shared executor."""
+    return await run_blocking(web_search, query, raise_errors)
+
+
+async def find_youtube_video_async(song_title: str) -> Dict:
+    """Non-blocking variant of find_youtube_video that runs on the shared executor."""
+    return await run_blocking(find_youtube_video, song_title)
+
+
+async def get_song_lyrics_async(
+    song_title: str, artist: str = "", raise_errors: bool = False
+) -> str:
+    """Non-blocking variant of get_song_lyrics that runs on the shared executor."""
+    return await run_blocking(get_song_lyrics, song_title, artist, raise_errors)
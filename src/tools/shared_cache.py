@@ -0,0 +1,439 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Union
+
+from .cache import TTLCache
+from .metrics import record_cache, record_error
+
+DEFAULT_SHARED_CACHE_PATH = os.path.join("cache", "shared_cache.sqlite3")
+
+# Seconds entries live, per namespace; namespaces missing here use DEFAULT_TTL
+NAMESPACE_TTLS: Dict[str, float] = {
+    "search": 6 * 60 * 60,
+    "translation": 30 * 24 * 60 * 60,
+    "audio": 30 * 24 * 60 * 60,
+    # Refilled nightly by scripts/prewarm_caches.py. Workers treat entries
+    # older than RESPONSE_TTL as stale: served while one request refreshes them
+    "response": 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+# Values kept in the in-process tier, per namespace. Audio clips are only kept
+# on disk and in the shared tier, and responses in the assistant's own cache.
+NAMESPACE_L1_ENTRIES: Dict[str, int] = {
+    "search": 4096,
+    "translation": 2048,
+    "audio": 0,
+    "response": 0,
+}
+DEFAULT_L1_ENTRIES = 1024
+
+# SQLite limits the number of bound parameters per statement
+_SQL_CHUNK = 500
+# Expired rows are deleted from the SQLite store every this many writes
+_PURGE_EVERY = 1000
+
+# First byte of a stored value, saying how the rest is encoded
+_BYTES = b"b"
+_TEXT = b"s"
+_JSON = b"j"
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serializes a cache value for the shared tier.
+
+    Binary values (audio clips) and strings (translations) are stored as they
+    are, without base64 or JSON escaping; everything else must be JSON.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _BYTES + value
+    if isinstance(value, str):
+        return _TEXT + value.encode("utf-8")
+    return _JSON + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def decode_value(data: bytes) -> Any:
+    """
+    Inverse of encode_value.
+
+    Binary values come back as a memoryview over data, so large clips are not
+    copied again on their way to a file.
+    """
+    view = memoryview(data)
+    tag, payload = view[:1], view[1:]
+    if tag == _BYTES:
+        return payload
+    if tag == _TEXT:
+        return str(payload, "utf-8")
+    if tag == _JSON:
+        return json.loads(str(payload, "utf-8"))
+    raise ValueError(f"unknown cache value encoding {bytes(tag)!r}")
+
+
+class CacheBackend:
+    """Interface for the shared tier of a TwoTierCache."""
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Returns the stored, unexpired value of every key that has one."""
+        raise NotImplementedError
+
+    def set_many(self, items: Dict[str, bytes], ttl: float) -> None:
+        """Stores every item for ttl seconds."""
+        raise NotImplementedError
+
+    def delete_many(self, keys: List[str]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Shared tier in a local SQLite file, for worker processes on one host.
+
+    The file is opened in WAL mode so every worker can read while one writes.
+    """
+
+    def __init__(self, path: str = DEFAULT_SHARED_CACHE_PATH, busy_timeout: float = 5.0):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        found: Dict[str, bytes] = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[i : i + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders}) "
+                    "AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def set_many(self, items: Dict[str, bytes], ttl: float) -> None:
+        if not items:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, value in items.items()],
+            )
+            self._writes += len(items)
+            if self._writes >= _PURGE_EVERY:
+                self._writes = 0
+                self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def delete_many(self, keys: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared tier on a Redis-compatible server, for workers on several hosts.
+
+    Args:
+        client: A redis-py style client (mget, delete and pipeline with set);
+            see from_url
+        prefix (str): Prepended to every key so the server can be shared
+    """
+
+    def __init__(self, client, prefix: str = "polyglot:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "polyglot:") -> "RedisCacheBackend":
+        """Connects with redis-py, which is only needed for this backend."""
+        import redis
+
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, items: Dict[str, bytes], ttl: float) -> None:
+        if not items:
+            return
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipeline.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+        pipeline.execute()
+
+    def delete_many(self, keys: List[str]) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+def backend_from_url(url: str) -> CacheBackend:
+    """
+    Builds a shared tier from a URL.
+
+    "sqlite:///path/to/file.sqlite3" (or a plain path) opens a SQLite store;
+    "redis://host:port/db" connects to a Redis-compatible server.
+    """
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCacheBackend.from_url(url)
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SQLiteCacheBackend(url)
+
+
+def _key_string(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return "\x1f".join(str(part) for part in key)
+    return str(key)
+
+
+class CacheNamespace:
+    """
+    One namespace of a TwoTierCache, with its own TTL and in-process tier.
+
+    get and set take the same arguments as TTLCache, so it can stand in for
+    one. Keys may be strings or tuples; values must be bytes, str or JSON.
+    """
+
+    def __init__(
+        self, name: str, backend: Optional[CacheBackend], ttl: float, l1_entries: int
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self._backend = backend
+        self._l1 = TTLCache(max_entries=l1_entries, ttl=ttl) if l1_entries else None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for key, or default if missing or expired."""
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Looks up many keys, asking the shared tier once for all L1 misses.
+
+        Returns:
+            Dict mapping each cached key to its value
+        """
+        found: Dict[Hashable, Any] = {}
+        missing: Dict[str, Hashable] = {}
+        for key in dict.fromkeys(keys):
+            value = self._l1.get(key) if self._l1 is not None else None
+            if value is not None:
+                found[key] = value
+            else:
+                missing[self._storage_key(key)] = key
+        l1_hits = len(found)
+
+        if missing and self._backend is not None:
+            try:
+                stored = self._backend.get_many(list(missing))
+            except Exception:
+                # An unreachable shared tier is a miss, not a failed request
+                record_error("shared_cache")
+                stored = {}
+            for storage_key, data in stored.items():
+                try:
+                    value = decode_value(data)
+                except ValueError:
+                    continue
+                key = missing[storage_key]
+                found[key] = value
+                if self._l1 is not None:
+                    self._l1.set(key, value)
+
+        l2_hits = len(found) - l1_hits
+        misses = len(missing) - l2_hits
+        with self._lock:
+            self.l1_hits += l1_hits
+            self.l2_hits += l2_hits
+            self.misses += misses
+        if missing and self._backend is not None:
+            record_cache("shared_cache", hits=l2_hits, misses=misses)
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores value under key for ttl seconds (the namespace TTL if None)."""
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[Hashable, Any], ttl: Optional[float] = None) -> None:
+        """Stores many values, writing them to the shared tier in one batch."""
+        if not items:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        if self._l1 is not None:
+            for key, value in items.items():
+                self._l1.set(key, value, ttl)
+        if self._backend is None:
+            return
+        try:
+            self._backend.set_many(
+                {self._storage_key(key): encode_value(value) for key, value in items.items()},
+                ttl,
+            )
+        except Exception:
+            record_error("shared_cache")
+
+    def delete(self, key: Hashable) -> None:
+        if self._l1 is not None:
+            self._l1.delete(key)
+        if self._backend is not None:
+            try:
+                self._backend.delete_many([self._storage_key(key)])
+            except Exception:
+                record_error("shared_cache")
+
+    def stats(self) -> Dict:
+        """Returns hits per tier, misses and the overall hit rate."""
+        with self._lock:
+            hits = self.l1_hits + self.l2_hits
+            total = hits + self.misses
+            return {
+                "l1_hits": self.l1_hits,
+                "l2_hits": self.l2_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "l1_entries": len(self._l1) if self._l1 is not None else 0,
+            }
+
+    def _storage_key(self, key: Hashable) -> str:
+        return f"{self.name}:{_key_string(key)}"
+
+
+class TwoTierCache:
+    """
+    Cache with an in-process tier in front of a tier shared by every worker.
+
+    Each namespace ("search", "translation", "audio", ...) has its own TTL
+    and in-process size. Without a backend only the in-process tier is used.
+
+    Args:
+        backend (CacheBackend, optional): The shared tier
+        ttls: TTL in seconds per namespace, overriding NAMESPACE_TTLS
+        l1_entries: In-process entries per namespace, overriding
+            NAMESPACE_L1_ENTRIES
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        l1_entries: Optional[Dict[str, int]] = None,
+    ):
+        self.backend = backend
+        self.ttls = {**NAMESPACE_TTLS, **(ttls or {})}
+        self.l1_entries = {**NAMESPACE_L1_ENTRIES, **(l1_entries or {})}
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self._lock = threading.Lock()
+
+    def namespace(self, name: str) -> CacheNamespace:
+        with self._lock:
+            namespace = self._namespaces.get(name)
+            if namespace is None:
+                namespace = self._namespaces[name] = CacheNamespace(
+                    name,
+                    self.backend,
+                    self.ttls.get(name, DEFAULT_TTL),
+                    self.l1_entries.get(name, DEFAULT_L1_ENTRIES),
+                )
+            return namespace
+
+    def stats(self) -> Dict[str, Dict]:
+        """Returns CacheNamespace.stats() of every namespace used so far."""
+        with self._lock:
+            namespaces = dict(self._namespaces)
+        return {name: namespace.stats() for name, namespace in namespaces.items()}
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
+
+
+_shared_cache: Optional[TwoTierCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def configure_shared_cache(
+    backend: Union[CacheBackend, str, None] = DEFAULT_SHARED_CACHE_PATH,
+    ttls: Optional[Dict[str, float]] = None,
+    l1_entries: Optional[Dict[str, int]] = None,
+) -> TwoTierCache:
+    """
+    Makes the search, translation and audio caches use a TwoTierCache.
+
+    Call it at worker startup, before the first request, so every worker on a
+    host (or, with Redis, every host) reuses what the others already fetched.
+
+    Args:
+        backend: A CacheBackend, a URL for backend_from_url, or None for the
+            in-process tier only
+        ttls: TTL in seconds per namespace
+        l1_entries: In-process entries per namespace
+
+    Returns:
+        TwoTierCache: The configured cache
+    """
+    global _shared_cache
+    if isinstance(backend, str):
+        backend = backend_from_url(backend)
+    cache = TwoTierCache(backend, ttls, l1_entries)
+    with _shared_cache_lock:
+        old_cache, _shared_cache = _shared_cache, cache
+    if old_cache is not None:
+        old_cache.close()
+    return cache
+
+
+def get_shared_cache() -> Optional[TwoTierCache]:
+    """Returns the configured TwoTierCache, or None if the tools use their own caches."""
+    return _shared_cache
+
+
+def disable_shared_cache() -> None:
+    """Goes back to each tool's own in-process cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        old_cache, _shared_cache = _shared_cache, None
+    if old_cache is not None:
+        old_cache.close()
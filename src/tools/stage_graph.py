@@ -0,0 +1,173 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .deadline import DeadlineExceeded, within_deadline
+
+
+class Stage(NamedTuple):
+    """One step of a request pipeline and the steps whose results it needs."""
+
+    name: str
+    # Called with the results of after, in order; returns an awaitable
+    func: Callable[..., Awaitable[Any]]
+    after: tuple
+    # Optional stages return fallback instead of failing the request when
+    # the deadline runs out
+    optional: bool
+    fallback: Any
+    # Fraction of the remaining deadline the stage may use
+    share: float
+
+
+class StageGraph:
+    """
+    A request pipeline as a graph of async stages.
+
+    Every stage starts as soon as the stages it depends on have finished, so
+    independent stages run at the same time and a request takes as long as
+    its slowest chain of dependent stages rather than the sum of all stages.
+    Stages can only depend on stages added before them, which keeps the
+    graph acyclic.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        after: Iterable[str] = (),
+        optional: bool = False,
+        fallback: Any = None,
+        share: float = 1.0,
+    ) -> "StageGraph":
+        """
+        Adds a stage.
+
+        Args:
+            name (str): Stage name, also reported in DeadlineExceeded
+            func: Called with the results of the after stages, in order, and
+                returns the awaitable to run
+            after: Names of the stages whose results func needs
+            optional (bool): Return fallback instead of failing the request
+                when the deadline runs out during this stage
+            fallback: Result of a skipped optional stage
+            share (float): Fraction of the remaining deadline the stage may use
+
+        Returns:
+            StageGraph: self, so stages can be chained
+        """
+        if name in self._stages:
+            raise ValueError(f"stage {name!r} is already defined")
+        after = tuple(after)
+        for dependency in after:
+            if dependency not in self._stages:
+                raise ValueError(f"stage {name!r} depends on unknown stage {dependency!r}")
+        self._stages[name] = Stage(name, func, after, optional, fallback, share)
+        return self
+
+    @property
+    def stages(self) -> List[Stage]:
+        """Stages in the order they were added."""
+        return list(self._stages.values())
+
+    def critical_path(self, durations: Dict[str, float]) -> float:
+        """
+        Longest chain of dependent stages given each stage's duration.
+
+        This is the shortest time the whole graph can run in; stages missing
+        from durations count as instant.
+        """
+        finish: Dict[str, float] = {}
+        for stage in self._stages.values():
+            start = max((finish[dependency] for dependency in stage.after), default=0.0)
+            finish[stage.name] = start + durations.get(stage.name, 0.0)
+        return max(finish.values(), default=0.0)
+
+    def start(self, on_skip: Optional[Callable[[str], None]] = None) -> "StageRun":
+        """
+        Starts every stage; each one waits for its dependencies by itself.
+
+        Must be called inside a running event loop. The stages run in copies
+        of the caller's context, so they share its deadline and metrics trace.
+
+        Args:
+            on_skip: Called with the name of every optional stage dropped
+                because the deadline ran out
+        """
+        return StageRun(self, on_skip)
+
+
+class StageRun:
+    """
+    One execution of a StageGraph.
+
+    Use as an async context manager so stages nobody waits for any more are
+    cancelled when the caller is done or fails.
+    """
+
+    def __init__(self, graph: StageGraph, on_skip: Optional[Callable[[str], None]]):
+        self._on_skip = on_skip
+        self.skipped: List[str] = []
+        # Resolved with the first error of a required stage
+        self._failed = asyncio.get_running_loop().create_future()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        for stage in graph.stages:
+            task = asyncio.ensure_future(self._run(stage))
+            task.add_done_callback(self._stage_done)
+            self._tasks[stage.name] = task
+
+    async def result(self, name: str) -> Any:
+        """
+        Waits for one stage's result.
+
+        Raises the error of any required stage that fails first, so a request
+        ends as soon as it cannot succeed instead of waiting for unrelated
+        stages to finish.
+        """
+        task = self._tasks[name]
+        if not task.done():
+            await asyncio.wait({task, self._failed}, return_when=asyncio.FIRST_COMPLETED)
+        if not task.done():
+            return self._failed.result()
+        return task.result()
+
+    def cancel(self) -> None:
+        """Cancels every stage that has not finished yet."""
+        for task in self._tasks.values():
+            task.cancel()
+
+    async def __aenter__(self) -> "StageRun":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.cancel()
+
+    async def _run(self, stage: Stage) -> Any:
+        # Shielded so one dependent being cancelled does not cancel a result
+        # other stages still need
+        inputs = [
+            await asyncio.shield(self._tasks[dependency]) for dependency in stage.after
+        ]
+        awaitable = stage.func(*inputs)
+        if not stage.optional:
+            return await within_deadline(awaitable, stage.name, stage.share)
+        try:
+            return await within_deadline(awaitable, stage.name, stage.share)
+        except DeadlineExceeded:
+            self.skipped.append(stage.name)
+            if self._on_skip is not None:
+                self._on_skip(stage.name)
+            return stage.fallback
+
+    def _stage_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        # Retrieving the error here also keeps asyncio from logging it for
+        # stages whose result is never awaited
+        error = task.exception()
+        if error is not None and not self._failed.done():
+            self._failed.set_exception(error)
+            # Also retrieved, since nobody may be waiting on it
+            self._failed.exception()
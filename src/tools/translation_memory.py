@@ -0,0 +1,337 @@
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from .metrics import record_cache
+from .shared_cache import get_shared_cache
+
+DEFAULT_DB_PATH = os.path.join("cache", "translation_memory.sqlite3")
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_LRU_SIZE = 2_048
+
+# SQLite limits the number of bound parameters per statement
+_SQL_CHUNK = 500
+# In-memory hits are written back to last_used in batches of this many
+_TOUCH_BATCH = 256
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes text for use as a translation memory key."""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+class TranslationMemory:
+    """
+    Persistent translation cache keyed on (source, target, normalized text).
+
+    Entries live in a local SQLite file with an in-process LRU in front of it.
+    The file is capped at max_entries; the least recently used rows are
+    evicted first.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_DB_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        lru_size: int = DEFAULT_LRU_SIZE,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.lru_size = lru_size
+        self.hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        # LRU hits whose last_used is not written to SQLite yet
+        self._touched: Dict[Tuple[str, str, str], float] = {}
+        self._lock = threading.Lock()
+
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, target, text)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_used "
+            "ON translations (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, source: str, target: str, text: str) -> Optional[str]:
+        """Returns the cached translation of text, or None."""
+        return self.get_many(source, target, [text]).get(text)
+
+    def set(self, source: str, target: str, text: str, translation: str) -> None:
+        """Stores a single translation."""
+        self.set_many(source, target, {text: translation})
+
+    def get_many(self, source: str, target: str, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        Looks up many texts at once.
+
+        Args:
+            source (str): Source language code
+            target (str): Target language code
+            texts: Texts to look up
+
+        Returns:
+            Dict mapping each cached text (as given) to its translation
+        """
+        wanted: Dict[str, list] = {}
+        for text in texts:
+            wanted.setdefault(normalize_text(text), []).append(text)
+
+        found: Dict[str, str] = {}
+        now = time.time()
+        with self._lock:
+            missing = []
+            for key in wanted:
+                lru_key = (source, target, key)
+                if lru_key in self._lru:
+                    self._lru.move_to_end(lru_key)
+                    found[key] = self._lru[lru_key]
+                    # Keeps often used entries from being evicted from the file
+                    self._touched[lru_key] = now
+                else:
+                    missing.append(key)
+
+            if missing:
+                for i in range(0, len(missing), _SQL_CHUNK):
+                    chunk = missing[i : i + _SQL_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        "SELECT text, translation FROM translations "
+                        f"WHERE source = ? AND target = ? AND text IN ({placeholders})",
+                        (source, target, *chunk),
+                    ).fetchall()
+                    for key, translation in rows:
+                        found[key] = translation
+                        self._remember((source, target, key), translation)
+                    if rows:
+                        self._conn.executemany(
+                            "UPDATE translations SET last_used = ? "
+                            "WHERE source = ? AND target = ? AND text = ?",
+                            [(now, source, target, key) for key, _ in rows],
+                        )
+                self._flush_touched()
+                self._conn.commit()
+            elif len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched()
+                self._conn.commit()
+
+            hits = sum(len(wanted[key]) for key in found)
+            misses = sum(
+                len(originals) for key, originals in wanted.items() if key not in found
+            )
+            self.hits += hits
+            self.misses += misses
+        record_cache("translation_memory", hits=hits, misses=misses)
+
+        return {
+            original: found[key]
+            for key, originals in wanted.items()
+            if key in found
+            for original in originals
+        }
+
+    def set_many(self, source: str, target: str, translations: Dict[str, str]) -> None:
+        """
+        Stores many translations at once, evicting old entries if needed.
+
+        Args:
+            source (str): Source language code
+            target (str): Target language code
+            translations: Mapping of text to translation
+        """
+        if not translations:
+            return
+        now = time.time()
+        rows = [
+            (source, target, normalize_text(text), translation, now)
+            for text, translation in translations.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(source, target, text, translation, last_used) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            for _, _, key, translation, _ in rows:
+                self._remember((source, target, key), translation)
+            self._flush_touched()
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Returns hit/miss counters and current sizes."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "entries": self._count(),
+                "lru_entries": len(self._lru),
+            }
+
+    def clear(self) -> None:
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+            self._lru.clear()
+            self._touched.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def _flush_touched(self) -> None:
+        """Writes the last_used time of recent in-memory hits to SQLite."""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE translations SET last_used = ? "
+            "WHERE source = ? AND target = ? AND text = ?",
+            [(used, *lru_key) for lru_key, used in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _remember(self, lru_key: Tuple[str, str, str], translation: str) -> None:
+        self._lru[lru_key] = translation
+        self._lru.move_to_end(lru_key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _evict(self) -> None:
+        excess = self._count() - self.max_entries
+        if excess <= 0:
+            return
+        evicted = self._conn.execute(
+            "SELECT source, target, text FROM translations "
+            "ORDER BY last_used ASC LIMIT ?",
+            (excess,),
+        ).fetchall()
+        self._conn.executemany(
+            "DELETE FROM translations WHERE source = ? AND target = ? AND text = ?",
+            evicted,
+        )
+        for row in evicted:
+            self._lru.pop(tuple(row), None)
+
+
+class SharedTranslationMemory:
+    """
+    Translation memory in the "translation" namespace of a TwoTierCache.
+
+    Same interface as TranslationMemory, so worker processes (and hosts, with
+    a Redis backend) reuse each other's translations.
+
+    Args:
+        namespace: A CacheNamespace; defaults to the "translation" namespace
+            of the shared cache configured at the time of each call. Without
+            one every lookup misses and nothing is stored.
+    """
+
+    def __init__(self, namespace=None):
+        self._namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def namespace(self):
+        """The CacheNamespace translations are kept in right now, or None."""
+        if self._namespace is not None:
+            return self._namespace
+        shared_cache = get_shared_cache()
+        return shared_cache.namespace("translation") if shared_cache is not None else None
+
+    def get(self, source: str, target: str, text: str) -> Optional[str]:
+        """Returns the cached translation of text, or None."""
+        return self.get_many(source, target, [text]).get(text)
+
+    def set(self, source: str, target: str, text: str, translation: str) -> None:
+        """Stores a single translation."""
+        self.set_many(source, target, {text: translation})
+
+    def get_many(self, source: str, target: str, texts: Iterable[str]) -> Dict[str, str]:
+        """Looks up many texts with one request to the shared tier."""
+        wanted: Dict[str, list] = {}
+        for text in texts:
+            wanted.setdefault(normalize_text(text), []).append(text)
+        namespace = self.namespace
+        cached = (
+            namespace.get_many([(source, target, key) for key in wanted])
+            if namespace is not None
+            else {}
+        )
+        found = {
+            key: cached[(source, target, key)]
+            for key in wanted
+            if (source, target, key) in cached
+        }
+
+        hits = sum(len(wanted[key]) for key in found)
+        misses = sum(len(originals) for key, originals in wanted.items() if key not in found)
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        record_cache("translation_memory", hits=hits, misses=misses)
+        return {
+            original: found[key]
+            for key, originals in wanted.items()
+            if key in found
+            for original in originals
+        }
+
+    def set_many(self, source: str, target: str, translations: Dict[str, str]) -> None:
+        """Stores many translations with one request to the shared tier."""
+        namespace = self.namespace
+        if namespace is None:
+            return
+        namespace.set_many(
+            {
+                (source, target, normalize_text(text)): translation
+                for text, translation in translations.items()
+            }
+        )
+
+    def stats(self) -> Dict:
+        """Returns hit/miss counters and the shared cache's per-tier counters."""
+        namespace = self.namespace
+        shared = namespace.stats() if namespace is not None else {}
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                **{f"shared_{name}": value for name, value in shared.items()},
+            }
+
+    def close(self) -> None:
+        pass
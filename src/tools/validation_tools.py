@@ -1,155 +1,323 @@
-from typing import Dict
-from langdetect import detect, detect_langs
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Set
+import itertools
+import json
+import os
 import re
+from .metrics import stage
+from .process_pool import MIN_OFFLOAD_SIZE, get_process_pool, offload_async
+from .language_detection import (
+    DetectedLanguage,
+    LanguageDetector,
+    get_default_detector,
+)
 
+DEFAULT_TABLES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "language_tables.json"
+)
 
-def analyze_language_confidence(text: str) -> Dict:
+# Cultural content patterns (songs, poems)
+CULTURAL_PATTERNS = [
+    r"find .*(song|poem|music)",
+    r"(song|poem|music) .*(in|about)",
+    r"teach me .*(song|poem)",
+    r"learn .*(song|poem)",
+]
+
+# Enhanced question detection for language learning
+QUESTION_PATTERNS = [
+    r"how.+say",
+    r"what.+mean",
+]
+QUESTION_PHRASES = [
+    "translate",
+    "bedeutet",  # German
+    "¿cómo se dice",  # Spanish
+    "comment dit-on",  # French
+    "was heißt",  # German
+]
+
+# Words that make a question look language-related
+QUESTION_CONTEXT_WORDS = ["in", "to", "from", "auf", "en", "auf"]
+
+# Clear language learning patterns that boost the score
+BOOST_WORDS = ["how", "say", "what", "mean", "translate", "bedeutet", "¿cómo se dice"]
+
+CULTURAL_WORDS = ["song", "poem"]
+
+# Reduce score for non-language learning content
+NON_LANGUAGE_PHRASES = ["joke", "weather", "time", "pizza", "order"]
+
+# Texts scored together by analyze_language_confidence_batch
+DEFAULT_BATCH_SIZE = 1000
+
+
+def load_language_tables(path: str = DEFAULT_TABLES_PATH) -> Dict[str, Dict]:
+    """
+    Loads the phrase, keyword and language tables from a JSON data file.
+
+    Args:
+        path (str): Path to a JSON file with "common_phrases",
+            "language_keywords" and "common_languages" objects
+
+    Returns:
+        Dict of the three tables, in file order
+    """
+    with open(path, encoding="utf-8") as f:
+        tables = json.load(f)
+    return {
+        "common_phrases": tables["common_phrases"],
+        "language_keywords": tables["language_keywords"],
+        "common_languages": tables["common_languages"],
+    }
+
+
+class PhraseMatcher:
+    """
+    Finds every phrase of a fixed set that occurs as a substring of a text.
+
+    The phrase set is deduplicated once, so each phrase is searched for exactly
+    once per call. CPython's substring search beat a combined lookahead regex
+    (plain and trie-shaped) on short requests and long pages alike, so it is
+    used directly.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = tuple(dict.fromkeys(phrases))
+
+    def find_all(self, text: str) -> Set[str]:
+        """Returns the set of phrases that occur in text."""
+        return {phrase for phrase in self.phrases if phrase in text}
+
+
+class LanguageTables:
+    """The keyword tables plus every matcher built from them, compiled once."""
+
+    def __init__(self, tables: Dict[str, Dict]):
+        self.common_phrases: Dict[str, str] = tables["common_phrases"]
+        self.language_keywords: Dict = tables["language_keywords"]
+        self.common_languages: Dict[str, str] = tables["common_languages"]
+        self.phrase_matcher = PhraseMatcher(
+            list(self.common_phrases)
+            + list(self.language_keywords)
+            + list(self.common_languages)
+            + QUESTION_PHRASES
+            + QUESTION_CONTEXT_WORDS
+            + BOOST_WORDS
+            + CULTURAL_WORDS
+            + NON_LANGUAGE_PHRASES
+        )
+        self.cultural_regex = re.compile("|".join(CULTURAL_PATTERNS))
+        self.question_regex = re.compile("|".join(QUESTION_PATTERNS))
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TABLES_PATH) -> "LanguageTables":
+        return cls(load_language_tables(path))
+
+
+_TABLES = LanguageTables.from_file()
+
+
+def analyze_language_confidence(
+    text: str,
+    tables: Optional[LanguageTables] = None,
+    detector: Optional[LanguageDetector] = None,
+) -> Dict:
     """
     Analyzes the input text to determine if it's a language learning request
     and calculates confidence score.
 
     Args:
         text: Input text to analyze
+        tables: Compiled keyword tables (defaults to the bundled data file)
+        detector: Language detection backend (defaults to the shared NgramDetector)
 
     Returns:
         Dict containing analysis results
     """
-    try:
-        # Common greetings and phrases in different languages
-        common_phrases = {
-            "guten tag": "de",
-            "guten morgen": "de",
-            "wie geht": "de",
-            "buenos días": "es",
-            "cómo estás": "es",
-            "bonjour": "fr",
-            "comment allez": "fr",
-            "ciao": "it",
-            "come stai": "it",
-        }
+    with stage("validation"):
+        return _analyze(
+            text,
+            tables or _TABLES,
+            lambda text: (detector or get_default_detector()).detect(text),
+        )
 
-        # Language learning keywords with weights
-        language_keywords = {
-            "translate": 0.4,
-            "meaning": 0.4,
-            "say": 0.3,
-            "speak": 0.3,
-            "learn": 0.3,
-            "word": 0.3,
-            "phrase": 0.3,
-            "language": 0.3,
-            "vocabulary": 0.4,
-            "grammar": 0.4,
-            "pronunciation": 0.4,
-            "deutsch": 0.4,
-            "español": 0.4,
-            "français": 0.4,
-            "italiano": 0.4,
-            "bedeutet": 0.4,  # German for "means"
-            "dice": 0.3,  # Spanish for "say"
-            "parle": 0.3,  # French for "speak"
-            "song": 0.3,
-            "poem": 0.3,
-            "music": 0.3,
-            "lyrics": 0.3,
-            "find": 0.2,  # Common with song/poem requests
-            "german": 0.3,
-            "deutsche": "de",
-            "auf deutsch": "de",
-            "spanish": 0.3,
-            "en español": "es",
-            "french": 0.3,
-            "francais": "fr",
-            "english": "en",
-            "englisch": "en",
-            "inglés": "en",
-            "italienne": "it",
-        }
 
+async def analyze_language_confidence_async(text: str) -> Dict:
+    """
+    analyze_language_confidence with the bundled tables and default detector,
+    run in a worker process when a process pool is configured (see
+    configure_process_pool) so detection does not hold the event loop.
+    Texts shorter than MIN_OFFLOAD_SIZE are analyzed in the calling thread.
+    """
+    if get_process_pool() is None or len(text) < MIN_OFFLOAD_SIZE:
+        # Records its own "validation" stage
+        return analyze_language_confidence(text)
+    with stage("validation"):
+        return await offload_async(analyze_language_confidence, text, size=len(text))
+
+
+def analyze_language_confidence_batch(
+    texts: Iterable[str],
+    tables: Optional[LanguageTables] = None,
+    detector: Optional[LanguageDetector] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Dict]:
+    """
+    Analyzes many texts, yielding the same dicts analyze_language_confidence would.
+
+    Texts are consumed lazily in batches of batch_size. Within a batch, texts
+    that need language detection are deduplicated and handed to the detector
+    in one detect_many call, so memory stays flat for any input size.
+
+    Args:
+        texts: Iterable of texts to analyze
+        tables: Compiled keyword tables (defaults to the bundled data file)
+        detector: Language detection backend (defaults to the shared NgramDetector)
+        batch_size: Number of texts scored together
+
+    Yields:
+        Dict containing analysis results, in input order
+    """
+    tables = tables or _TABLES
+    iterator = iter(texts)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield from _analyze_batch(batch, tables, detector)
+
+
+def analyze_jsonl(
+    input_file: IO[str],
+    output_file: IO[str],
+    text_field: str = "text",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Streams JSONL records through analyze_language_confidence_batch.
+
+    Each input line is a JSON object holding the text under text_field (or a
+    bare JSON string). Each output line is the input object with the analysis
+    added under "validation".
+
+    Returns:
+        int: Number of records written
+    """
+    records = (json.loads(line) for line in input_file if line.strip())
+    records, texts = itertools.tee(records)
+    texts = (
+        record.get(text_field, "") if isinstance(record, dict) else record
+        for record in texts
+    )
+
+    count = 0
+    results = analyze_language_confidence_batch(texts, batch_size=batch_size)
+    for record, result in zip(records, results):
+        if not isinstance(record, dict):
+            record = {text_field: record}
+        record["validation"] = result
+        output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def _analyze_batch(
+    texts: List[str], tables: LanguageTables, detector: Optional[LanguageDetector]
+) -> Iterator[Dict]:
+    matches = []
+    pending: Dict[str, None] = {}
+    for text in texts:
+        try:
+            matched = tables.phrase_matcher.find_all(text.lower())
+        except Exception:
+            # Let _analyze produce the usual error result
+            matched = None
+        matches.append(matched)
+        if matched is not None and _needs_detection(
+            text, _names_language(matched, tables)
+        ):
+            pending[text] = None
+
+    detections = {}
+    if pending:
+        detector = detector or get_default_detector()
+        detections = dict(zip(pending, detector.detect_many(list(pending))))
+
+    def detect(text: str) -> List[DetectedLanguage]:
+        detected = detections[text]
+        if isinstance(detected, Exception):
+            raise detected
+        return detected
+
+    for text, matched in zip(texts, matches):
+        yield _analyze(text, tables, detect, matched)
+
+
+def _names_language(matched: Set[str], tables: LanguageTables) -> bool:
+    return any(lang in matched for lang in tables.common_languages)
+
+
+def _needs_detection(text: str, names_language: bool) -> bool:
+    # Ignore very short texts, and texts that already name a language
+    return len(text.strip()) > 3 and not names_language
+
+
+def _analyze(
+    text: str,
+    tables: LanguageTables,
+    detect: Callable[[str], List[DetectedLanguage]],
+    matched: Optional[Set[str]] = None,
+) -> Dict:
+    try:
         text_lower = text.lower()
 
+        # Every phrase, keyword and language name that occurs in the text
+        if matched is None:
+            matched = tables.phrase_matcher.find_all(text_lower)
+
         # Initialize confidence components
         keyword_score = 0.0
         question_score = 0.0
         language_score = 0.0
 
         # Check for common phrases
-        for phrase, lang in common_phrases.items():
-            if phrase in text_lower:
-                language_score = max(language_score, 0.3)
+        if any(phrase in matched for phrase in tables.common_phrases):
+            language_score = max(language_score, 0.3)
 
         # Check for language learning keywords with weights
-        for keyword, weight in language_keywords.items():
-            if keyword in text_lower:
-                keyword_score += weight
+        matched_keywords = [k for k in tables.language_keywords if k in matched]
+        for keyword in matched_keywords:
+            keyword_score += tables.language_keywords[keyword]
         keyword_score = min(0.4, keyword_score)  # Cap at 0.4
 
-        # Cultural content patterns (songs, poems)
-        cultural_patterns = [
-            r"find .*(song|poem|music)",
-            r"(song|poem|music) .*(in|about)",
-            r"teach me .*(song|poem)",
-            r"learn .*(song|poem)",
-        ]
-
-        if any(re.search(pattern, text_lower) for pattern in cultural_patterns):
+        if tables.cultural_regex.search(text_lower):
             keyword_score = max(keyword_score, 0.3)
             question_score = 0.3
 
-        # Enhanced question detection for language learning
-        question_patterns = [
-            r"how.+say",
-            r"what.+mean",
-            r"translate",
-            r"bedeutet",  # German
-            r"¿cómo se dice",  # Spanish
-            r"comment dit-on",  # French
-            r"was heißt",  # German
-        ]
-
-        is_question = "?" in text or any(
-            re.search(pattern, text_lower) for pattern in question_patterns
+        is_question = (
+            "?" in text
+            or any(phrase in matched for phrase in QUESTION_PHRASES)
+            or bool(tables.question_regex.search(text_lower))
         )
 
         if is_question:
             # Add question score if it seems language-related
             if keyword_score > 0 or any(
-                word in text_lower for word in ["in", "to", "from", "auf", "en", "auf"]
+                word in matched for word in QUESTION_CONTEXT_WORDS
             ):
                 question_score = 0.3
 
         # Detect mentioned languages with common variations
-        common_languages = {
-            "german": "de",
-            "deutsch": "de",
-            "deutsche": "de",
-            "auf deutsch": "de",
-            "spanish": "es",
-            "español": "es",
-            "espanol": "es",
-            "en español": "es",
-            "french": "fr",
-            "français": "fr",
-            "francais": "fr",
-            "en français": "fr",
-            "english": "en",
-            "englisch": "en",
-            "inglés": "en",
-            "italian": "it",
-            "italiano": "it",
-            "italienne": "it",
-        }
-
         mentioned_languages = []
-        for lang, code in common_languages.items():
-            if lang in text_lower:
+        for lang, code in tables.common_languages.items():
+            if lang in matched:
                 mentioned_languages.append(code)
                 language_score = max(language_score, 0.4)
 
-        # Detect foreign language text
+        # Detect foreign language text, unless a language was named explicitly
         try:
-            if len(text.strip()) > 3:  # Ignore very short texts
-                detected_langs = detect_langs(text)
+            if _needs_detection(text, bool(mentioned_languages)):
+                detected_langs = detect(text)
                 foreign_langs = [
                     lang
                     for lang in detected_langs
@@ -167,11 +335,11 @@ def analyze_language_confidence(text: str) -> Dict:
 
         # Boost score for clear language learning patterns
         if (
-            ("how" in text_lower and "say" in text_lower)
-            or ("what" in text_lower and "mean" in text_lower)
-            or ("translate" in text_lower)
-            or ("bedeutet" in text_lower)
-            or ("¿cómo se dice" in text_lower)
+            ("how" in matched and "say" in matched)
+            or ("what" in matched and "mean" in matched)
+            or ("translate" in matched)
+            or ("bedeutet" in matched)
+            or ("¿cómo se dice" in matched)
         ):
             keyword_score = max(keyword_score, 0.4)
             question_score = 0.3
@@ -191,22 +359,16 @@ def analyze_language_confidence(text: str) -> Dict:
         ):  # Single word without question mark
             confidence_score = min(confidence_score, 0.3)
 
-        # Reduce score for non-language learning content
-        non_language_patterns = [
-            r"joke",
-            r"weather",
-            r"time",
-            r"pizza",
-            r"order",
-        ]
-        if any(re.search(pattern, text_lower) for pattern in non_language_patterns):
+        if any(phrase in matched for phrase in NON_LANGUAGE_PHRASES):
             confidence_score = min(confidence_score, 0.3)
 
         # Round the confidence score
         confidence_score = round(min(1.0, confidence_score), 2)
 
+        is_cultural_request = any(word in matched for word in CULTURAL_WORDS)
+
         # If it's a cultural request (song/poem) with a language, boost the score
-        if ("song" in text_lower or "poem" in text_lower) and mentioned_languages:
+        if is_cultural_request and mentioned_languages:
             confidence_score = max(confidence_score, 0.8)
 
         return {
@@ -215,12 +377,12 @@ def analyze_language_confidence(text: str) -> Dict:
             "detected_languages": list(set(mentioned_languages)),
             "analysis": {
                 "has_question": is_question,
-                "keyword_matches": sum(1 for k in language_keywords if k in text_lower),
+                "keyword_matches": len(matched_keywords),
                 "foreign_text_detected": bool(mentioned_languages),
                 "keyword_score": round(keyword_score, 2),
                 "question_score": round(question_score, 2),
                 "language_score": round(language_score, 2),
-                "is_cultural_request": "song" in text_lower or "poem" in text_lower,
+                "is_cultural_request": is_cultural_request,
             },
         }
 
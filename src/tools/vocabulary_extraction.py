@@ -0,0 +1,173 @@
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import heapq
+import json
+import os
+import re
+
+DEFAULT_WORD_TABLES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "word_tables.json"
+)
+
+# Words extracted per text
+DEFAULT_TOP_K = 10
+# Shortest word worth a translation call
+MIN_WORD_LENGTH = 2
+# Score weight of the most frequent listed word; rarer listed words scale up to 1
+MIN_FREQUENT_WEIGHT = 0.25
+
+# Labels web_search puts in front of each result field
+_FIELD_LABELS = frozenset(["title:", "content:", "url:", "href:", "link:", "body:"])
+# Hyphenated compounds stay whole, apostrophes split elisions like l'amour
+_WORD = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)*")
+_WHITESPACE = " \n\t\r"
+
+
+def load_word_tables(path: str = DEFAULT_WORD_TABLES_PATH) -> Dict:
+    """
+    Loads the junk, stopword and frequency tables from a JSON data file.
+
+    Args:
+        path (str): Path to a JSON file with a "junk" list and "stopwords"
+            and "frequent" lists per language code, frequent words ranked
+            most frequent first
+
+    Returns:
+        Dict of the three tables
+    """
+    with open(path, encoding="utf-8") as f:
+        tables = json.load(f)
+    return {
+        "junk": tables["junk"],
+        "stopwords": tables["stopwords"],
+        "frequent": tables["frequent"],
+    }
+
+
+class VocabularyExtractor:
+    """
+    Picks the words of a text most worth learning.
+
+    Words are counted in one streaming pass, skipping links, web_search field
+    labels, junk and stopwords. Each word scores its count, scaled down if it
+    is one of the language's most frequent words, and the top k are selected
+    with a heap. Ties go to longer words, then to earlier ones.
+    """
+
+    def __init__(self, tables: Dict):
+        self.junk: FrozenSet[str] = frozenset(tables["junk"])
+        self.stopwords: Dict[str, FrozenSet[str]] = {
+            language: frozenset(words) for language, words in tables["stopwords"].items()
+        }
+        self.frequent_weights: Dict[str, Dict[str, float]] = {
+            language: {
+                word: MIN_FREQUENT_WEIGHT
+                + (1 - MIN_FREQUENT_WEIGHT) * rank / len(words)
+                for rank, word in enumerate(words)
+            }
+            for language, words in tables["frequent"].items()
+        }
+        self._filters: Dict[
+            Optional[Tuple[str, ...]], Tuple[FrozenSet[str], Dict[str, float]]
+        ] = {}
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_WORD_TABLES_PATH) -> "VocabularyExtractor":
+        return cls(load_word_tables(path))
+
+    def extract(
+        self,
+        text: Union[str, Iterable[str]],
+        languages: Optional[Sequence[str]] = None,
+        k: int = DEFAULT_TOP_K,
+    ) -> List[str]:
+        """
+        Extracts the top k vocabulary words of a text.
+
+        Args:
+            text: Text to analyze, or an iterable of chunks of one long text
+            languages: Language codes whose stopwords apply (all known if None)
+            k: Maximum number of words returned
+
+        Returns:
+            Lowercase words, best first
+        """
+        skip, weights = self._filter_for(languages)
+
+        # Splitting and counting whitespace tokens runs in C; only the distinct
+        # tokens are cleaned up in Python
+        tokens: Counter = Counter()
+        for chunk in _iter_chunks(text):
+            tokens.update(chunk.lower().split())
+
+        counts: Dict[str, int] = {}
+        for token, count in tokens.items():
+            if token in _FIELD_LABELS or "://" in token or token.startswith("www."):
+                continue
+            for word in _WORD.findall(token):
+                if len(word) >= MIN_WORD_LENGTH and word not in skip:
+                    counts[word] = counts.get(word, 0) + count
+
+        best = heapq.nlargest(
+            k,
+            enumerate(counts.items()),
+            key=lambda item: (
+                item[1][1] * weights.get(item[1][0], 1.0),
+                len(item[1][0]),
+                -item[0],
+            ),
+        )
+        return [word for _, (word, _) in best]
+
+    def _filter_for(
+        self, languages: Optional[Sequence[str]]
+    ) -> Tuple[FrozenSet[str], Dict[str, float]]:
+        """Returns the skip set and frequency weights for languages, built once."""
+        key = tuple(languages) if languages is not None else None
+        cached = self._filters.get(key)
+        if cached is None:
+            selected = list(self.stopwords) if key is None else key
+            skip = self.junk.union(
+                *(self.stopwords.get(language, ()) for language in selected)
+            )
+            weights: Dict[str, float] = {}
+            for language in selected:
+                for word, weight in self.frequent_weights.get(language, {}).items():
+                    weights[word] = min(weight, weights.get(word, 1.0))
+            cached = self._filters[key] = (skip, weights)
+        return cached
+
+
+def _iter_chunks(text: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yields a text, or a stream of chunks re-cut so no token spans two pieces."""
+    if isinstance(text, str):
+        yield text
+        return
+
+    # Hold back everything after the last whitespace, since a word or link
+    # may continue in the next chunk
+    carry = ""
+    for chunk in text:
+        buffer = carry + chunk
+        cut = max(buffer.rfind(space) for space in _WHITESPACE) + 1
+        carry = buffer[cut:]
+        if cut:
+            yield buffer[:cut]
+    if carry:
+        yield carry
+
+
+_EXTRACTOR = VocabularyExtractor.from_file()
+
+
+def extract_key_vocabulary(
+    text: Union[str, Iterable[str]],
+    languages: Optional[Sequence[str]] = None,
+    k: int = DEFAULT_TOP_K,
+) -> List[str]:
+    """
+    Extracts the top k vocabulary words of a text with the bundled word tables.
+
+    See VocabularyExtractor.extract for the arguments.
+    """
+    return _EXTRACTOR.extract(text, languages, k)
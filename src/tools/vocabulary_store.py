@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, List, NamedTuple, Optional
+from .metrics import record_cache, stage
+
+DEFAULT_PACKS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "vocabulary_packs.json"
+)
+DEFAULT_INDEX_PATH = os.path.join("cache", "vocabulary.sqlite3")
+
+# Words per lesson, matching what ContentCreator extracts from free text
+DEFAULT_PACK_SIZE = 10
+
+# Topic words that say nothing about the topic itself
+_GENERIC_TOPIC_WORDS = set(
+    "a an and for in of on or the to with me my some please list "
+    "vocab vocabulary word words".split()
+)
+_TOPIC_TOKENS = re.compile(r"[^\W\d_]+")
+
+
+class VocabularyPack(NamedTuple):
+    """The words of one (language, topic) pack with their glosses."""
+
+    language: str
+    topic: str
+    entries: Dict[str, str]
+    gloss_language: str
+
+
+def topic_tokens(topic: str) -> List[str]:
+    """Splits a free-text topic into the lowercase words used for matching."""
+    return [
+        token
+        for token in _TOPIC_TOKENS.findall(topic.lower())
+        if token not in _GENERIC_TOPIC_WORDS
+    ]
+
+
+class VocabularyStore:
+    """
+    Offline vocabulary packs indexed by (language, topic).
+
+    Packs are bundled as JSON (data/vocabulary_packs.json) and compiled into a
+    local SQLite file: entries are stored clustered on (language, topic), and
+    topic names and aliases go into an FTS5 table so "colours", "farm animals"
+    or "parts of the body" find the right pack. The index is rebuilt whenever
+    the packs file changes.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        packs_path: str = DEFAULT_PACKS_PATH,
+        busy_timeout: float = 30.0,
+    ):
+        self.path = path
+        self.packs_path = packs_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Autocommit mode, so _build controls its transaction with BEGIN/COMMIT
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+        with open(packs_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if self._packs_digest() != digest:
+            self._build(json.loads(raw.decode("utf-8")), digest)
+
+        self.gloss_language = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'gloss_language'"
+        ).fetchone()[0]
+
+    def find_topic(self, language: str, topic: str) -> Optional[str]:
+        """
+        Returns the pack topic that best matches a free-text topic, or None.
+
+        The pack must match more than half of the topic's words.
+
+        Args:
+            language (str): Language code of the pack (e.g., 'de')
+            topic (str): Topic as the student phrased it
+        """
+        tokens = list(dict.fromkeys(topic_tokens(topic)))
+        if not tokens:
+            return None
+        query = " OR ".join(f'"{token}"' for token in tokens)
+        with self._lock:
+            ranked = [
+                matched
+                for (matched,) in self._conn.execute(
+                    "SELECT topic FROM topics WHERE topics MATCH ? AND language = ? "
+                    "ORDER BY rank",
+                    (query, language),
+                )
+            ]
+            matches = dict.fromkeys(ranked, 0)
+            for token in tokens:
+                for (matched,) in self._conn.execute(
+                    "SELECT topic FROM topics WHERE topics MATCH ? AND language = ?",
+                    (f'"{token}"', language),
+                ):
+                    matches[matched] += 1
+        if not ranked:
+            return None
+        # Most matched tokens first, then FTS rank. A topic sharing a single
+        # word such as "common" with a longer request is not a match.
+        best = max(ranked, key=lambda matched: matches[matched])
+        return best if matches[best] * 2 > len(tokens) else None
+
+    def lookup(
+        self, language: str, topic: str, limit: int = DEFAULT_PACK_SIZE
+    ) -> Optional[VocabularyPack]:
+        """
+        Finds the vocabulary pack for a language and free-text topic.
+
+        Args:
+            language (str): Language code of the pack (e.g., 'de')
+            topic (str): Topic as the student phrased it
+            limit (int): Maximum number of words returned
+
+        Returns:
+            The matching VocabularyPack, or None when no pack covers the topic
+        """
+        with stage("vocabulary_lookup"):
+            matched_topic = self.find_topic(language, topic)
+            if matched_topic is None:
+                with self._lock:
+                    self.misses += 1
+                record_cache("vocabulary_pack", misses=1)
+                return None
+
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT word, translation FROM entries "
+                    "WHERE language = ? AND topic = ? ORDER BY position LIMIT ?",
+                    (language, matched_topic, limit),
+                ).fetchall()
+                self.hits += 1
+            record_cache("vocabulary_pack", hits=1)
+            return VocabularyPack(
+                language, matched_topic, dict(rows), self.gloss_language
+            )
+
+    def topics(self, language: str) -> List[str]:
+        """Returns the topics available for a language."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT topic FROM entries WHERE language = ? ORDER BY topic",
+                (language,),
+            ).fetchall()
+        return [topic for (topic,) in rows]
+
+    def stats(self) -> Dict:
+        """Returns hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _packs_digest(self) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'packs_digest'"
+        ).fetchone()
+        return row[0] if row else None
+
+    def _build(self, packs: Dict, digest: str) -> None:
+        """
+        Recreates the index from the parsed packs file in one transaction.
+
+        Workers sharing the index file take the write lock in turn; each one
+        checks the digest again once it holds the lock, so only the first
+        rebuilds and the others see the finished index.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._packs_digest() != digest:
+                    self._rebuild(packs, digest)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _rebuild(self, packs: Dict, digest: str) -> None:
+        self._conn.execute("DROP TABLE IF EXISTS entries")
+        self._conn.execute("DROP TABLE IF EXISTS topics")
+        self._conn.execute(
+            """
+            CREATE TABLE entries (
+                language TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                word TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                PRIMARY KEY (language, topic, position)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE topics USING fts5("
+            "language UNINDEXED, topic UNINDEXED, keywords, "
+            "tokenize = 'porter unicode61')"
+        )
+
+        aliases = packs.get("topics", {})
+        for language, topics in packs["packs"].items():
+            for topic, words in topics.items():
+                self._conn.executemany(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (language, topic, position, word, translation)
+                        for position, (word, translation) in enumerate(words.items())
+                    ],
+                )
+                self._conn.execute(
+                    "INSERT INTO topics VALUES (?, ?, ?)",
+                    (language, topic, " ".join([topic, *aliases.get(topic, [])])),
+                )
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [
+                ("packs_digest", digest),
+                ("gloss_language", packs.get("gloss_language", "en")),
+            ],
+        )
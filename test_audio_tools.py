@@ -0,0 +1,100 @@
+import os
+
+from fakes import (
+    MP3_FRAME_BYTES,
+    SILENCE_BITS,
+    SPEECH_BITS,
+    fake_speech,
+    install_fake_backends,
+    make_mp3,
+)
+from src.tools.audio_tools import batch_words, generate_audio, generate_audio_batch
+from src.tools.mp3 import iter_frames, split_at_silences
+
+
+def test_identical_text_is_served_from_cache(monkeypatch, tmp_path):
+    backends = install_fake_backends(monkeypatch)
+    output_dir = str(tmp_path / "audio")
+
+    first = generate_audio("Herz", "de", output_dir=output_dir)
+    second = generate_audio(" herz ", "German", output_dir=output_dir)
+    other_language = generate_audio("herz", "es", output_dir=output_dir)
+
+    assert first == second
+    assert other_language != first
+    assert backends.calls["tts"] == 2
+    assert sorted(os.listdir(output_dir)) == sorted(
+        os.path.basename(path) for path in (first, other_language)
+    )
+
+
+def test_cache_size_cap_evicts_least_recently_used(monkeypatch, tmp_path):
+    install_fake_backends(monkeypatch)
+    output_dir = str(tmp_path / "audio")
+    # Room for two of the equally long fake clips
+    cap = 2 * len(fake_speech("eins"))
+
+    eins = generate_audio("eins", "de", output_dir=output_dir, max_cache_bytes=cap)
+    zwei = generate_audio("zwei", "de", output_dir=output_dir, max_cache_bytes=cap)
+    os.utime(zwei, (1, 1))
+    os.utime(eins, (2, 2))
+    drei = generate_audio("drei", "de", output_dir=output_dir, max_cache_bytes=cap)
+
+    assert os.path.exists(eins)
+    assert os.path.exists(drei)
+    assert not os.path.exists(zwei)
+
+
+def test_batch_is_one_request_cut_into_playable_clips(monkeypatch, tmp_path):
+    backends = install_fake_backends(monkeypatch)
+    output_dir = str(tmp_path / "audio")
+    words = ["rot", "blau", "grün", "gelb"]
+
+    paths = generate_audio_batch(words, "de", output_dir=output_dir)
+
+    assert list(paths) == words
+    assert backends.calls["tts"] == 1
+    for word in words:
+        with open(paths[word], "rb") as f:
+            clip = f.read()
+        # Every clip is whole frames holding exactly one spoken word
+        frames = list(iter_frames(clip))
+        assert sum(frame.length for frame in frames) == len(clip)
+        assert split_at_silences(clip, 2) is None
+    # Later single-word requests are served from the same cache
+    assert generate_audio("blau", "de", output_dir=output_dir) == paths["blau"]
+    assert backends.calls["tts"] == 1
+
+
+def test_unsplittable_batch_falls_back_to_single_words(monkeypatch, tmp_path):
+    backends = install_fake_backends(monkeypatch)
+    backends.tts_pauses = False
+    output_dir = str(tmp_path / "audio")
+
+    paths = generate_audio_batch(["rot", "blau", "grün"], "de", output_dir=output_dir)
+
+    assert all(path.endswith(".mp3") for path in paths.values())
+    assert backends.calls["tts"] == 4
+
+
+def test_split_uses_the_longest_pauses():
+    speech, pause, dip = (SPEECH_BITS, 8), (SILENCE_BITS, 12), (SILENCE_BITS, 5)
+    silence = (SILENCE_BITS, 3)
+    stream = make_mp3([silence, speech, dip, speech, pause, speech, silence])
+
+    first, second = split_at_silences(stream, 2)
+
+    assert len(first) == MP3_FRAME_BYTES * (3 + 8 + 5 + 8 + 6)
+    assert len(second) == MP3_FRAME_BYTES * (6 + 8 + 3)
+    assert split_at_silences(stream, 4) is None
+    assert split_at_silences(b"not an mp3", 2) is None
+
+
+def test_batches_respect_the_request_size():
+    words = [f"wort{i}" for i in range(20)]
+
+    batches = batch_words(words + ["Wie geht's?"], max_chars=40)
+
+    assert [word for batch in batches for word in batch] == words + ["Wie geht's?"]
+    assert all(len(". ".join(batch)) <= 40 for batch in batches)
+    assert batches[-1] == ["Wie geht's?"]
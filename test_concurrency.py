@@ -0,0 +1,249 @@
+import asyncio
+import time
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools import warmup
+from src.tools.content_tools import generate_practice_lessons
+
+
+def _run_requests(assistant, requests):
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(assistant.process_request(request) for request in requests)
+        )
+        return results, time.perf_counter() - start
+
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_do_not_block_event_loop(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch, latency=0.05)
+    # Distinct requests and no response cache, so every request reaches the
+    # blocking tools instead of sharing one pipeline or cached response
+    assistant = LanguageLearningAssistant(use_response_cache=False)
+    requests = [
+        f"How do you pronounce 'guten Morgen Nummer {i}' in German?" for i in range(9)
+    ]
+
+    results, single_time = _run_requests(assistant, requests[:1])
+    assert results[0]["status"] == "success"
+
+    results, concurrent_time = _run_requests(assistant, requests[1:])
+
+    assert all(result["status"] == "success" for result in results)
+    # Serial execution would take roughly 8 * single_time
+    assert concurrent_time < single_time * 2
+
+
+def test_event_loop_stays_responsive_during_slow_song_request(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch, latency=0.05)
+    assistant = LanguageLearningAssistant()
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        result = await assistant.process_request("Find me a German song about love")
+        elapsed = time.perf_counter() - start
+        ticker_task.cancel()
+        return result, elapsed, ticks
+
+    result, elapsed, ticks = asyncio.run(run())
+    assert result["status"] == "success"
+    # A blocked loop would barely tick while the fake backends sleep
+    assert ticks >= (elapsed / 0.01) * 0.5
+
+
+def test_vocabulary_audio_is_generated_concurrently(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch, latency=0.05)
+    assistant = LanguageLearningAssistant(audio_concurrency=4, batch_audio=False)
+    words = [f"wort{i}" for i in range(8)]
+
+    async def run():
+        start = time.perf_counter()
+        audio = await assistant._generate_vocabulary_audio(words, "de")
+        return audio, time.perf_counter() - start
+
+    audio, elapsed = asyncio.run(run())
+
+    assert list(audio) == words
+    assert all(path.endswith(".mp3") for path in audio.values())
+    assert backends.calls["tts"] == len(words)
+    # Two waves of four instead of eight sequential calls
+    assert elapsed < 0.05 * len(words) * 0.6
+
+
+def test_vocabulary_audio_keeps_per_word_errors(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch)
+    from src.tools import audio_tools
+
+    real_tts = audio_tools.gTTS
+
+    def flaky_tts(text, lang="en", **kwargs):
+        if text == "herz":
+            raise RuntimeError("tts unavailable")
+        return real_tts(text, lang=lang, **kwargs)
+
+    monkeypatch.setattr(audio_tools, "gTTS", flaky_tts)
+    assistant = LanguageLearningAssistant(batch_audio=False)
+
+    audio = asyncio.run(assistant._generate_vocabulary_audio(["liebe", "herz"], "de"))
+
+    assert audio["liebe"].endswith(".mp3")
+    assert audio["herz"] == "Error generating audio: tts unavailable"
+
+
+def test_process_requests_coalesces_duplicates(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch, latency=0.02)
+    assistant = LanguageLearningAssistant()
+    requests = ["Find me a German song about love"] * 20 + [
+        "find me a  german SONG about love"
+    ] * 10
+
+    results = asyncio.run(assistant.process_requests(requests, concurrency=4))
+
+    assert len(results) == 30
+    assert all(result == results[0] for result in results)
+    assert results[0]["status"] == "success"
+    assert results[0] is not results[1]
+    # web_search and the lyrics lookup each search once
+    assert backends.calls["ddgs.text"] == 2
+    assert backends.calls["ddgs.videos"] == 1
+    assert backends.calls["http.get"] == 1
+    assert backends.calls["translate"] == 1
+
+
+def test_concurrent_process_request_calls_share_one_pipeline(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch, latency=0.02)
+    assistant = LanguageLearningAssistant()
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                assistant.process_request("How do you pronounce 'Herz' in German?")
+                for _ in range(10)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert all(result == results[0] for result in results)
+    assert backends.calls["translate"] == 1
+    assert backends.calls["tts"] == 1
+
+
+def test_quoted_text_keeps_its_case_in_request_key():
+    key = LanguageLearningAssistant.request_key
+
+    assert key("How do you say 'Herz'  in GERMAN?") == key("how do you say 'Herz' in german?")
+    assert key("How do you say 'Herz' in German?") != key("How do you say 'herz' in German?")
+    assert key("Find me a German song", "en") != key("Find me a German song", "es")
+
+
+def test_requests_with_one_key_have_one_intent():
+    key = LanguageLearningAssistant.request_key
+    intent = LanguageLearningAssistant.request_intent
+    same = [
+        "Find me a German  SONG",
+        "find me a german song",
+        "Say 'Guten  Morgen' in German",
+        "say 'Guten Morgen'   in german",
+    ]
+
+    for first, second in (same[:2], same[2:]):
+        assert key(first) == key(second)
+        assert intent(first, "de") == intent(second, "de")
+
+
+def test_unquoted_text_to_translate_keeps_its_case():
+    key = LanguageLearningAssistant.request_key
+    intent = LanguageLearningAssistant.request_intent
+    request = "How do you say  Guten Morgen, Herr Müller in English?"
+
+    assert intent(request, "de").subject == (
+        "How do you say Guten Morgen, Herr Müller in English?"
+    )
+    # A different subject, so a different pipeline
+    assert key(request) != key(request.lower())
+
+
+def test_injected_failures_are_seeded_and_reach_the_caller(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(
+        monkeypatch, failure_rates={"tts": 1.0}, latencies={"translate": 0.01}
+    )
+    assistant = LanguageLearningAssistant()
+
+    result = asyncio.run(
+        assistant.process_request("How do you pronounce 'guten Morgen' in German?")
+    )
+
+    assert result["status"] == "success"
+    assert "injected tts failure" in result["audio"]
+    assert backends.failures["tts"] == 1
+    assert backends.failures["translate"] == 0
+
+
+def test_vocabulary_audio_is_batched_into_one_request(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch, latency=0.05)
+    assistant = LanguageLearningAssistant()
+    words = [f"wort{i}" for i in range(8)]
+
+    audio = asyncio.run(assistant._generate_vocabulary_audio(words, "de"))
+
+    assert list(audio) == words
+    assert len(set(audio.values())) == len(words)
+    assert backends.calls["tts"] == 1
+
+
+def test_song_takes_its_critical_path_not_the_sum_of_stages(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    latencies = {
+        "ddgs.text": 0.1,
+        "ddgs.videos": 0.4,
+        "http.get": 0.1,
+        "translate": 0.1,
+        "tts": 0.2,
+    }
+    install_fake_backends(monkeypatch, latencies=latencies)
+    import src.language_learning_assistant as assistant_module
+
+    def slow_exercises(words, translations):
+        time.sleep(0.2)
+        return generate_practice_lessons(words, translations)
+
+    monkeypatch.setattr(assistant_module, "generate_practice_lessons", slow_exercises)
+    warmup(translation=False, audio=False)
+    assistant = LanguageLearningAssistant()
+
+    start = time.perf_counter()
+    result = asyncio.run(
+        assistant.process_request("Play me a German song so I can hear the pronunciation")
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result["status"] == "success"
+    assert result["video"]["url"]
+    assert result["exercises"]["matching"]["words"]
+    # search (0.1) -> video (0.4)
+    #              -> lyrics (search + page, 0.2) -> translation (0.1) -> audio (0.2)
+    #                                                                 -> exercises (0.2)
+    critical_path = 0.1 + 0.2 + 0.1 + 0.2
+    sequential = 0.1 + 0.4 + 0.2 + 0.1 + 0.2 + 0.2
+    assert critical_path <= elapsed < critical_path + 0.15 < sequential
@@ -0,0 +1,88 @@
+from fakes import install_fake_backends
+from src.tools.content_tools import ContentCreator
+from src.tools.translation_memory import TranslationMemory
+
+
+def _creator(**kwargs):
+    return ContentCreator(translation_memory=TranslationMemory(":memory:"), **kwargs)
+
+
+def test_batched_translation_uses_single_request(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    content = _creator().create_learning_content(
+        text="ich liebe dich mein herz und die sonne",
+        target_language="de",
+        native_language="en",
+    )
+
+    assert backends.calls["translate"] == 1
+    assert content["translation"] == "[en] ich liebe dich mein herz und die sonne"
+    translations = content["vocabulary"]["translations"]
+    assert set(translations) == set(content["vocabulary"]["words"])
+    assert all(translations[word] == f"[en] {word}" for word in translations)
+
+
+def test_batched_translation_matches_unbatched(monkeypatch):
+    install_fake_backends(monkeypatch)
+    text = "Guten Morgen, wie geht es dir heute.\nIch liebe dich."
+    batched = _creator().create_learning_content(text, "de", "en")
+    unbatched = _creator(batch_translation=False).create_learning_content(
+        text, "de", "en"
+    )
+
+    assert batched == unbatched
+
+
+def test_batched_translation_isolates_word_errors(monkeypatch):
+    backends = install_fake_backends(monkeypatch, untranslatable={"herz"})
+    content = _creator().create_learning_content(
+        text="ich liebe dich mein herz", target_language="de", native_language="en"
+    )
+
+    translations = content["vocabulary"]["translations"]
+    assert translations["herz"] == "[Translation error for: herz]"
+    assert translations["liebe"] == "[en] liebe"
+    assert content["translation"] == "[en] ich liebe dich mein herz"
+    # One failed batch, then one retry per item
+    assert backends.calls["translate"] == 1 + 1 + len(translations)
+
+
+def test_translation_memory_skips_cached_vocabulary(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    memory = TranslationMemory(":memory:")
+    creator = ContentCreator(translation_memory=memory)
+
+    first = creator.create_learning_content("ich liebe dich mein herz", "de", "en")
+    second = creator.create_learning_content("mein herz liebe", "de", "en")
+
+    assert first["vocabulary"]["translations"]["herz"] == "[en] herz"
+    assert second["vocabulary"]["translations"]["herz"] == "[en] herz"
+    # The second text only needs its full translation from the network
+    assert backends.calls["translate"] == 2
+    # "mein" is a stopword, so only "herz" and "liebe" are looked up
+    assert memory.stats()["hits"] == 2
+
+
+def test_translation_memory_does_not_store_errors(monkeypatch):
+    install_fake_backends(monkeypatch, untranslatable={"herz"})
+    memory = TranslationMemory(":memory:")
+    ContentCreator(translation_memory=memory).create_learning_content(
+        "ich liebe dich mein herz", "de", "en"
+    )
+
+    assert memory.get("de", "en", "herz") is None
+    assert memory.get("de", "en", "liebe") == "[en] liebe"
+
+
+def test_vocabulary_skips_links_labels_and_stopwords(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    text = (
+        "Title: Liebeslied\nContent: Ich liebe dich, liebe dich, mein Herz\n"
+        "URL: https://example.com/lied?id=1"
+    )
+    content = _creator().create_learning_content(text, "de", "en")
+
+    words = content["vocabulary"]["words"]
+    assert words[0] == "liebe"
+    assert set(words) == {"liebe", "liebeslied", "herz"}
+    assert backends.calls["translate"] == 2
@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import SKIPPED_MESSAGE, LanguageLearningAssistant
+from src.tools.deadline import Deadline, end_deadline, remaining_time, start_deadline
+
+
+def _timed_request(assistant, request, **kwargs):
+    start = time.perf_counter()
+    result = asyncio.run(assistant.process_request(request, **kwargs))
+    return result, time.perf_counter() - start
+
+
+def test_slow_video_is_skipped_and_the_song_still_returns(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch, latencies={"ddgs.videos": 1.0})
+    assistant = LanguageLearningAssistant(request_timeout=0.3)
+
+    result, elapsed = _timed_request(assistant, "Find me a German song about love")
+
+    assert elapsed < 0.9
+    assert result["status"] == "success"
+    assert result["skipped"] == ["video"]
+    assert result["video"] == {"error": SKIPPED_MESSAGE}
+    assert result["content"]["vocabulary"]["words"]
+
+
+def test_vocabulary_audio_keeps_what_finished_in_time(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch, latencies={"tts": 0.15})
+    assistant = LanguageLearningAssistant(audio_concurrency=2, batch_audio=False)
+
+    result, elapsed = _timed_request(
+        assistant,
+        "I want to hear the pronunciation of Spanish words about colors",
+        timeout=0.25,
+    )
+
+    audio = result["vocabulary_audio"]
+    assert elapsed < 0.6
+    assert result["status"] == "success"
+    assert "vocabulary_audio" in result["skipped"]
+    assert sum(path.endswith(".mp3") for path in audio.values()) == 2
+    assert sum(path == SKIPPED_MESSAGE for path in audio.values()) == len(audio) - 2
+
+
+def test_slow_required_stage_times_out_the_request(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch, latencies={"translate": 1.0})
+    assistant = LanguageLearningAssistant()
+
+    result, elapsed = _timed_request(
+        assistant, "How do you say 'guten Morgen' in German?", timeout=0.2
+    )
+
+    assert elapsed < 0.8
+    assert result["status"] == "error"
+    assert result["timed_out"] is True
+    assert result["stage"] == "translation"
+
+
+def test_remaining_time_is_capped_by_the_deadline():
+    assert remaining_time(5.0) == 5.0
+
+    token = start_deadline(Deadline(1.0))
+    try:
+        assert remaining_time() == pytest.approx(1.0, abs=0.05)
+        assert remaining_time(5.0) <= 1.0
+        assert remaining_time(0.5) == 0.5
+    finally:
+        end_deadline(token)
+    assert remaining_time() is None
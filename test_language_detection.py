@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from src.tools.language_detection import DEFAULT_PROFILES_PATH, NgramDetector
+from src.tools.validation_tools import analyze_language_confidence
+
+SAMPLES = [
+    ("Guten Tag, wie geht es dir?", "de"),
+    ("Ich möchte Deutsch lernen", "de"),
+    ("Buenos días, ¿cómo estás?", "es"),
+    ("Quiero aprender español", "es"),
+    ("Bonjour, comment allez-vous?", "fr"),
+    ("Je pense donc je suis", "fr"),
+    ("Ciao, come stai?", "it"),
+    ("Il mare è calmo stasera", "it"),
+    ("Hello, how are you?", "en"),
+    ("Show me some Spanish vocabulary about colors", "en"),
+]
+
+
+@pytest.mark.parametrize("text, expected", SAMPLES)
+def test_ngram_detector_identifies_supported_languages(text, expected):
+    candidates = NgramDetector().detect(text)
+
+    assert candidates[0].lang == expected
+    assert candidates[0].prob > 0.8
+
+
+def test_ngram_detector_is_deterministic_and_restricted():
+    detector = NgramDetector(languages=("de", "fr"))
+
+    results = {tuple(detector.detect("Il mare è calmo stasera")) for _ in range(5)}
+
+    assert len(results) == 1
+    assert {candidate.lang for candidate in results.pop()} <= {"de", "fr"}
+
+
+def test_profiles_only_hold_grams_the_detector_can_produce():
+    with open(DEFAULT_PROFILES_PATH, encoding="utf-8") as f:
+        profiles = json.load(f)
+
+    for profile in profiles.values():
+        assert all(gram == gram.lower() for gram in profile["freq"])
+
+
+def test_ngram_detector_rejects_unknown_language():
+    with pytest.raises(ValueError):
+        NgramDetector(languages=("de", "xx"))
+
+
+def test_detection_is_skipped_when_language_is_named():
+    class CountingDetector:
+        calls = 0
+
+        def detect(self, text):
+            self.calls += 1
+            return []
+
+    detector = CountingDetector()
+    analyze_language_confidence("How do you say 'hello' in German?", detector=detector)
+    analyze_language_confidence("Ich möchte gerne lernen", detector=detector)
+
+    assert detector.calls == 1
@@ -0,0 +1,68 @@
+import json
+import subprocess
+import sys
+
+BACKENDS = ["gtts", "duckduckgo_search", "requests", "bs4", "deep_translator", "langdetect"]
+
+
+def loaded_backends(code: str) -> list:
+    """Runs code in a fresh interpreter and returns the backends it imported."""
+    script = (
+        "import json, sys\n"
+        + code
+        + f"\nprint(json.dumps([m for m in {BACKENDS!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_importing_the_assistant_loads_no_backend():
+    assert loaded_backends("import src.language_learning_assistant") == []
+
+
+def test_translation_only_loads_the_translator():
+    code = (
+        "from src.tools.content_tools import ContentCreator, load_backends\n"
+        "ContentCreator(use_translation_memory=False)\n"
+        "assert 'deep_translator' not in sys.modules\n"
+        "load_backends()\n"
+    )
+
+    loaded = loaded_backends(code)
+
+    assert "deep_translator" in loaded
+    assert not {"gtts", "duckduckgo_search"} & set(loaded)
+
+
+def test_warmup_preloads_every_backend():
+    code = (
+        "from src.tools import warmup\n"
+        "timings = warmup()\n"
+        "assert set(timings) == {'search', 'translation', 'audio', 'detection'}\n"
+    )
+
+    assert set(loaded_backends(code)) == {
+        "gtts",
+        "duckduckgo_search",
+        "requests",
+        "bs4",
+        "deep_translator",
+    }
+
+
+def test_package_exports_import_their_module_on_first_use():
+    code = (
+        "import src.tools\n"
+        "assert 'src.tools.search_tools' not in sys.modules\n"
+        "from src.tools import TTLCache\n"
+        "assert 'src.tools.search_tools' not in sys.modules\n"
+        "import src.tools._warmup\n"
+        "from src.tools import warmup\n"
+        "assert callable(warmup)\n"
+        "from src.tools import *\n"
+        "assert SearchClient is src.tools.search_tools.SearchClient\n"
+    )
+
+    assert loaded_backends(code) == []
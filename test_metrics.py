@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools import metrics
+
+
+@pytest.fixture
+def registry():
+    registry = metrics.enable_metrics()
+    yield registry
+    metrics.disable_metrics()
+
+
+def test_disabled_instrumentation_is_a_shared_noop():
+    metrics.disable_metrics()
+
+    assert metrics.stage("search") is metrics.stage("translation")
+    assert metrics.export_prometheus() == ""
+
+
+def test_song_request_records_stages_backend_calls_and_cache(
+    registry, monkeypatch, tmp_path
+):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch)
+    # The second request exercises the tool caches, not the response cache
+    assistant = LanguageLearningAssistant(use_response_cache=False)
+
+    asyncio.run(assistant.process_request("Find me a German song about love"))
+    asyncio.run(assistant.process_request("Find me a German song about love"))
+
+    snapshot = registry.snapshot()
+    for name in (
+        "request",
+        "validation",
+        "search",
+        "video_search",
+        "lyrics_search",
+        "lyrics_fetch",
+        "lyrics_parse",
+        "vocabulary_extraction",
+        "translation",
+        "exercises",
+    ):
+        assert snapshot["stages"][name]["count"] >= 1, name
+    calls = snapshot["counters"]["backend_calls_total"]
+    assert calls[("ddgs.text",)] == 2
+    assert calls[("http",)] == 2
+    cache = snapshot["counters"]["cache_requests_total"]
+    assert cache[("search", "hit")] == 3
+    assert cache[("translation_memory", "hit")] > 0
+
+
+def test_errors_are_counted_per_stage(registry, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    backends.search_error = "rate limited"
+    assistant = LanguageLearningAssistant()
+
+    asyncio.run(assistant.process_request("Find me a German song about love"))
+
+    errors = registry.snapshot()["counters"]["errors_total"]
+    assert errors[("search",)] == 1
+    assert errors[("request",)] == 1
+    # The failed search ends the request before the video search
+    assert ("video_search",) not in errors
+
+
+def test_prometheus_export_has_cumulative_buckets(registry):
+    registry.observe("tts", 0.003)
+    registry.observe("tts", 0.2)
+    metrics.record_backend_call("tts")
+    metrics.record_cache("audio", hits=2, misses=1)
+
+    text = metrics.export_prometheus()
+
+    assert "# TYPE polyglot_stage_duration_seconds histogram" in text
+    assert 'polyglot_stage_duration_seconds_bucket{stage="tts",le="0.001"} 0' in text
+    assert 'polyglot_stage_duration_seconds_bucket{stage="tts",le="0.005"} 1' in text
+    assert 'polyglot_stage_duration_seconds_bucket{stage="tts",le="+Inf"} 2' in text
+    assert 'polyglot_stage_duration_seconds_count{stage="tts"} 2' in text
+    assert 'polyglot_backend_calls_total{backend="tts"} 1' in text
+    assert 'polyglot_cache_requests_total{cache="audio",result="hit"} 2' in text
+
+
+def test_timing_breakdown_is_added_to_results(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch, latency=0.01)
+    metrics.disable_metrics()
+    assistant = LanguageLearningAssistant(include_timings=True)
+
+    result = asyncio.run(
+        assistant.process_request("How do you pronounce 'guten Morgen' in German?")
+    )
+
+    timings = result["timings"]
+    assert set(timings["stages"]) >= {"validation", "translation", "tts"}
+    assert timings["backend_calls"] == {"translate": 1, "tts": 1}
+    assert timings["cache"]["audio"] == {"hits": 0, "misses": 1}
+    assert timings["stages"]["tts"]["seconds"] >= 0.01
+    assert timings["total_seconds"] >= timings["stages"]["tts"]["seconds"]
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.prewarm import load_state, parse_manifest, prewarm
+from src.tools import metrics
+from src.tools.shared_cache import configure_shared_cache
+
+MANIFEST = [
+    '{"language": "de", "type": "song"}',
+    '{"language": "German", "type": "vocabulary", "topic": "food", "audio": true}',
+    "# the same response as the line above",
+    '{"language": "de", "type": "vocabulary", "topic": "food", "audio": true}',
+]
+
+
+def test_prewarmed_responses_are_served_by_other_workers(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    configure_shared_cache(str(tmp_path / "shared.sqlite3"))
+    summary = asyncio.run(
+        prewarm(parse_manifest(MANIFEST), state_path=str(tmp_path / "state.jsonl"))
+    )
+    assert (summary["items"], summary["warmed"], summary["failed"]) == (2, 2, 0)
+    calls = dict(backends.calls.counts)
+
+    # A worker started after the job, phrasing the requests its own way
+    configure_shared_cache(str(tmp_path / "shared.sqlite3"))
+    registry = metrics.enable_metrics()
+    try:
+        assistant = LanguageLearningAssistant()
+        song = asyncio.run(assistant.process_request("Find me a German song"))
+        words = asyncio.run(
+            assistant.process_request("How do I pronounce German words about food?")
+        )
+        cache = registry.snapshot()["counters"]["cache_requests_total"]
+    finally:
+        metrics.disable_metrics()
+
+    assert song["status"] == words["status"] == "success"
+    assert words["vocabulary_audio"]
+    assert backends.calls.counts == calls
+    assert cache[("response", "hit")] == 2
+
+
+class FlakyAssistant:
+    """Fails poem requests until fixed; counts the requests it runs."""
+
+    def __init__(self):
+        self.fixed = False
+        self.requests = []
+
+    async def process_request(self, user_request, native_language="en", timeout=None):
+        self.requests.append(user_request)
+        if "poem" in user_request and not self.fixed:
+            return {"status": "error", "message": "search failed"}
+        return {"status": "success"}
+
+
+def test_rerun_resumes_and_only_retries_failures(tmp_path):
+    items = parse_manifest(
+        [
+            '{"language": "de", "type": "poem"}',
+            '{"language": "es", "type": "translation", "topic": "good morning"}',
+        ]
+    )
+    state_path = str(tmp_path / "state.jsonl")
+    assistant = FlakyAssistant()
+
+    first = asyncio.run(prewarm(items, assistant, state_path))
+    assert (first["warmed"], first["failed"], first["skipped"]) == (1, 1, 0)
+    assert first["failures"] == [
+        {"request": "Find a famous German poem", "error": "search failed"}
+    ]
+
+    assistant.fixed = True
+    second = asyncio.run(prewarm(items, assistant, state_path))
+    assert (second["warmed"], second["failed"], second["skipped"]) == (1, 0, 1)
+
+    third = asyncio.run(prewarm(items, assistant, state_path))
+    assert (third["warmed"], third["skipped"]) == (0, 2)
+    assert len(assistant.requests) == 3
+    assert {record["status"] for record in load_state(state_path).values()} == {"ok"}
+
+    # Older than max_age: warmed again
+    fourth = asyncio.run(prewarm(items, assistant, state_path, max_age=0))
+    assert fourth["warmed"] == 2
+
+
+def test_manifest_errors_name_the_line():
+    with pytest.raises(ValueError, match="line 2: unknown language"):
+        parse_manifest(
+            ['{"language": "de", "type": "song"}', '{"language": "xx", "type": "song"}']
+        )
+    with pytest.raises(ValueError, match="line 1: vocabulary needs a topic"):
+        parse_manifest([json.dumps({"language": "de", "type": "vocabulary"})])
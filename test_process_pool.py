@@ -0,0 +1,89 @@
+import asyncio
+import os
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools import process_pool
+from src.tools.metrics import RequestTrace, end_trace, start_trace
+from src.tools.process_pool import (
+    MIN_OFFLOAD_SIZE,
+    configure_process_pool,
+    offload,
+    shutdown_process_pool,
+)
+from src.tools.search_tools import parse_lyrics
+from src.tools.validation_tools import analyze_language_confidence_async
+from src.tools.vocabulary_extraction import extract_key_vocabulary
+
+LYRICS = "Ich liebe dich mit meinem ganzen Herzen und der Sonne. "
+
+
+def _large_page() -> bytes:
+    filler = "<div class='ad'>Werbung und Navigation</div>\n" * (MIN_OFFLOAD_SIZE // 40)
+    return (
+        f"<html><body>{filler}<div class='lyrics'>{LYRICS * 20}</div></body></html>"
+    ).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    configure_process_pool(max_workers=1)
+    yield process_pool.get_process_pool()
+    shutdown_process_pool()
+
+
+def test_large_payloads_run_in_a_warm_worker(pool):
+    worker_pid = offload(os.getpid)
+    page = _large_page()
+    text = LYRICS * 500
+
+    assert worker_pid != os.getpid()
+    assert offload(parse_lyrics, page, "utf-8", size=len(page)) == parse_lyrics(
+        page, "utf-8"
+    )
+    assert offload(extract_key_vocabulary, text, ("de",), size=len(text)) == (
+        extract_key_vocabulary(text, ("de",))
+    )
+    # Small payloads are not worth the trip to the worker
+    assert offload(os.getpid, size=MIN_OFFLOAD_SIZE - 1) == os.getpid()
+
+
+def test_short_requests_are_validated_inline(monkeypatch):
+    class UnusedPool:
+        def submit(self, *args):
+            raise AssertionError("short text sent to a worker")
+
+    monkeypatch.setattr(process_pool, "_pool", UnusedPool())
+    trace = RequestTrace()
+    token = start_trace(trace)
+    try:
+        result = asyncio.run(analyze_language_confidence_async("Ich liebe dich"))
+    finally:
+        end_trace(token)
+
+    assert result["detected_languages"] == ["de"]
+    assert trace.breakdown()["stages"]["validation"]["count"] == 1
+
+
+def test_assistant_results_match_with_the_process_pool(pool, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    request = "Find me a German song about love"
+
+    install_fake_backends(monkeypatch)
+    pooled = asyncio.run(LanguageLearningAssistant().process_request(request))
+    monkeypatch.setattr(process_pool, "_pool", None)
+    install_fake_backends(monkeypatch)
+    inline = asyncio.run(LanguageLearningAssistant().process_request(request))
+
+    assert pooled["status"] == "success"
+    assert pooled == inline
+
+
+def test_steps_run_inline_after_shutdown():
+    configure_process_pool(max_workers=1, warm=False)
+    shutdown_process_pool()
+
+    assert process_pool.get_process_pool() is None
+    assert offload(os.getpid) == os.getpid()
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+import requests
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools import resilience
+from src.tools.resilience import (
+    BackendUnavailableError,
+    CircuitBreaker,
+    TokenBucket,
+    configure_backend,
+)
+from src.tools.search_tools import fetch_page, web_search
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_bursts_then_paces_calls():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+
+    assert [bucket.reserve(max_wait=1.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(0.5)
+    # The next token is a full second away, which is too long to wait
+    assert bucket.reserve(max_wait=0.9) is None
+    clock.now = 1.5
+    assert bucket.reserve(max_wait=0.0) == 0.0
+
+
+def test_circuit_opens_probes_once_and_backs_off():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=10, jitter=0, clock=clock
+    )
+
+    breaker.record_failure()
+    assert breaker.before_call() is None
+    breaker.record_failure()
+    assert breaker.before_call() == 10
+
+    clock.now = 10
+    assert breaker.before_call() is None  # the probe
+    assert breaker.before_call() == 0  # everyone else still fails fast
+    breaker.record_failure()
+    assert breaker.before_call() == 20  # failed probe doubles the open period
+
+    clock.now = 30
+    assert breaker.before_call() is None
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_search_429_opens_the_circuit_and_fails_fast(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    backends.rate_limit("ddgs.text", retry_after=30)
+
+    with pytest.raises(BackendUnavailableError) as first:
+        web_search("famous german poem")
+    with pytest.raises(BackendUnavailableError) as second:
+        web_search("another german poem")
+
+    assert first.value.backend == "ddgs"
+    assert first.value.reason == "rate_limited"
+    assert first.value.retry_after >= 29
+    assert second.value.reason == "circuit_open"
+    assert backends.calls["ddgs.text"] == 1
+
+
+def test_lyrics_page_429_is_reported_as_rate_limited(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    backends.rate_limit("http.get")
+
+    with pytest.raises(BackendUnavailableError) as error:
+        fetch_page("https://lyrics.example/nena")
+
+    assert error.value.backend == "http:lyrics.example"
+    breaker = resilience.get_backend_guard("http:lyrics.example").breaker
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_only_failing_hosts_open_their_circuit(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    backends.http_statuses = {"missing.example": 404, "down.example": 503}
+
+    # Missing pages are the site answering, not the site failing
+    for _ in range(resilience.FAILURE_THRESHOLD + 1):
+        with pytest.raises(requests.HTTPError):
+            fetch_page("https://missing.example/song")
+    for _ in range(resilience.FAILURE_THRESHOLD):
+        with pytest.raises(requests.HTTPError):
+            fetch_page("https://down.example/song")
+    with pytest.raises(BackendUnavailableError) as error:
+        fetch_page("https://down.example/song")
+
+    assert error.value.reason == "circuit_open"
+    assert error.value.backend == "http:down.example"
+    assert fetch_page("https://lyrics.example/nena")[0]
+
+
+def test_http_settings_apply_to_every_host(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    backends.http_statuses = {"down.example": 503}
+    configure_backend("http", failure_threshold=1)
+
+    with pytest.raises(requests.HTTPError):
+        fetch_page("https://down.example/song")
+    with pytest.raises(BackendUnavailableError) as error:
+        fetch_page("https://down.example/song")
+
+    assert error.value.backend == "http:down.example"
+    assert fetch_page("https://lyrics.example/nena")[0]
+    guard = resilience.get_backend_guard("http:lyrics.example")
+    assert guard.breaker.failure_threshold == 1
+
+
+def test_rate_limited_search_does_not_reach_later_stages(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    backends.rate_limit("ddgs.text")
+    assistant = LanguageLearningAssistant()
+
+    result = asyncio.run(assistant.process_request("Find me a German song about love"))
+
+    assert result["status"] == "error"
+    assert result["backend"] == "ddgs"
+    assert result["reason"] == "rate_limited"
+    assert backends.calls["ddgs.videos"] == 0
+    assert backends.calls["http.get"] == 0
+    assert backends.calls["translate"] == 0
+
+
+def test_exhausted_rate_limit_fails_fast(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    configure_backend("translate", rate=0.01, burst=1, max_wait=0)
+    assistant = LanguageLearningAssistant()
+    assistant.content_creator.translation_memory = None
+
+    first = asyncio.run(assistant.process_request("How do you say 'Herz' in German?"))
+    second = asyncio.run(assistant.process_request("How do you say 'Hund' in German?"))
+
+    assert first["status"] == "success"
+    assert second["status"] == "error"
+    assert second["reason"] == "rate_limited"
+    assert backends.calls["translate"] == 1
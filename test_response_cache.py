@@ -0,0 +1,138 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from fakes import install_fake_backends
+from src import language_learning_assistant as assistant_module
+from src.language_learning_assistant import RESPONSE_TTL, LanguageLearningAssistant
+from src.tools import metrics
+from src.tools.cache import RevalidatingCache
+from src.tools.shared_cache import configure_shared_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_equivalent_requests_share_one_response(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    registry = metrics.enable_metrics()
+    try:
+        assistant = LanguageLearningAssistant()
+        cold = asyncio.run(assistant.process_request("Find me a German song about love"))
+        calls = dict(backends.calls.counts)
+        warm = asyncio.run(
+            assistant.process_request("find a german song about love please")
+        )
+        cache = registry.snapshot()["counters"]["cache_requests_total"]
+    finally:
+        metrics.disable_metrics()
+
+    assert cold["status"] == "success"
+    assert warm == cold
+    assert backends.calls.counts == calls
+    assert cache[("response", "hit")] == 1
+    assert cache[("response", "miss")] == 1
+    assert assistant.response_cache.stats()["hit_rate"] == 0.5
+
+
+def test_intent_keeps_what_changes_the_response():
+    intent = LanguageLearningAssistant.request_intent
+
+    assert intent("German words about food, please?", "de") == intent(
+        "Teach me German vocabulary about food", "de"
+    )
+    assert intent("German words about food", "de") != intent(
+        "German words about animals", "de"
+    )
+    assert intent("German words about food", "de") != intent(
+        "How do you pronounce German words about food?", "de"
+    )
+    assert intent("Find a German song", "de", "en") != intent(
+        "Find a German song", "de", "fr"
+    )
+    assert intent("Say 'Guten Tag' in German", "de").subject == "Guten Tag"
+
+
+def test_popular_stale_response_is_served_and_refreshed(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch, latencies={"translate": 0.1})
+    clock = FakeClock()
+    cache = RevalidatingCache(ttl=60, stale_ttl=600, refresh_min_hits=1, clock=clock)
+    assistant = LanguageLearningAssistant(response_cache=cache)
+    request = "How do you say 'guten Morgen' in German?"
+
+    async def run():
+        first = await assistant.process_request(request)
+        cold_calls = backends.calls["translate"]
+        await assistant.process_request(request)
+        clock.now = 120
+        stale = await assistant.process_request(request)
+        # Answered without waiting for the refresh
+        refreshing = len(assistant._refreshes)
+        await asyncio.gather(*assistant._refreshes)
+        return first, stale, refreshing, cold_calls
+
+    first, stale, refreshing, cold_calls = asyncio.run(run())
+
+    assert stale == first
+    assert refreshing == 1
+    assert backends.calls["translate"] == 2 * cold_calls
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.lookup(assistant.request_intent(request, "de")).stale is False
+
+
+def test_failed_responses_are_not_cached(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    backends.search_error = "rate limited"
+    assistant = LanguageLearningAssistant()
+
+    for _ in range(2):
+        result = asyncio.run(
+            assistant.process_request("Find me a German song about love")
+        )
+        assert result["status"] == "error"
+
+    assert assistant.response_cache.stats()["misses"] == 2
+    assert len(assistant.response_cache) == 0
+
+
+def test_shared_responses_keep_their_age(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    configure_shared_cache(str(tmp_path / "shared.sqlite3"))
+    request = "How do you say 'guten Morgen' in German?"
+    first = asyncio.run(LanguageLearningAssistant().process_request(request))
+    cold_calls = backends.calls["translate"]
+
+    def other_worker_after(seconds):
+        now = time.time() + seconds
+        monkeypatch.setattr(assistant_module, "time", SimpleNamespace(time=lambda: now))
+        assistant = LanguageLearningAssistant()
+
+        async def run():
+            result = await assistant.process_request(request)
+            stale = assistant.response_cache.stats()["stale_hits"]
+            await asyncio.gather(*assistant._refreshes)
+            return result, stale
+
+        return asyncio.run(run())
+
+    # Past RESPONSE_TTL: served stale while one worker refreshes it
+    stale, stale_hits = other_worker_after(RESPONSE_TTL + 1)
+    assert stale == first
+    assert stale_hits == 1
+    assert backends.calls["translate"] == 2 * cold_calls
+
+    # Long after the local stale window, e.g. warmed by last night's prewarm
+    # job: still served while it is refreshed, until the shared cache drops it
+    stale, stale_hits = other_worker_after(12 * 60 * 60)
+    assert stale == first
+    assert stale_hits == 1
+    assert backends.calls["translate"] == 3 * cold_calls
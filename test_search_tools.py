@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+
+from fakes import install_fake_backends
+from src.tools import search_tools
+from src.tools.search_tools import (
+    SearchClient,
+    find_youtube_video,
+    get_song_lyrics,
+    web_search,
+)
+
+
+def test_repeated_searches_are_cached_and_share_one_session(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+
+    first = web_search("famous german poem")
+    second = web_search("famous german poem")
+    find_youtube_video("Nena 99 Luftballons")
+    get_song_lyrics("Nena 99 Luftballons")
+
+    assert first == second
+    assert backends.calls["ddgs.text"] == 2
+    assert backends.calls["ddgs.videos"] == 1
+    assert backends.calls["ddgs.session"] == 1
+
+
+def test_cache_key_includes_endpoint_and_max_results(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    client = SearchClient()
+
+    client.text("nena", max_results=1)
+    client.text("nena", max_results=3)
+    client.videos("nena", max_results=1)
+
+    assert backends.calls["ddgs.text"] == 2
+    assert backends.calls["ddgs.videos"] == 1
+
+
+def test_failed_searches_are_negatively_cached(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    backends.search_error = "202 Ratelimit"
+
+    first = web_search("famous german poem")
+    second = web_search("famous german poem")
+
+    assert first == second == "Error performing web search: 202 Ratelimit"
+    assert backends.calls["ddgs.text"] == 1
+
+
+def test_negative_entries_expire_on_their_own_ttl(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    monkeypatch.setattr(search_tools, "_search_client", SearchClient(negative_ttl=0))
+    backends.search_error = "202 Ratelimit"
+    web_search("famous german poem")
+
+    backends.search_error = None
+    result = web_search("famous german poem")
+
+    assert result.startswith("Title: famous german poem")
+    assert backends.calls["ddgs.text"] == 2
+
+
+def test_search_errors_keep_the_session(monkeypatch):
+    backends = install_fake_backends(monkeypatch)
+    backends.search_error = "202 Ratelimit"
+    client = SearchClient()
+
+    errors = 0
+    for query in ("nena", "falco"):
+        try:
+            client.text(query, max_results=1)
+        except RuntimeError:
+            errors += 1
+
+    assert errors == 2
+    assert backends.calls["ddgs.session"] == 1
+    assert backends.calls["ddgs.close"] == 0
+
+
+def test_broken_session_is_closed_after_calls_using_it(monkeypatch):
+    backends = install_fake_backends(monkeypatch, latencies={"ddgs.videos": 0.3})
+    client = SearchClient()
+    videos = []
+    slow = threading.Thread(target=lambda: videos.extend(client.videos("nena", 1)))
+    slow.start()
+    time.sleep(0.1)
+
+    backends.search_error = ConnectionError("connection reset")
+    try:
+        client.text("falco", max_results=1)
+    except ConnectionError:
+        pass
+    backends.search_error = None
+    # Still in use by the video search
+    assert backends.calls["ddgs.close"] == 0
+
+    slow.join()
+    assert videos
+    assert backends.calls["ddgs.close"] == 1
+    client.text("kraftwerk", max_results=1)
+    assert backends.calls["ddgs.session"] == 2
+
+
+def test_parse_lyrics_matches_full_page_scan():
+    from bs4 import BeautifulSoup
+    import glob
+
+    fixtures = os.path.join(os.path.dirname(__file__), "benchmarks", "fixtures")
+    for path in glob.glob(os.path.join(fixtures, "lyrics_*.html")):
+        with open(path, "rb") as f:
+            html = f.read()
+        soup = BeautifulSoup(html.decode("utf-8"), "html.parser")
+        containers = soup.find_all(
+            ["div", "p"],
+            class_=lambda x: x and ("lyrics" in x.lower() or "text" in x.lower()),
+        )
+
+        assert search_tools.parse_lyrics(html, "utf-8") == containers[0].get_text(
+            strip=True
+        )
+
+
+def test_parse_lyrics_without_container_returns_none():
+    assert search_tools.parse_lyrics(b"<div class='nav'>menu</div>") is None
+
+
+def test_lyrics_download_is_capped_and_session_is_reused(monkeypatch):
+    page = "<div class='lyrics'>" + "la " * 1000 + "</div>"
+    backends = install_fake_backends(monkeypatch, lyrics_html=page)
+
+    content, encoding = search_tools.fetch_page("https://example.com", max_bytes=100)
+    lyrics = get_song_lyrics("Nena 99 Luftballons")
+
+    assert len(content) == 100
+    assert encoding == "utf-8"
+    assert lyrics.startswith("la la")
+    assert search_tools.get_http_session() is search_tools.get_http_session()
+    assert backends.calls["http.get"] == 2
@@ -0,0 +1,151 @@
+from fakes import FakeRedis, install_fake_backends
+from src.tools import audio_tools, search_tools
+from src.tools.content_tools import ContentCreator
+from src.tools.translation_memory import SharedTranslationMemory, TranslationMemory
+from src.tools.shared_cache import (
+    CacheBackend,
+    RedisCacheBackend,
+    SQLiteCacheBackend,
+    TwoTierCache,
+    configure_shared_cache,
+    decode_value,
+    disable_shared_cache,
+    encode_value,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sqlite_tier_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    first = TwoTierCache(SQLiteCacheBackend(path)).namespace("translation")
+    second = TwoTierCache(SQLiteCacheBackend(path)).namespace("translation")
+
+    first.set_many({("de", "en", "hund"): "dog", ("de", "en", "katze"): "cat"})
+    assert second.get_many([("de", "en", "hund"), ("de", "en", "maus")]) == {
+        ("de", "en", "hund"): "dog"
+    }
+    # The second lookup is answered by the in-process tier
+    assert second.get(("de", "en", "hund")) == "dog"
+    assert second.stats() == {
+        "l1_hits": 1,
+        "l2_hits": 1,
+        "misses": 1,
+        "hit_rate": 0.6667,
+        "l1_entries": 1,
+    }
+
+    clip = b"\xff\xf3" * 1000
+    assert bytes(decode_value(encode_value(clip))) == clip
+    assert isinstance(decode_value(encode_value(clip)), memoryview)
+    assert decode_value(encode_value([{"title": "Lied"}])) == [{"title": "Lied"}]
+
+
+def test_redis_tier_batches_and_expires_per_namespace():
+    clock = FakeClock()
+    redis = FakeRedis(clock=clock)
+    cache = TwoTierCache(
+        RedisCacheBackend(redis),
+        ttls={"search": 60, "translation": 3600},
+        l1_entries={"search": 0, "translation": 0},
+    )
+    search = cache.namespace("search")
+    translation = cache.namespace("translation")
+
+    search.set_many({"a": [1], "b": [2]})
+    translation.set("a", "eins")
+    assert search.get_many(["a", "b", "c"]) == {"a": [1], "b": [2]}
+    assert redis.calls["pipeline"] == 2
+    assert redis.calls["mget"] == 1
+
+    clock.now = 120
+    assert search.get("a") is None
+    assert translation.get("a") == "eins"
+
+
+def test_tools_reuse_what_other_workers_cached(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    path = str(tmp_path / "shared.sqlite3")
+    words = ["Hund", "Katze", "Maus"]
+
+    def handle(audio_dir: str):
+        results = search_tools.get_search_client().text("Lied über Liebe", 5)
+        content = ContentCreator().create_learning_content("Ich liebe dich", "de", "en")
+        paths = audio_tools.generate_audio_batch(words, "de", output_dir=audio_dir)
+        return results, content, paths
+
+    configure_shared_cache(path)
+    first = handle(str(tmp_path / "worker1"))
+    calls = dict(backends.calls.counts)
+
+    # A second worker process: its own in-process caches and audio directory
+    configure_shared_cache(path)
+    second = handle(str(tmp_path / "worker2"))
+
+    # Only the full text is translated again; it is not memoized
+    calls["translate"] += 1
+    assert backends.calls.counts == calls
+    assert second[:2] == first[:2]
+    for word in words:
+        with open(first[2][word], "rb") as a, open(second[2][word], "rb") as b:
+            assert a.read() == b.read()
+
+
+def test_reconfiguring_reaches_clients_created_before(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch)
+    configure_shared_cache(str(tmp_path / "old.sqlite3"))
+    client = search_tools.get_search_client()
+    creator = ContentCreator()
+
+    # Closes the old backend
+    path = str(tmp_path / "new.sqlite3")
+    configure_shared_cache(path)
+    client.text("Lied über Liebe", 5)
+    creator.create_learning_content("Ich liebe dich", "de", "en")
+
+    stored = TwoTierCache(SQLiteCacheBackend(path))
+    assert stored.namespace("search").get(("text", "Lied über Liebe", 5))
+    assert stored.namespace("translation").get(("de", "en", "liebe")) == "[en] liebe"
+
+
+def test_translation_memory_follows_the_shared_cache(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch)
+    creator = ContentCreator()
+    assert isinstance(creator.translation_memory, TranslationMemory)
+
+    path = str(tmp_path / "shared.sqlite3")
+    configure_shared_cache(path)
+    assert isinstance(creator.translation_memory, SharedTranslationMemory)
+    creator.create_learning_content("Ich liebe dich", "de", "en")
+    stored = TwoTierCache(SQLiteCacheBackend(path)).namespace("translation")
+    assert stored.get(("de", "en", "liebe")) == "[en] liebe"
+
+    # Back to the creator's own memory, which keeps working
+    disable_shared_cache()
+    local = creator.translation_memory
+    assert isinstance(local, TranslationMemory)
+    creator.create_learning_content("Ich liebe dich", "de", "en")
+    assert local.get("de", "en", "liebe") == "[en] liebe"
+
+
+def test_unreachable_tier_is_a_miss():
+    class DownBackend(CacheBackend):
+        def get_many(self, keys):
+            raise ConnectionError("refused")
+
+        def set_many(self, items, ttl):
+            raise ConnectionError("refused")
+
+    namespace = TwoTierCache(DownBackend(), l1_entries={"search": 0}).namespace("search")
+    namespace.set("a", [1])
+    assert namespace.get("a", "default") == "default"
+    assert namespace.stats()["misses"] == 1
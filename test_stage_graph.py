@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+
+from src.tools.deadline import Deadline, end_deadline, start_deadline
+from src.tools.stage_graph import StageGraph
+
+
+def _sleep_stage(seconds, value, calls=None):
+    async def stage(*inputs):
+        if calls is not None:
+            calls.append(inputs)
+        await asyncio.sleep(seconds)
+        return value
+
+    return stage
+
+
+def test_independent_stages_run_concurrently():
+    calls = []
+    graph = StageGraph()
+    graph.add("a", _sleep_stage(0.1, "a"))
+    graph.add("b", _sleep_stage(0.2, "b", calls), after=["a"])
+    graph.add("c", _sleep_stage(0.1, "c", calls), after=["a"])
+    graph.add("d", _sleep_stage(0.1, "d", calls), after=["b", "c"])
+
+    async def run():
+        start = time.perf_counter()
+        async with graph.start() as stages:
+            result = await stages.result("d")
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(run())
+
+    assert result == "d"
+    # a's result is computed once and passed to both b and c
+    assert sorted(calls) == [("a",), ("a",), ("b", "c")]
+    durations = {"a": 0.1, "b": 0.2, "c": 0.1, "d": 0.1}
+    assert graph.critical_path(durations) == pytest.approx(0.4)
+    assert 0.4 <= elapsed < 0.5
+
+
+def test_required_failure_ends_the_run_without_waiting_for_other_stages():
+    async def broken():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("lyrics unavailable")
+
+    graph = StageGraph()
+    graph.add("video", _sleep_stage(1.0, "video"))
+    graph.add("lyrics", broken)
+    graph.add("translation", _sleep_stage(0.0, "content"), after=["lyrics"])
+
+    async def run():
+        start = time.perf_counter()
+        async with graph.start() as stages:
+            with pytest.raises(RuntimeError, match="lyrics unavailable"):
+                await stages.result("video")
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) < 0.5
+
+
+def test_optional_stage_falls_back_when_the_deadline_runs_out():
+    skipped = []
+    graph = StageGraph()
+    graph.add("search", _sleep_stage(0.0, "results"))
+    graph.add(
+        "video",
+        _sleep_stage(1.0, "video"),
+        after=["search"],
+        optional=True,
+        fallback="no video",
+        share=0.5,
+    )
+    graph.add("lyrics", _sleep_stage(0.05, "lyrics"), after=["search"])
+
+    async def run():
+        token = start_deadline(Deadline(0.2))
+        try:
+            async with graph.start(on_skip=skipped.append) as stages:
+                return await stages.result("video"), await stages.result("lyrics")
+        finally:
+            end_deadline(token)
+
+    assert asyncio.run(run()) == ("no video", "lyrics")
+    assert skipped == ["video"]
+
+
+def test_stages_can_only_depend_on_earlier_stages():
+    graph = StageGraph()
+    graph.add("search", _sleep_stage(0.0, None))
+
+    with pytest.raises(ValueError):
+        graph.add("translation", _sleep_stage(0.0, None), after=["lyrics"])
+    with pytest.raises(ValueError):
+        graph.add("search", _sleep_stage(0.0, None))
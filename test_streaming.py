@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+
+
+def _collect(assistant, request):
+    async def run():
+        return [event async for event in assistant.process_request_stream(request)]
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def assistant(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch)
+    return LanguageLearningAssistant()
+
+
+def test_song_stream_emits_stages_in_order(assistant):
+    events = _collect(assistant, "How do you pronounce this German song about love?")
+    types = [event.type for event in events]
+
+    assert types[0] == "validation"
+    assert types.count("video") == 1
+    words = events[-1].data["content"]["vocabulary"]["words"]
+    assert types.count("vocabulary") == len(words)
+    assert types.count("audio") == len(words)
+    assert types.index("translation") < types.index("vocabulary") < types.index("audio")
+    assert types[-2:] == ["exercises", "result"]
+    audio = {event.data["word"]: event.data["path"] for event in events if event.type == "audio"}
+    assert audio == events[-1].data["vocabulary_audio"]
+
+
+def test_slow_video_does_not_hold_back_the_translation(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch, latencies={"ddgs.videos": 0.3})
+    assistant = LanguageLearningAssistant()
+
+    types = [event.type for event in _collect(assistant, "Find me a German song")]
+
+    assert types.index("translation") < types.index("video") < types.index("result")
+
+
+@pytest.mark.parametrize(
+    "request_text",
+    [
+        "Find me a German song about love",
+        "How do you pronounce this German poem?",
+        "Show me some Spanish vocabulary about colors",
+        "How do you say 'guten Morgen' in German?",
+        "Tell me a joke",
+    ],
+)
+def test_final_event_equals_process_request_result(monkeypatch, tmp_path, request_text):
+    monkeypatch.chdir(tmp_path)
+    install_fake_backends(monkeypatch)
+    # Both calls run the pipeline instead of the second reading the first's result
+    assistant = LanguageLearningAssistant(use_response_cache=False)
+    events = _collect(assistant, request_text)
+    result = asyncio.run(assistant.process_request(request_text))
+
+    assert events[-1].type == "result"
+    assert [event.type for event in events].count("result") == 1
+    assert events[-1].data == result
+
+
+def test_errors_end_the_stream_with_an_error_result(assistant, monkeypatch):
+    async def broken_search(query, raise_errors=False):
+        raise RuntimeError("search exploded")
+
+    monkeypatch.setattr(
+        "src.language_learning_assistant.web_search_async", broken_search
+    )
+
+    events = _collect(assistant, "Find me a German song about love")
+
+    assert [event.type for event in events] == ["validation", "result"]
+    assert events[-1].data == {
+        "status": "error",
+        "message": "An error occurred: search exploded",
+    }
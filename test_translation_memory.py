@@ -0,0 +1,47 @@
+from src.tools.translation_memory import TranslationMemory
+
+
+def test_bulk_lookup_normalizes_keys_and_counts(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"))
+    memory.set_many("de", "en", {"Liebe": "love", "herz": "heart"})
+
+    found = memory.get_many("de", "en", ["liebe", " HERZ ", "sonne"])
+
+    assert found == {"liebe": "love", " HERZ ": "heart"}
+    assert memory.get("de", "es", "liebe") is None
+    stats = memory.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "tm.sqlite3")
+    TranslationMemory(path).set("es", "en", "corazón", "heart")
+
+    reopened = TranslationMemory(path, lru_size=0)
+
+    assert reopened.get("es", "en", "Corazón") == "heart"
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"), max_entries=2, lru_size=0)
+    memory.set("de", "en", "eins", "one")
+    memory.set("de", "en", "zwei", "two")
+    memory.get("de", "en", "eins")
+    memory.set("de", "en", "drei", "three")
+
+    assert len(memory) == 2
+    assert memory.get("de", "en", "zwei") is None
+    assert memory.get("de", "en", "eins") == "one"
+
+
+def test_in_memory_hits_count_as_use_for_eviction(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"), max_entries=2)
+    memory.set("de", "en", "eins", "one")
+    memory.set("de", "en", "zwei", "two")
+    # Served from the in-memory LRU, without reading the file
+    memory.get("de", "en", "eins")
+    memory.set("de", "en", "drei", "three")
+
+    reopened = TranslationMemory(str(tmp_path / "tm.sqlite3"), lru_size=0)
+    assert reopened.get("de", "en", "zwei") is None
+    assert reopened.get("de", "en", "eins") == "one"
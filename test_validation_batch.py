@@ -0,0 +1,75 @@
+import io
+import itertools
+import json
+import os
+
+from src.tools.language_detection import NgramDetector
+from src.tools.validation_tools import (
+    analyze_jsonl,
+    analyze_language_confidence,
+    analyze_language_confidence_batch,
+)
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "test_data", "validation_corpus.txt"
+)
+
+
+def _corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f] + [None, 42]
+
+
+class CountingDetector(NgramDetector):
+    def __init__(self):
+        super().__init__()
+        self.detected = []
+
+    def detect(self, text):
+        self.detected.append(text)
+        return super().detect(text)
+
+
+def test_batch_results_match_single_text_results():
+    corpus = _corpus() * 2
+
+    batch_results = list(analyze_language_confidence_batch(corpus, batch_size=7))
+
+    assert batch_results == [analyze_language_confidence(text) for text in corpus]
+
+
+def test_detection_is_grouped_and_deduplicated_per_batch():
+    detector = CountingDetector()
+    texts = ["Ich möchte gerne lernen", "Il mare è calmo stasera"] * 50
+
+    list(analyze_language_confidence_batch(texts, detector=detector, batch_size=100))
+
+    assert sorted(detector.detected) == sorted(set(texts))
+
+
+def test_batch_consumes_input_lazily():
+    endless = itertools.cycle(["Ich möchte Deutsch lernen"])
+
+    results = analyze_language_confidence_batch(endless, batch_size=10)
+
+    assert len(list(itertools.islice(results, 25))) == 25
+
+
+def test_jsonl_streaming_round_trip():
+    lines = [
+        json.dumps({"id": 1, "text": "How do you say 'hello' in German?"}),
+        "",
+        json.dumps("Tell me a joke"),
+    ]
+    output = io.StringIO()
+
+    written = analyze_jsonl(io.StringIO("\n".join(lines)), output)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert written == 2
+    assert records[0]["id"] == 1
+    assert records[0]["validation"] == analyze_language_confidence(
+        "How do you say 'hello' in German?"
+    )
+    assert records[1]["text"] == "Tell me a joke"
+    assert records[1]["validation"]["is_language_question"] is False
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+from langdetect import DetectorFactory
+
+from benchmarks.legacy_validation import analyze_language_confidence_legacy
+from src.tools.language_detection import LangdetectDetector, NullDetector
+from src.tools.validation_tools import PhraseMatcher, analyze_language_confidence
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "test_data", "validation_corpus.txt"
+)
+
+
+def _corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        lines = [line.rstrip("\n") for line in f]
+    return lines + ["a" * 1000, "SONG " * 50 + "in german"]
+
+
+def _normalized(result):
+    if "detected_languages" in result:
+        result = dict(result, detected_languages=sorted(result["detected_languages"]))
+    return result
+
+
+def _no_detection(text):
+    raise RuntimeError("detection disabled")
+
+
+@pytest.mark.parametrize("text", _corpus())
+def test_matching_is_identical_to_legacy(monkeypatch, text):
+    from benchmarks import legacy_validation
+
+    monkeypatch.setattr(legacy_validation, "detect_langs", _no_detection)
+
+    assert _normalized(
+        analyze_language_confidence(text, detector=NullDetector())
+    ) == _normalized(analyze_language_confidence_legacy(text))
+
+
+@pytest.mark.parametrize("text", _corpus())
+def test_langdetect_backend_keeps_legacy_scores(monkeypatch, text):
+    monkeypatch.setattr(DetectorFactory, "seed", 0)
+    current = analyze_language_confidence(text, detector=LangdetectDetector())
+    legacy = analyze_language_confidence_legacy(text)
+
+    # Detection is skipped once a language is named, which can only drop
+    # extra detected languages, never change the scores
+    if "detected_languages" in current:
+        assert set(current["detected_languages"]) <= set(legacy["detected_languages"])
+        current = dict(current, detected_languages=legacy["detected_languages"])
+    assert _normalized(current) == _normalized(legacy)
+
+
+def test_phrase_matcher_finds_overlapping_phrases():
+    matcher = PhraseMatcher(["deutsch", "deutsche", "auf deutsch", "in", "say"])
+
+    assert matcher.find_all("essay auf deutsche art") == {
+        "say",
+        "auf deutsch",
+        "deutsch",
+        "deutsche",
+    }
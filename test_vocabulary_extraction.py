@@ -0,0 +1,33 @@
+from src.tools.vocabulary_extraction import extract_key_vocabulary
+
+
+def test_words_are_ranked_by_frequency_then_length():
+    text = "sol sol sol mar mar cielo estrella y el la"
+
+    assert extract_key_vocabulary(text, ["es"], k=3) == ["sol", "mar", "estrella"]
+
+
+def test_frequent_words_rank_below_equally_common_rare_words():
+    words = extract_key_vocabulary("tiempo tiempo nube nube", ["es"])
+
+    assert words == ["nube", "tiempo"]
+
+
+def test_chunked_input_matches_whole_text():
+    text = (
+        "Title: Canción\nContent: Te quiero, corazón, te quiero mucho.\n"
+        "URL: https://example.com/cancion-de-amor\n" * 50
+    )
+    chunks = [text[i : i + 7] for i in range(0, len(text), 7)]
+
+    assert extract_key_vocabulary(chunks, ["es", "en"]) == extract_key_vocabulary(
+        text, ["es", "en"]
+    )
+    assert "https" not in extract_key_vocabulary(text, ["es", "en"])
+    assert "title" not in extract_key_vocabulary(text, ["es", "en"])
+
+
+def test_elisions_split_and_compounds_stay_whole():
+    words = extract_key_vocabulary("L'amour de mon grand-père", ["fr"])
+
+    assert words == ["grand-père", "amour"]
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fakes import install_fake_backends
+from src.language_learning_assistant import LanguageLearningAssistant
+from src.tools.vocabulary_store import VocabularyStore
+
+
+def test_lookup_matches_topic_names_and_aliases():
+    store = VocabularyStore(":memory:")
+
+    colors = store.lookup("es", "colors")
+    assert colors.topic == "colors"
+    assert colors.entries["rojo"] == "red"
+    assert len(colors.entries) == 10
+    assert store.lookup("es", "the colours of the rainbow?").topic == "colors"
+    assert store.lookup("de", "farm animals").topic == "animals"
+    assert store.lookup("fr", "parts of the body").topic == "body"
+    assert store.lookup("it", "common words").topic == "common words"
+
+
+def test_unknown_topics_and_languages_miss():
+    store = VocabularyStore(":memory:")
+
+    assert store.lookup("es", "quantum physics") is None
+    assert store.lookup("es", "words") is None
+    assert store.lookup("ja", "colors") is None
+    # Only one of three words matches a pack
+    assert store.lookup("es", "common car engine parts") is None
+    assert store.stats()["misses"] == 4
+
+
+def test_index_is_rebuilt_when_packs_change(tmp_path):
+    index = str(tmp_path / "vocabulary.sqlite3")
+    packs = tmp_path / "packs.json"
+    packs.write_text(
+        json.dumps({"topics": {}, "packs": {"de": {"colors": {"rot": "red"}}}})
+    )
+    assert VocabularyStore(index, str(packs)).lookup("de", "colors").entries == {
+        "rot": "red"
+    }
+
+    packs.write_text(
+        json.dumps({"topics": {}, "packs": {"de": {"colors": {"blau": "blue"}}}})
+    )
+    assert VocabularyStore(index, str(packs)).lookup("de", "colors").entries == {
+        "blau": "blue"
+    }
+
+
+def test_workers_starting_together_rebuild_the_index_once(monkeypatch, tmp_path):
+    index = str(tmp_path / "vocabulary.sqlite3")
+    VocabularyStore(index)
+    packs = tmp_path / "packs.json"
+    packs.write_text(
+        json.dumps({"topics": {}, "packs": {"de": {"colors": {"blau": "blue"}}}})
+    )
+    rebuilds = []
+    rebuild = VocabularyStore._rebuild
+
+    def slow_rebuild(self, *args):
+        rebuilds.append(1)
+        # Long enough for every worker to find the index out of date
+        time.sleep(0.2)
+        rebuild(self, *args)
+
+    monkeypatch.setattr(VocabularyStore, "_rebuild", slow_rebuild)
+
+    # Separate connections to one file, like worker processes after a deploy
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        stores = list(pool.map(lambda _: VocabularyStore(index, str(packs)), range(4)))
+
+    assert len(rebuilds) == 1
+    for store in stores:
+        assert store.lookup("de", "colors").entries == {"blau": "blue"}
+
+
+def test_vocabulary_request_answers_from_pack_without_search(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    assistant = LanguageLearningAssistant()
+
+    result = asyncio.run(
+        assistant.process_request("Show me some Spanish vocabulary about colors")
+    )
+
+    assert result["status"] == "success"
+    content = result["content"]
+    assert content["vocabulary"]["words"][:3] == ["rojo", "azul", "verde"]
+    assert content["vocabulary"]["translations"]["rojo"] == "red"
+    assert result["exercises"]["matching"]["translations"][0] == "red"
+    assert backends.calls["ddgs.text"] == 0
+    assert backends.calls["translate"] == 0
+
+
+def test_pack_words_are_translated_for_other_native_languages(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    assistant = LanguageLearningAssistant()
+
+    result = asyncio.run(
+        assistant.process_request("Show me some German vocabulary about food", "fr")
+    )
+
+    assert result["content"]["vocabulary"]["translations"]["Brot"] == "[fr] Brot"
+    assert backends.calls["ddgs.text"] == 0
+    assert backends.calls["translate"] == 1
+
+
+def test_unknown_topic_falls_back_to_web_search(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backends = install_fake_backends(monkeypatch)
+    assistant = LanguageLearningAssistant()
+
+    result = asyncio.run(
+        assistant.process_request("Show me some Spanish vocabulary about astronomy")
+    )
+
+    assert result["status"] == "success"
+    assert backends.calls["ddgs.text"] == 1